@@ -0,0 +1,11 @@
+import sys
+import os
+
+# Add the project directory to sys.path
+project_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(project_dir)
+
+from src.interfaces.api import main
+
+if __name__ == "__main__":
+    sys.exit(main())
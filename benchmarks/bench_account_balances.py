@@ -0,0 +1,113 @@
+"""
+Benchmark dos saldos de conta mantidos por gatilhos (migração 5).
+
+Mede:
+  * o custo de um lançamento: INSERT com os gatilhos atualizando os saldos
+    contra o modo anterior (gatilhos removidos, INSERT + 2 UPDATEs enviados
+    pela aplicação), um lançamento por unidade de trabalho;
+  * os saldos correntes lidos de accounts.balance (AccountBalances.atuais)
+    contra a soma do razão inteiro, conferindo que são iguais;
+  * a verificação completa da coluna contra o razão (divergencias).
+
+Uso:
+    python benchmarks/bench_account_balances.py
+    python benchmarks/bench_account_balances.py --transacoes 100000 1000000 --lancamentos 5000
+"""
+import argparse
+import time
+from datetime import date
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes, gerar_transacoes
+
+from src.core.account_balances import AccountBalances
+from src.core.balance_sheet import BalanceSheet
+
+GATILHOS = ("trg_transactions_balance_insert", "trg_transactions_balance_delete", "trg_transactions_balance_update")
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def lancar_com_gatilhos(db, lancamentos):
+    for lancamento in lancamentos:
+        with db.transaction():
+            db.execute(SQL_INSERT, lancamento)
+
+
+def lancar_manual(db, lancamentos):
+    for lancamento in lancamentos:
+        _, _, debito, credito, valor = lancamento
+        with db.transaction():
+            db.execute(SQL_INSERT, lancamento)
+            db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", (valor, debito))
+            db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (valor, credito))
+
+
+def medir(funcao, repeticoes=1):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def saldos(listas):
+    return {conta["id"]: conta["balance"] for lista in listas for conta in lista}
+
+
+def medir_lancamentos(args):
+    print(f"{'modo':<22} {'lançamentos/s':>15} {'µs/lançamento':>15}")
+    print("-" * 54)
+    for nome, funcao in (("gatilhos", lancar_com_gatilhos), ("UPDATEs da aplicação", lancar_manual)):
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            if funcao is lancar_manual:
+                for gatilho in GATILHOS:
+                    db.execute(f"DROP TRIGGER {gatilho}")
+            lancamentos = list(gerar_transacoes(contas, args.lancamentos, inicio=date(2030, 1, 1)))
+            t, _ = medir(lambda: funcao(db, lancamentos))
+            print(f"{nome:<22} {args.lancamentos / t * 1000:>15.0f} {t * 1000 / args.lancamentos:>15.1f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+def medir_leituras(args):
+    print(f"\n{'transações':>11} {'coluna (ms)':>12} {'razão (ms)':>11} {'verificação (ms)':>17}")
+    print("-" * 54)
+    for n_transacoes in args.transacoes:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            popular_transacoes(db, contas, n_transacoes)
+            db.execute("ANALYZE")
+            hoje = date.today().isoformat()
+            t_coluna, atuais = medir(lambda: BalanceSheet(db).calcular_saldos_na_data(hoje), args.repeticoes)
+            t_razao, razao = medir(lambda: BalanceSheet(db, use_snapshots=False).calcular_saldos_na_data(hoje),
+                                   args.repeticoes)
+            assert saldos(atuais) == saldos(razao)
+            t_verificacao, divergencias = medir(lambda: AccountBalances(db).divergencias())
+            assert not divergencias
+            print(f"{n_transacoes:>11} {t_coluna:>12.2f} {t_razao:>11.2f} {t_verificacao:>17.2f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--lancamentos", type=int, default=2000)
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    medir_lancamentos(args)
+    medir_leituras(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark do cadastro de contas em memória (AccountDirectory).
+
+Compara, com um número crescente de contas:
+  * a lista de contas de selecionar_conta: SELECT de todas as contas a cada
+    seleção (anterior) contra AccountDirectory.all();
+  * buscar_conta por ID para as duas pernas de cada transação de um modelo,
+    duas vezes (revisão e resumo, como em executar_modelo): SELECT por ID
+    (anterior) contra AccountDirectory.get().
+Mostra os contadores de hits e misses do cadastro ao final de cada cenário.
+
+Uso:
+    python benchmarks/bench_account_directory.py
+    python benchmarks/bench_account_directory.py --contas 1000 10000 --pernas 200
+"""
+import argparse
+import random
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.core.account_directory import AccountDirectory
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--pernas", type=int, default=50, help="transações do modelo executado")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'contas':>7} {'lista SQL (ms)':>15} {'lista cache (ms)':>17} {'IDs SQL (ms)':>13} "
+          f"{'IDs cache (ms)':>15} {'hits':>6} {'misses':>7}")
+    print("-" * 86)
+    for n_contas in args.contas:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, n_contas)
+            rng = random.Random(42)
+            pernas = [tuple(rng.sample(contas, 2)) for _ in range(args.pernas)]
+            diretorio = AccountDirectory(db)
+
+            def lista_sql():
+                db.execute("SELECT id, name, balance FROM accounts ORDER BY name").fetchall()
+
+            def ids_sql():
+                for _ in range(2):
+                    for debito, credito in pernas:
+                        db.execute("SELECT id, name FROM accounts WHERE id = ?", (debito,)).fetchone()
+                        db.execute("SELECT id, name FROM accounts WHERE id = ?", (credito,)).fetchone()
+
+            def ids_cache():
+                for _ in range(2):
+                    for debito, credito in pernas:
+                        diretorio.get(debito)
+                        diretorio.get(credito)
+
+            t_lista_sql = medir(lista_sql, args.repeticoes)
+            t_lista_cache = medir(diretorio.all, args.repeticoes)
+            t_ids_sql = medir(ids_sql, args.repeticoes)
+            t_ids_cache = medir(ids_cache, args.repeticoes)
+            stats = diretorio.stats()
+            print(f"{n_contas:>7} {t_lista_sql:>15.3f} {t_lista_cache:>17.3f} {t_ids_sql:>13.3f} "
+                  f"{t_ids_cache:>15.3f} {stats['hits']:>6} {stats['misses']:>7}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
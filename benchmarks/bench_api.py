@@ -0,0 +1,191 @@
+"""
+Teste de carga do servidor HTTP (api.py): vazão e latência (p50/p99) por rota.
+
+Sem --url, cria um banco temporário com contas e transações, sobe uma
+instância local do api.py em uma porta livre e a encerra no fim. Com --url,
+usa uma instância já em execução (os lançamentos de teste ficam gravados
+nela!). Cada cenário roda por --duracao segundos com --clientes conexões
+keep-alive simultâneas:
+  * POST /transactions com um lançamento por requisição (agrupados em COMMITs
+    pelo servidor);
+  * POST /transactions com --lote lançamentos por requisição;
+  * GET /accounts/{id} (saldo corrente);
+  * GET /transactions (primeira página de uma conta);
+  * GET /reports/balance em uma data no meio do razão.
+
+Uso:
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --clientes 64 --duracao 10
+    python benchmarks/bench_api.py --url http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API = os.path.join(project_dir, "api.py")
+
+
+class Cliente:
+    """Conexão HTTP/1.1 keep-alive mínima (Content-Length, sem chunked)."""
+
+    def __init__(self, host, porta):
+        self.host, self.porta = host, porta
+        self.leitor = self.escritor = None
+
+    async def abrir(self):
+        self.leitor, self.escritor = await asyncio.open_connection(self.host, self.porta)
+
+    async def requisitar(self, metodo, caminho, dados=None):
+        corpo = b"" if dados is None else json.dumps(dados).encode("utf-8")
+        self.escritor.write(
+            f"{metodo} {caminho} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo)
+        await self.escritor.drain()
+        status = int((await self.leitor.readline()).split()[1])
+        tamanho = 0
+        while True:
+            linha = await self.leitor.readline()
+            if linha in (b"\r\n", b""):
+                break
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            if nome.strip().lower() == "content-length":
+                tamanho = int(valor)
+        resposta = await self.leitor.readexactly(tamanho)
+        return status, json.loads(resposta) if resposta else None
+
+    def fechar(self):
+        if self.escritor:
+            self.escritor.close()
+
+
+def lancamento(rng, contas):
+    debito, credito = rng.sample(contas, 2)
+    return {"data": f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}", "descricao": "Carga",
+            "debito": debito, "credito": credito, "valor": str(Decimal(rng.randrange(100, 100000)).scaleb(-2))}
+
+
+async def cenario(host, porta, clientes, duracao, requisicao, status_esperado):
+    """Roda `requisicao(rng)` -> (método, caminho, corpo) em `clientes` conexões por `duracao` segundos."""
+    latencias, erros = [], []
+    fim = time.perf_counter() + duracao
+
+    async def trabalhador(numero):
+        rng = random.Random(numero)
+        cliente = Cliente(host, porta)
+        await cliente.abrir()
+        try:
+            while time.perf_counter() < fim:
+                metodo, caminho, corpo = requisicao(rng)
+                t0 = time.perf_counter()
+                status, resposta = await cliente.requisitar(metodo, caminho, corpo)
+                latencias.append(time.perf_counter() - t0)
+                if status != status_esperado:
+                    erros.append((status, resposta))
+        finally:
+            cliente.fechar()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(trabalhador(i) for i in range(clientes)))
+    return latencias, erros, time.perf_counter() - t0
+
+
+def subir_servidor(banco, leitores):
+    processo = subprocess.Popen(
+        [sys.executable, API, "--banco", banco, "--porta", "0", "--leitores", str(leitores)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    linha = processo.stdout.readline()
+    if not linha.startswith("API em "):
+        processo.kill()
+        raise RuntimeError(f"api.py não subiu: {linha!r}")
+    return processo, linha.split()[2]
+
+
+async def executar(url, args):
+    partes = urlsplit(url)
+    host, porta = partes.hostname, partes.port
+    cliente = Cliente(host, porta)
+    await cliente.abrir()
+    _, contas = await cliente.requisitar("GET", "/accounts")
+    _, transacoes = await cliente.requisitar("GET", "/transactions?limite=1")
+    cliente.fechar()
+    ids = [conta["id"] for conta in contas]
+    if len(ids) < 2:
+        raise RuntimeError("a instância precisa de pelo menos duas contas")
+    data_balanco = "2020-06-30" if transacoes["transacoes"] else "2024-12-31"
+
+    cenarios = [
+        ("POST /transactions (1 lançamento)",
+         lambda rng: ("POST", "/transactions", lancamento(rng, ids)), 201, 1),
+        (f"POST /transactions ({args.lote} lançamentos)",
+         lambda rng: ("POST", "/transactions", [lancamento(rng, ids) for _ in range(args.lote)]), 201, args.lote),
+        ("GET /accounts/{id}",
+         lambda rng: ("GET", f"/accounts/{rng.choice(ids)}", None), 200, 0),
+        ("GET /transactions?conta=",
+         lambda rng: ("GET", f"/transactions?conta={rng.choice(ids)}", None), 200, 0),
+        ("GET /reports/balance",
+         lambda rng: ("GET", f"/reports/balance?data={data_balanco}", None), 200, 0),
+    ]
+    print(f"{args.clientes} conexões, {args.duracao:.0f}s por cenário, {url}")
+    print(f"{'cenário':<36} {'req/s':>9} {'lanç./s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'erros':>6}")
+    print("-" * 83)
+    falhou = False
+    for nome, requisicao, esperado, lancamentos in cenarios:
+        latencias, erros, segundos = await cenario(host, porta, args.clientes, args.duracao, requisicao, esperado)
+        p50 = statistics.median(latencias) * 1000
+        p99 = statistics.quantiles(latencias, n=100)[98] * 1000 if len(latencias) > 1 else p50
+        vazao = len(latencias) / segundos
+        print(f"{nome:<36} {vazao:>9,.0f} {vazao * lancamentos:>9,.0f} {p50:>9.1f} {p99:>9.1f} {len(erros):>6}")
+        if erros:
+            falhou = True
+            print(f"  primeiro erro: {erros[0]}")
+    return falhou
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="instância já em execução (padrão: sobe uma em um banco temporário)")
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--duracao", type=float, default=3.0)
+    parser.add_argument("--lote", type=int, default=100, help="lançamentos por requisição no cenário em lote")
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--transacoes", type=int, default=100000, help="razão inicial do banco temporário")
+    parser.add_argument("--leitores", type=int, default=4, help="threads de leitura do servidor temporário")
+    args = parser.parse_args()
+
+    if args.url:
+        sys.exit(1 if asyncio.run(executar(args.url, args)) else 0)
+
+    db, caminho = criar_banco()
+    processo = None
+    try:
+        contas = popular_contas(db, args.contas)
+        popular_transacoes(db, contas, args.transacoes)
+        # Exercícios anuais: o balanço parte do snapshot do último exercício encerrado
+        db.executemany("INSERT INTO fiscal_periods (start_date, end_date, interval_days) VALUES (?, ?, 365)",
+                       [(f"{ano}-01-01", f"{ano}-12-31") for ano in range(2015, 2025)])
+        db.execute("ANALYZE")
+        db.close()
+        processo, url = subir_servidor(caminho, args.leitores)
+        falhou = asyncio.run(executar(url, args))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait(timeout=30)
+        remover_banco(db, caminho)
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
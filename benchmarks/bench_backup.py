@@ -0,0 +1,80 @@
+"""
+Benchmark do custo do backup por lançamento.
+
+Compara a latência de um lançamento seguido de:
+  * síncrono: create_backup() completo após cada lançamento (comportamento anterior);
+  * agendado: BackupScheduler.schedule(), com o backup feito em segundo plano
+    ao fim da janela.
+Mostra também quantos backups cada modo gerou.
+
+Uso:
+    python benchmarks/bench_backup.py
+    python benchmarks/bench_backup.py --transacoes 500000 --lancamentos 20 --janela 1
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes, gerar_transacoes
+
+from src.utils.backup import BackupScheduler, create_backup, get_backup_files
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def lancar(db, lancamento):
+    with db.transaction():
+        db.execute(SQL_INSERT, lancamento)
+
+
+def medir(db, lancamentos, apos_lancar):
+    latencias = []
+    for lancamento in lancamentos:
+        inicio = time.perf_counter()
+        lancar(db, lancamento)
+        apos_lancar()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(latencias), max(latencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacoes", type=int, default=200000, help="tamanho do razão pré-carregado")
+    parser.add_argument("--lancamentos", type=int, default=20)
+    parser.add_argument("--janela", type=float, default=1.0, help="janela do agendador (segundos)")
+    args = parser.parse_args()
+
+    db, caminho = criar_banco()
+    pasta = tempfile.mkdtemp()
+    try:
+        contas = popular_contas(db, 100)
+        popular_transacoes(db, contas, args.transacoes)
+        lancamentos = list(gerar_transacoes(contas, 2 * args.lancamentos, seed=5))
+
+        pasta_sincrona = f"{pasta}/sincrono"
+        p50_sinc, max_sinc = medir(db, lancamentos[:args.lancamentos],
+                                   lambda: create_backup(caminho, pasta_sincrona, verbose=False))
+
+        scheduler = BackupScheduler(caminho, f"{pasta}/agendado", window=args.janela)
+        p50_ag, max_ag = medir(db, lancamentos[args.lancamentos:], scheduler.schedule)
+        inicio = time.perf_counter()
+        scheduler.close()
+        espera_final = time.perf_counter() - inicio
+
+        print(f"{'modo':<10} {'p50 (ms)':>10} {'máx (ms)':>10} {'backups':>8}")
+        print("-" * 41)
+        print(f"{'síncrono':<10} {p50_sinc:>10.2f} {max_sinc:>10.2f} {len(get_backup_files(pasta_sincrona)):>8}")
+        print(f"{'agendado':<10} {p50_ag:>10.2f} {max_ag:>10.2f} {len(get_backup_files(f'{pasta}/agendado')):>8}")
+        print(f"\nBackup final no encerramento do agendador: {espera_final:.2f}s")
+    finally:
+        shutil.rmtree(pasta)
+        remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
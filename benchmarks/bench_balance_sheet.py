@@ -0,0 +1,85 @@
+"""
+Benchmark do cálculo de saldos do balanço patrimonial.
+
+Compara a passada agrupada de BalanceSheet.calcular_saldos_na_data com a
+abordagem anterior (uma varredura de transactions por conta), variando o
+número de contas e de transações.
+
+Uso:
+    python benchmarks/bench_balance_sheet.py
+    python benchmarks/bench_balance_sheet.py --contas 100 1000 --transacoes 10000 100000
+"""
+import argparse
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+from src.core.balance_sheet import BalanceSheet
+
+DATA_CORTE = "2024-12-31"
+
+
+def saldos_por_conta(db, data):
+    """Implementação anterior: uma consulta SUM(CASE ...) por conta."""
+    contas = db.execute("SELECT id, name, type, specific_type, specific_subtype FROM accounts").fetchall()
+    linhas = []
+    for conta_id, nome, tipo, specific_type, specific_subtype in contas:
+        total_debito, total_credito = db.execute(
+            """
+            SELECT COALESCE(SUM(CASE WHEN debit_account = ? THEN amount ELSE 0 END), 0) AS "debito [MONEY]",
+                   COALESCE(SUM(CASE WHEN credit_account = ? THEN amount ELSE 0 END), 0) AS "credito [MONEY]"
+            FROM transactions
+            WHERE date <= ?
+            """,
+            (conta_id, conta_id, data),
+        ).fetchone()
+        linhas.append((conta_id, nome, tipo, specific_type, specific_subtype, total_debito, total_credito))
+    return BalanceSheet(db).classificar_contas(linhas)
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--sem-legado", action="store_true", help="não executa a versão por conta (lenta)")
+    args = parser.parse_args()
+
+    print(f"{'contas':>8} {'transações':>12} {'agrupado (s)':>14} {'por conta (s)':>14} {'ganho':>8}")
+    print("-" * 60)
+    for n_contas in args.contas:
+        for n_transacoes in args.transacoes:
+            db, caminho = criar_banco()
+            try:
+                contas = popular_contas(db, n_contas)
+                popular_transacoes(db, contas, n_transacoes)
+                balance_sheet = BalanceSheet(db, use_snapshots=False)
+
+                t_agrupado, novo = medir(lambda: balance_sheet.calcular_saldos_na_data(DATA_CORTE), args.repeticoes)
+                if args.sem_legado:
+                    print(f"{n_contas:>8} {n_transacoes:>12} {t_agrupado:>14.4f} {'-':>14} {'-':>8}")
+                    continue
+
+                t_legado, antigo = medir(lambda: saldos_por_conta(db, DATA_CORTE), 1)
+                for lista_nova, lista_antiga in zip(novo, antigo):
+                    saldos_novos = {c["id"]: c["balance"] for c in lista_nova}
+                    saldos_antigos = {c["id"]: c["balance"] for c in lista_antiga}
+                    assert saldos_novos.keys() == saldos_antigos.keys()
+                    assert saldos_novos == saldos_antigos
+                print(f"{n_contas:>8} {n_transacoes:>12} {t_agrupado:>14.4f} {t_legado:>14.4f} {t_legado / t_agrupado:>7.1f}x")
+            finally:
+                remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
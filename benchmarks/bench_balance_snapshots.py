@@ -0,0 +1,100 @@
+"""
+Benchmark dos snapshots de saldo (BalanceSnapshots).
+
+Gera razões com o mesmo volume de lançamentos por ano e histórico cada vez
+mais longo, com períodos fiscais mensais, e mede o balanço patrimonial em uma
+data do último mês:
+  * com snapshots: snapshot do último período encerrado + lançamentos posteriores;
+  * sem snapshots: soma do razão desde o início.
+Com snapshots, a latência não deve depender do tamanho do histórico.
+Mostra também o custo (único) de criar os snapshots e o de um lançamento
+retroativo seguido do balanço (que recria os snapshots invalidados).
+
+Uso:
+    python benchmarks/bench_balance_snapshots.py
+    python benchmarks/bench_balance_snapshots.py --anos 1 5 20 --por-ano 100000
+"""
+import argparse
+import time
+from datetime import date
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+from src.core.balance_sheet import BalanceSheet
+
+FIM_HISTORICO = date(2025, 12, 31)
+
+
+def popular_periodos_mensais(db, ano_inicial, ano_final):
+    periodos = []
+    for ano in range(ano_inicial, ano_final + 1):
+        for mes in range(1, 13):
+            proximo = date(ano + (mes == 12), mes % 12 + 1, 1)
+            fim = date.fromordinal(proximo.toordinal() - 1)
+            periodos.append((date(ano, mes, 1).isoformat(), fim.isoformat(), 1))
+    with db.transaction():
+        db.executemany("INSERT INTO fiscal_periods (start_date, end_date, interval_days) VALUES (?, ?, ?)", periodos)
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def saldos(listas):
+    return {conta["id"]: conta["balance"] for lista in listas for conta in lista}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--anos", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--por-ano", type=int, default=50000, help="lançamentos por ano de histórico")
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    data_consulta = FIM_HISTORICO.replace(day=20).isoformat()
+    print(f"{'anos':>5} {'transações':>11} {'criar snapshots':>16} {'com (ms)':>9} {'sem (ms)':>9} "
+          f"{'retroativo (ms)':>16}")
+    print("-" * 72)
+    for anos in args.anos:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            inicio = date(FIM_HISTORICO.year - anos + 1, 1, 1)
+            total = anos * args.por_ano
+            popular_transacoes(db, contas, total, inicio=inicio, dias=(FIM_HISTORICO - inicio).days + 1)
+            popular_periodos_mensais(db, inicio.year, FIM_HISTORICO.year)
+            db.execute("ANALYZE")
+
+            com = BalanceSheet(db)
+            sem = BalanceSheet(db, use_snapshots=False)
+            t_criar, _ = medir(com.snapshots.refresh, 1)
+            t_com, saldos_com = medir(lambda: com.calcular_saldos_na_data(data_consulta), args.repeticoes)
+            t_sem, saldos_sem = medir(lambda: sem.calcular_saldos_na_data(data_consulta), args.repeticoes)
+            assert saldos(saldos_com) == saldos(saldos_sem)
+
+            # Lançamento retroativo no meio do último ano: invalida os snapshots a partir dele
+            retroativo = FIM_HISTORICO.replace(month=6, day=15).isoformat()
+            inicio_retro = time.perf_counter()
+            db.execute(
+                "INSERT INTO transactions (date, description, debit_account, credit_account, amount) VALUES (?, ?, ?, ?, ?)",
+                (retroativo, "Retroativo", contas[0], contas[1], Decimal("10.00")),
+            )
+            depois = com.calcular_saldos_na_data(data_consulta)
+            t_retro = (time.perf_counter() - inicio_retro) * 1000
+            assert saldos(depois) == saldos(sem.calcular_saldos_na_data(data_consulta))
+
+            print(f"{anos:>5} {total:>11} {t_criar:>14.0f}ms {t_com:>9.2f} {t_sem:>9.2f} {t_retro:>16.2f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
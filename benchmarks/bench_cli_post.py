@@ -0,0 +1,88 @@
+"""
+Benchmark do lançamento em lote pela linha de comando (cli.py post).
+
+Gera um arquivo CSV de lançamentos com contas por nome e mede:
+  * um único processo `cli.py post` gravando o arquivo inteiro (blocos com executemany);
+  * um processo `cli.py post` por lançamento, como um script que repete uma
+    operação por chamada (medido em uma amostra e extrapolado para o total).
+
+Os bancos são temporários; data/financas.db não é tocado (e nenhum backup é gerado).
+
+Uso:
+    python benchmarks/bench_cli_post.py
+    python benchmarks/bench_cli_post.py --lancamentos 50000 --amostra 10
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, gerar_transacoes
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(project_dir, "cli.py")
+
+
+def escrever_csv(caminho, lancamentos, nomes):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";")
+        escritor.writerow(["data", "descricao", "debito", "credito", "valor"])
+        for data, descricao, debito, credito, valor in lancamentos:
+            escritor.writerow([data, descricao, nomes[debito], nomes[credito], f"{valor:.2f}".replace(".", ",")])
+
+
+def postar(banco, caminho):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, CLI, "--banco", banco, "post", caminho, "--saida", os.devnull], check=True)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--lancamentos", type=int, default=20000)
+    parser.add_argument("--amostra", type=int, default=20, help="processos de um lançamento medidos")
+    args = parser.parse_args()
+
+    db, caminho_banco = criar_banco()
+    pasta = tempfile.mkdtemp(prefix="easyaccounts_cli_")
+    try:
+        contas = popular_contas(db, args.contas)
+        nomes = dict(db.execute("SELECT id, name FROM accounts").fetchall())
+        lancamentos = list(gerar_transacoes(contas, args.lancamentos))
+        db.close()
+
+        arquivo = os.path.join(pasta, "lancamentos.csv")
+        escrever_csv(arquivo, lancamentos, nomes)
+        t_lote = postar(caminho_banco, arquivo)
+
+        t_unitario = 0.0
+        for i, lancamento in enumerate(lancamentos[:args.amostra]):
+            unitario = os.path.join(pasta, f"lancamento_{i}.csv")
+            escrever_csv(unitario, [lancamento], nomes)
+            t_unitario += postar(caminho_banco, unitario)
+        por_processo = t_unitario / args.amostra
+
+        db.connect()
+        gravados = db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        assert gravados == args.lancamentos + args.amostra, f"{gravados} lançamentos gravados"
+
+        print(f"{args.lancamentos} lançamentos, {args.contas} contas")
+        print(f"{'modo':<34} {'tempo total (s)':>16} {'lançamentos/s':>14}")
+        print("-" * 66)
+        print(f"{'um processo para o arquivo':<34} {t_lote:>16.2f} {args.lancamentos / t_lote:>14,.0f}")
+        print(f"{'um processo por lançamento (*)':<34} {por_processo * args.lancamentos:>16.2f} "
+              f"{1 / por_processo:>14,.0f}")
+        print(f"(*) extrapolado de {args.amostra} processos ({por_processo * 1000:.0f} ms cada)")
+    finally:
+        remover_banco(db, caminho_banco)
+        for nome in os.listdir(pasta):
+            os.remove(os.path.join(pasta, nome))
+        os.rmdir(pasta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark da depreciação em lote (DepreciationEngine).
+
+Gera ativos com os três métodos (Linear, Declining Balance e Sum of Years
+Digits), vidas úteis e datas de início variadas e calcula, para todos, o
+valor no início e no fim de um período fiscal e a depreciação do período:
+  * escalar: DepreciationService.calcular_valor_atual para cada ativo, duas
+    vezes (início e fim), como em calcular_depreciacao;
+  * DepreciationEngine: carga em colunas e cálculo vetorizado.
+Confere que os dois resultados são iguais centavo a centavo.
+
+Uso:
+    python benchmarks/bench_depreciation_engine.py
+    python benchmarks/bench_depreciation_engine.py --ativos 10000 100000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.core.depreciation import DepreciationEngine
+from src.services.depreciation_service import DepreciationService
+
+INICIO_PERIODO = date(2024, 1, 1)
+FIM_PERIODO = date(2024, 12, 31)
+
+SQL_ATIVOS = """
+SELECT a.id, a.name, a.acquisition_date, a.acquisition_value,
+    dm.name as method_name, a.useful_life_years, a.salvage_value,
+    a.start_depreciation_date, acc.name as account_name
+FROM assets a
+JOIN depreciation_methods dm ON a.depreciation_method_id = dm.id
+JOIN accounts acc ON a.account_id = acc.id
+WHERE a.is_active = 1
+ORDER BY a.id
+"""
+
+
+def popular_ativos(db, contas, quantidade, seed=42):
+    rng = random.Random(seed)
+    metodos = [row[0] for row in db.execute("SELECT id FROM depreciation_methods").fetchall()]
+    linhas = []
+    for i in range(quantidade):
+        valor = Decimal(rng.randrange(10000, 50000000)).scaleb(-2)
+        residual = (valor * Decimal(rng.choice([0, 5, 10, 20])) / 100).quantize(Decimal("0.01"))
+        inicio = date(2012, 1, 1) + timedelta(days=rng.randrange(4500))
+        linhas.append((f"Ativo {i}", inicio.isoformat(), valor, rng.choice(metodos), rng.choice([1, 2, 3, 5, 8, 10, 20]),
+                       residual, inicio.isoformat(), rng.choice(contas)))
+    with db.transaction():
+        db.executemany("""
+        INSERT INTO assets (name, acquisition_date, acquisition_value, depreciation_method_id,
+                            useful_life_years, salvage_value, start_depreciation_date, account_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)""", linhas)
+
+
+def escalar(db):
+    service = DepreciationService(db)
+    resultado = []
+    for asset in db.execute(SQL_ATIVOS).fetchall():
+        valor_inicio = service.calcular_valor_atual(asset, INICIO_PERIODO)
+        valor_fim = service.calcular_valor_atual(asset, FIM_PERIODO)
+        resultado.append((asset[0], valor_inicio, valor_fim, valor_inicio - valor_fim))
+    return resultado
+
+
+def vetorizado(db):
+    return DepreciationEngine(db).calcular_periodo(INICIO_PERIODO, FIM_PERIODO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ativos", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--contas", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'ativos':>8} {'escalar (ms)':>13} {'vetorizado (ms)':>16} {'ganho':>7} {'depreciação total':>20}")
+    print("-" * 68)
+    for n_ativos in args.ativos:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            popular_ativos(db, contas, n_ativos)
+
+            inicio = time.perf_counter()
+            esperado = escalar(db)
+            t_escalar = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            tabela = vetorizado(db)
+            t_vetorizado = time.perf_counter() - inicio
+
+            obtido = [(linha.id, linha.valor_inicio, linha.valor_fim, linha.depreciacao) for linha in tabela]
+            divergentes = [(e, o) for e, o in zip(esperado, obtido) if e != o]
+            assert len(esperado) == len(obtido) and not divergentes, divergentes[:5]
+            print(f"{n_ativos:>8} {t_escalar * 1000:>13.1f} {t_vetorizado * 1000:>16.1f} "
+                  f"{t_escalar / t_vetorizado:>6.1f}x {tabela.total():>20,.2f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark do lançamento da depreciação do período (DepreciationPosting).
+
+Com N ativos com contas de depreciação definidas, compara:
+  * anterior: um INSERT confirmado sozinho por ativo, com o valor calculado
+    por DepreciationService.calcular_valor_atual (início e fim do período);
+  * DepreciationPosting.executar: cálculo vetorizado, um executemany dos
+    lançamentos e um do registro (ativo, período), em uma unidade de trabalho.
+Confere que uma segunda execução para o mesmo período não lança nada.
+
+Uso:
+    python benchmarks/bench_depreciation_posting.py
+    python benchmarks/bench_depreciation_posting.py --ativos 10000 50000
+"""
+import argparse
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+from bench_depreciation_engine import SQL_ATIVOS, popular_ativos, INICIO_PERIODO, FIM_PERIODO
+
+from src.core.depreciation import DepreciationPosting
+from src.services.depreciation_service import DepreciationService
+
+
+def preparar(db, n_contas, n_ativos):
+    contas = popular_contas(db, n_contas)
+    popular_ativos(db, contas, n_ativos)
+    db.execute("UPDATE assets SET expense_account_id = ?, accumulated_account_id = ?", (contas[0], contas[1]))
+    db.execute("INSERT INTO fiscal_periods (start_date, end_date, interval_days) VALUES (?, ?, 12)",
+               (INICIO_PERIODO.isoformat(), FIM_PERIODO.isoformat()))
+    return contas, db.execute("SELECT MAX(id) FROM fiscal_periods").fetchone()[0]
+
+
+def anterior(db, contas):
+    service = DepreciationService(db)
+    for asset in db.execute(SQL_ATIVOS).fetchall():
+        valor = service.calcular_valor_atual(asset, INICIO_PERIODO) - service.calcular_valor_atual(asset, FIM_PERIODO)
+        if valor > 0:
+            db.execute(DepreciationPosting.SQL_INSERT, (FIM_PERIODO.isoformat(),
+                       f"Depreciação acumulada no período - {asset[1]}", contas[0], contas[1], valor))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ativos", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--contas", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'ativos':>8} {'anterior (ms)':>14} {'em lote (ms)':>13} {'repetição (ms)':>15} {'lançados':>9}")
+    print("-" * 64)
+    for n_ativos in args.ativos:
+        db, caminho = criar_banco()
+        try:
+            contas, _ = preparar(db, args.contas, n_ativos)
+            inicio = time.perf_counter()
+            anterior(db, contas)
+            t_anterior = time.perf_counter() - inicio
+            esperado = db.execute("SELECT COUNT(*), SUM(amount) FROM transactions").fetchone()
+        finally:
+            remover_banco(db, caminho)
+
+        db, caminho = criar_banco()
+        try:
+            _, periodo_id = preparar(db, args.contas, n_ativos)
+            posting = DepreciationPosting(db)
+            inicio = time.perf_counter()
+            resultado = posting.executar(periodo_id)
+            t_lote = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            repeticao = posting.executar(periodo_id)
+            t_repeticao = time.perf_counter() - inicio
+
+            obtido = db.execute("SELECT COUNT(*), SUM(amount) FROM transactions").fetchone()
+            assert obtido == esperado, (obtido, esperado)
+            assert not repeticao.lancados and repeticao.ja_lancados == len(resultado.lancados)
+            print(f"{n_ativos:>8} {t_anterior * 1000:>14.1f} {t_lote * 1000:>13.1f} {t_repeticao * 1000:>15.1f} "
+                  f"{len(resultado.lancados):>9}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do cronograma mensal de depreciação (DepreciationSchedule).
+
+Gera N ativos, materializa o cronograma de todos e compara, para as
+perguntas de fechamento:
+  * valor contábil de todos os ativos em um fim de mês: calcular_valor_atual
+    por ativo (anterior) contra uma leitura do cronograma;
+  * depreciação total de um período: calcular_valor_atual no início e no fim
+    de cada ativo (anterior) contra a soma indexada do cronograma.
+Confere que os valores do cronograma são iguais aos de calcular_valor_atual.
+
+Uso:
+    python benchmarks/bench_depreciation_schedule.py
+    python benchmarks/bench_depreciation_schedule.py --ativos 1000 10000
+"""
+import argparse
+import time
+from datetime import date
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+from bench_depreciation_engine import SQL_ATIVOS, popular_ativos
+
+from src.core.depreciation_schedule import DepreciationSchedule
+from src.services.depreciation_service import DepreciationService
+
+FECHAMENTO = date(2024, 6, 30)
+# Depreciação de 2024: do fechamento de dezembro de 2023 ao de dezembro de 2024
+ANTERIOR, INICIO, FIM = date(2023, 12, 31), date(2024, 1, 1), date(2024, 12, 31)
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return (time.perf_counter() - inicio) * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ativos", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--contas", type=int, default=50)
+    args = parser.parse_args()
+
+    for n_ativos in args.ativos:
+        db, caminho = criar_banco()
+        try:
+            popular_ativos(db, popular_contas(db, args.contas), n_ativos)
+            service = DepreciationService(db)
+            schedule = DepreciationSchedule(db)
+            assets = db.execute(SQL_ATIVOS).fetchall()
+
+            t_geracao, _ = medir(schedule.sincronizar)
+            linhas = db.execute("SELECT COUNT(*) FROM depreciation_schedule").fetchone()[0]
+            db.execute("ANALYZE")
+
+            t_valores_antes, esperado = medir(lambda: [
+                (asset[0], service.calcular_valor_atual(asset, FECHAMENTO)) for asset in assets])
+            t_valores, obtido = medir(lambda: schedule.valores_contabeis(FECHAMENTO))
+            assert esperado == [(row[0], row[2]) for row in obtido]
+
+            t_periodo_antes, total_esperado = medir(lambda: sum(
+                (service.calcular_valor_atual(asset, ANTERIOR) - service.calcular_valor_atual(asset, FIM)
+                 for asset in assets), Decimal("0.00")))
+            t_periodo, total = medir(lambda: schedule.depreciacao_do_periodo(INICIO, FIM))
+            assert total == total_esperado, (total, total_esperado)
+
+            print(f"\n{n_ativos} ativos - cronograma: {linhas} linhas em {t_geracao:.0f} ms")
+            print(f"{'consulta':<28} {'anterior (ms)':>14} {'cronograma (ms)':>16}")
+            print("-" * 60)
+            print(f"{'valor contábil em ' + FECHAMENTO.isoformat():<28} {t_valores_antes:>14.1f} {t_valores:>16.1f}")
+            print(f"{'depreciação de 2024':<28} {t_periodo_antes:>14.1f} {t_periodo:>16.1f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark da importação de extratos (ImportService).
+
+Gera um extrato CSV sintético em arquivo temporário, importa-o com regras
+de mapeamento e mostra a vazão (linhas/s) e o pico de memória do processo.
+O RSS inclui o cache de páginas e o mmap do SQLite (limitados pelo perfil de
+PRAGMA); com --memoria, mede também o pico de memória alocada pelo Python
+(tracemalloc, mais lento), que deve ficar estável ao aumentar --linhas: o
+arquivo é lido como fluxo e gravado em blocos.
+
+Uso:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --linhas 100000 1000000 --bloco 5000 --memoria
+"""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.services.import_service import ImportService, ImportRules, ler_csv
+
+DESCRICOES = ["PIX RECEBIDO", "PAGTO ALUGUEL", "SUPERMERCADO", "TARIFA BANCARIA", "SALARIO", "POSTO COMBUSTIVEL"]
+
+
+def gerar_csv(caminho, linhas, seed=42):
+    rng = random.Random(seed)
+    inicio = date(2015, 1, 1)
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        arquivo.write("Data;Histórico;Valor\n")
+        for i in range(linhas):
+            data = (inicio + timedelta(days=rng.randrange(3650))).strftime("%d/%m/%Y")
+            valor = rng.randrange(-500000, 500000) or 1
+            sinal = "-" if valor < 0 else ""
+            arquivo.write(f"{data};{rng.choice(DESCRICOES)} {i};{sinal}{abs(valor) // 100},{abs(valor) % 100:02d}\n")
+
+
+def pico_memoria_mb():
+    # ru_maxrss é em KiB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, nargs="+", default=[50000, 200000])
+    parser.add_argument("--bloco", type=int, default=5000)
+    parser.add_argument("--perfil", default="bulk-load")
+    parser.add_argument("--memoria", action="store_true", help="mede o pico de memória do Python (tracemalloc)")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'tamanho (MB)':>13} {'tempo (s)':>10} {'linhas/s':>10} {'pico RSS (MB)':>14} {'pico Python (MB)':>17}")
+    print("-" * 79)
+    for linhas in args.linhas:
+        db, caminho = criar_banco(profile=args.perfil)
+        fd, arquivo_csv = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            contas = popular_contas(db, 10)
+            gerar_csv(arquivo_csv, linhas)
+            regras = ImportRules.from_dict(db, {
+                "regras": [
+                    {"padrao": "aluguel", "conta": contas[2]},
+                    {"padrao": "salario", "conta": contas[7]},
+                    {"padrao": "^PIX", "regex": True, "conta": contas[8]},
+                ],
+                "padrao": contas[3],
+            })
+            if args.memoria:
+                tracemalloc.start()
+            resultado = ImportService(db).importar(ler_csv(arquivo_csv), contas[0], regras, args.bloco)
+            pico_python = "-"
+            if args.memoria:
+                pico_python = f"{tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}"
+                tracemalloc.stop()
+            assert resultado.importadas == linhas, resultado
+            tamanho = os.path.getsize(arquivo_csv) / 2 ** 20
+            print(f"{linhas:>10} {tamanho:>13.1f} {resultado.segundos:>10.2f} "
+                  f"{resultado.linhas_por_segundo:>10,.0f} {pico_memoria_mb():>14.1f} {pico_python:>17}")
+        finally:
+            os.remove(arquivo_csv)
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark da DRP (IncomeStatement).
+
+Compara o relatório da DRP feito com a consulta única de IncomeStatement
+(uma varredura do intervalo de datas no índice) com a abordagem anterior:
+calcular_lucro_periodo e generate_drp_report executavam, cada um, as consultas
+de receitas e de despesas com LEFT JOIN ... ON a.id = t.credit_account OR
+a.id = t.debit_account (quatro varreduras do razão). Confere que os
+resultados são iguais.
+
+Uso:
+    python benchmarks/bench_income_statement.py
+    python benchmarks/bench_income_statement.py --transacoes 1000000 5000000
+"""
+import argparse
+import time
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+from src.core.income_statement import IncomeStatement
+
+INICIO, FIM = "2020-01-01", "2020-12-31"
+
+SQL_RECEITAS = """
+SELECT a.id, a.name,
+       COALESCE(SUM(CASE WHEN t.credit_account = a.id THEN t.amount ELSE 0 END), 0) AS "credit_total [MONEY]",
+       COALESCE(SUM(CASE WHEN t.debit_account = a.id THEN t.amount ELSE 0 END), 0) AS "debit_total [MONEY]"
+FROM accounts a
+LEFT JOIN transactions t ON a.id = t.credit_account OR a.id = t.debit_account
+WHERE a.specific_type IN ('entradas', 'vendas')
+AND t.date BETWEEN ? AND ?
+GROUP BY a.id, a.name
+ORDER BY a.name
+"""
+
+SQL_DESPESAS = """
+SELECT a.id, a.name,
+       COALESCE(SUM(CASE WHEN t.debit_account = a.id THEN t.amount ELSE 0 END), 0) AS "debit_total [MONEY]",
+       COALESCE(SUM(CASE WHEN t.credit_account = a.id THEN t.amount ELSE 0 END), 0) AS "credit_total [MONEY]"
+FROM accounts a
+LEFT JOIN transactions t ON a.id = t.debit_account OR a.id = t.credit_account
+WHERE a.specific_type IN ('despesas', 'compras')
+AND t.date BETWEEN ? AND ?
+GROUP BY a.id, a.name
+ORDER BY a.name
+"""
+
+
+def drp_anterior(db):
+    """Relatório anterior: lucro (2 consultas) e depois as mesmas 2 consultas para exibir."""
+    for _ in range(2):
+        receitas = db.execute(SQL_RECEITAS, (INICIO, FIM)).fetchall()
+        despesas = db.execute(SQL_DESPESAS, (INICIO, FIM)).fetchall()
+    total_receitas = sum((r[2] - r[3] for r in receitas), Decimal("0.00"))
+    total_despesas = sum((d[2] - d[3] for d in despesas), Decimal("0.00"))
+    return ({r[0]: r[2] - r[3] for r in receitas}, {d[0]: d[2] - d[3] for d in despesas},
+            total_receitas - total_despesas)
+
+
+def drp_atual(db):
+    demonstracao = IncomeStatement(db).calcular(INICIO, FIM)
+    return ({c.id: c.net for c in demonstracao.receitas}, {c.id: c.net for c in demonstracao.despesas},
+            demonstracao.resultado_liquido)
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'transações':>12} {'atual (s)':>10} {'anterior (s)':>13} {'ganho':>8}")
+    print("-" * 46)
+    for n_transacoes in args.transacoes:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            popular_transacoes(db, contas, n_transacoes)
+            db.execute("ANALYZE")
+            t_atual, atual = medir(lambda: drp_atual(db), args.repeticoes)
+            t_anterior, anterior = medir(lambda: drp_anterior(db), 1)
+            assert atual == anterior
+            print(f"{n_transacoes:>12} {t_atual:>10.4f} {t_anterior:>13.4f} {t_anterior / t_atual:>7.1f}x")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
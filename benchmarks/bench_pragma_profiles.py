@@ -0,0 +1,116 @@
+"""
+Benchmark dos perfis de PRAGMA (config.settings.PRAGMA_PROFILES).
+
+Para cada perfil mede:
+  * latência de escrita: um lançamento (INSERT; os gatilhos atualizam os 2 saldos) por unidade de trabalho;
+  * concorrência de leitura: leitores calculando o balanço patrimonial em paralelo
+    com um escritor lançando continuamente, contando consultas concluídas,
+    lançamentos realizados e esperas por lock.
+
+Uso:
+    python benchmarks/bench_pragma_profiles.py
+    python benchmarks/bench_pragma_profiles.py --perfis durable bulk-load --leitores 4 --segundos 5
+"""
+import argparse
+import sqlite3
+import statistics
+import threading
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes, gerar_transacoes
+
+from config.settings import PRAGMA_PROFILES
+from src.core.balance_sheet import BalanceSheet
+from src.database.connection import ConnectionPool
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def lancar(db, lancamento):
+    with db.transaction():
+        db.execute(SQL_INSERT, lancamento)
+
+
+def medir_escrita(db, lancamentos):
+    latencias = []
+    for lancamento in lancamentos:
+        inicio = time.perf_counter()
+        lancar(db, lancamento)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    latencias.sort()
+    p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+    return statistics.median(latencias), p99
+
+
+def medir_concorrencia(caminho, perfil, contas, leitores, segundos):
+    pool = ConnectionPool(caminho, max_readers=leitores, profile=perfil)
+    writer = pool.writer()
+    parar = threading.Event()
+    contadores = {"leituras": 0, "escritas": 0, "locks": 0}
+    trava = threading.Lock()
+
+    def leitor():
+        while not parar.is_set():
+            try:
+                with pool.reader() as db:
+                    BalanceSheet(db).calcular_saldos_na_data("2030-12-31")
+                with trava:
+                    contadores["leituras"] += 1
+            except sqlite3.OperationalError:
+                with trava:
+                    contadores["locks"] += 1
+
+    def escritor():
+        for lancamento in gerar_transacoes(contas, 10 ** 9, seed=7):
+            if parar.is_set():
+                break
+            try:
+                lancar(writer, lancamento)
+                with trava:
+                    contadores["escritas"] += 1
+            except sqlite3.OperationalError:
+                with trava:
+                    contadores["locks"] += 1
+
+    threads = [threading.Thread(target=leitor) for _ in range(leitores)]
+    threads.append(threading.Thread(target=escritor))
+    for thread in threads:
+        thread.start()
+    time.sleep(segundos)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    pool.close()
+    return contadores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--perfis", nargs="+", default=list(PRAGMA_PROFILES))
+    parser.add_argument("--lancamentos", type=int, default=500)
+    parser.add_argument("--transacoes", type=int, default=50000, help="tamanho do razão pré-carregado")
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'perfil':<10} {'p50 escrita':>12} {'p99 escrita':>12} {'leituras':>9} {'escritas':>9} {'locks':>6}")
+    print("-" * 63)
+    for perfil in args.perfis:
+        db, caminho = criar_banco(profile=perfil)
+        try:
+            contas = popular_contas(db, 200)
+            popular_transacoes(db, contas, args.transacoes)
+            p50, p99 = medir_escrita(db, list(gerar_transacoes(contas, args.lancamentos, seed=3)))
+            db.close()
+            contadores = medir_concorrencia(caminho, perfil, contas, args.leitores, args.segundos)
+            print(f"{perfil:<10} {p50:>10.2f}ms {p99:>10.2f}ms {contadores['leituras']:>9} "
+                  f"{contadores['escritas']:>9} {contadores['locks']:>6}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
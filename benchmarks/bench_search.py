@@ -0,0 +1,75 @@
+"""
+Benchmark da busca de select_from_list (SearchIndex).
+
+Compara, para cada termo, o filtro anterior (normalização Unicode de todos os
+itens a cada termo digitado) com o índice, que normaliza os itens uma vez e
+busca por prefixo/trigramas. Mostra também o custo de construir o índice.
+
+Uso:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --itens 10000 50000 200000
+"""
+import argparse
+import random
+import time
+import unicodedata
+from collections import namedtuple
+
+import ledger_fixtures  # noqa: F401 (ajusta o sys.path)
+
+from src.utils.search_utils import SearchIndex
+
+Item = namedtuple("Item", ["id", "name"])
+
+PALAVRAS = ["Caixa", "Banco", "Aluguel", "Salário", "Energia", "Água", "Serviços", "Fornecedor",
+            "Cliente", "Imposto", "Depreciação", "Veículo", "Manutenção", "Receita", "Despesa"]
+TERMOS = ["ban", "salario", "agua", "manutencao veic", "xyz", "deprec", "fornecedr"]
+
+
+def gerar_itens(quantidade, seed=42):
+    rng = random.Random(seed)
+    return [Item(i, f"{' '.join(rng.sample(PALAVRAS, 3))} {i}") for i in range(1, quantidade + 1)]
+
+
+def filtro_anterior(itens, termo):
+    normalizado = unicodedata.normalize('NFD', termo).encode('ascii', 'ignore').decode('ascii').lower()
+    return [item for item in itens
+            if normalizado in unicodedata.normalize('NFD', item.name).encode('ascii', 'ignore').decode('ascii').lower()]
+
+
+def construir_indice(itens):
+    indice = SearchIndex(itens)
+    indice.substring("caixa")  # a primeira busca monta o índice de palavras
+    return indice
+
+
+def medir(funcao, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--itens", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    for quantidade in args.itens:
+        itens = gerar_itens(quantidade)
+        t_indice, indice = medir(lambda: construir_indice(itens), 1)
+        print(f"\n{quantidade} itens - construção do índice: {t_indice:.1f} ms")
+        print(f"{'termo':<18} {'anterior (ms)':>14} {'índice (ms)':>12} {'itens':>7} {'aproximada':>11}")
+        print("-" * 66)
+        for termo in TERMOS:
+            t_antigo, antigos = medir(lambda: filtro_anterior(itens, termo))
+            t_novo, (posicoes, aproximada) = medir(lambda: indice.search(termo))
+            if not aproximada:
+                assert {itens[i].id for i in posicoes} == {item.id for item in antigos}
+            print(f"{termo:<18} {t_antigo:>14.2f} {t_novo:>12.2f} {len(posicoes):>7} {'sim' if aproximada else 'não':>11}")
+
+
+if __name__ == "__main__":
+    main()
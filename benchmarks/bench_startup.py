@@ -0,0 +1,136 @@
+"""
+Benchmark da abertura do programa (main.py) até o primeiro prompt do menu.
+
+Executa `python -X importtime -u main.py` várias vezes em uma pasta temporária
+(data/financas.db é relativo à pasta atual, então o banco real não é tocado),
+mede o tempo até aparecer "Selecione uma opção:" e responde "Sair". Mostra a
+mediana, os imports mais caros da abertura e, para comparação, o tempo de
+importar todos os serviços do menu de uma vez (como era antes da carga sob
+demanda).
+
+Falha (código de saída 1) se a mediana passar do limite ou se algum módulo
+pesado (numpy, rich, tabulate, dateutil) for importado na abertura, para que o
+benchmark sirva de teste de regressão.
+
+Uso:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --execucoes 10 --limite-ms 200
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(project_dir, "main.py")
+
+PROMPT = "Selecione uma opção:"
+OPCAO_SAIR = "8"
+# Tempo máximo (mediana) até o primeiro prompt
+LIMITE_MS = 150
+# Dependências pesadas que só devem ser importadas ao entrar no menu que as usa
+MODULOS_PESADOS = ("numpy", "rich", "tabulate", "dateutil")
+
+
+def abrir_ate_o_prompt(pasta):
+    """Abre o main.py, espera o primeiro prompt e sai. Retorna (segundos, saída do -X importtime)."""
+    t0 = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-u", MAIN],
+        cwd=pasta, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    lido = b""
+    alvo = PROMPT.encode("utf-8")
+    while alvo not in lido:
+        pedaco = processo.stdout.read1(4096)
+        if not pedaco:
+            processo.kill()
+            raise RuntimeError(f"main.py terminou antes do prompt:\n{lido.decode('utf-8', 'replace')}")
+        lido += pedaco
+    decorrido = time.perf_counter() - t0
+    _, erros = processo.communicate(f"{OPCAO_SAIR}\n".encode("utf-8"), timeout=30)
+    if processo.returncode != 0:
+        raise RuntimeError(f"main.py terminou com código {processo.returncode}:\n{erros.decode('utf-8', 'replace')}")
+    return decorrido, erros.decode("utf-8", "replace")
+
+
+def ler_importtime(saida):
+    """Linhas do -X importtime -> lista de (módulo, próprio em µs, acumulado em µs, nível)."""
+    imports = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "imported package" in linha:
+            continue
+        partes = linha[len("import time:"):].split("|")
+        try:
+            proprio, acumulado = int(partes[0]), int(partes[1])
+        except ValueError:
+            continue  # cabeçalho
+        nome = partes[2].rstrip()
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        imports.append((nome.strip(), proprio, acumulado, nivel))
+    return imports
+
+
+def tempo_importando_tudo():
+    """Tempo (s) de importar o menu e todos os serviços, como a abertura fazia antes."""
+    codigo = (
+        "import importlib, sys; sys.path.insert(0, %r)\n"
+        "from src.interfaces.menu import SERVICOS\n"
+        "for modulo, _ in SERVICOS.values(): importlib.import_module(modulo)\n"
+    ) % project_dir
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", codigo], check=True)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--execucoes", type=int, default=7)
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_MS,
+                        help="mediana máxima até o primeiro prompt (ms)")
+    parser.add_argument("--top", type=int, default=10, help="quantidade de imports mais caros a mostrar")
+    args = parser.parse_args()
+
+    tempos = []
+    imports = []
+    with tempfile.TemporaryDirectory(prefix="easyaccounts_startup_") as pasta:
+        for _ in range(args.execucoes):
+            decorrido, saida = abrir_ate_o_prompt(pasta)
+            tempos.append(decorrido)
+            imports = ler_importtime(saida)
+        criou_banco = os.path.exists(os.path.join(pasta, "data", "financas.db"))
+    mediana = statistics.median(tempos)
+    tudo = statistics.median(tempo_importando_tudo() for _ in range(args.execucoes))
+
+    print(f"{'etapa':<40} {'tempo (ms)':>11}")
+    print("-" * 52)
+    print(f"{'main.py até o primeiro prompt (mediana)':<40} {mediana * 1000:>11.1f}")
+    print(f"{'  mínimo / máximo':<40} {min(tempos) * 1000:>5.0f} / {max(tempos) * 1000:<5.0f}")
+    print(f"{'importar todos os serviços do menu':<40} {tudo * 1000:>11.1f}")
+
+    print(f"\nImports mais caros da abertura (acumulado, nível superior):")
+    topo = sorted((i for i in imports if i[3] == 0), key=lambda i: i[2], reverse=True)
+    for nome, _, acumulado, _ in topo[:args.top]:
+        print(f"  {nome:<45} {acumulado / 1000:>8.1f} ms")
+
+    carregados = {nome.split(".")[0] for nome, *_ in imports}
+    pesados = [m for m in MODULOS_PESADOS if m in carregados]
+    falhas = []
+    if pesados:
+        falhas.append(f"módulos pesados importados na abertura: {', '.join(pesados)}")
+    if criou_banco:
+        falhas.append("a abertura criou o banco antes de alguma ação usá-lo")
+    if mediana * 1000 > args.limite_ms:
+        falhas.append(f"mediana de {mediana * 1000:.1f} ms acima do limite de {args.limite_ms:.0f} ms")
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    if falhas:
+        sys.exit(1)
+    print(f"\nOK: abaixo do limite de {args.limite_ms:.0f} ms, sem módulos pesados na abertura.")
+
+
+if __name__ == "__main__":
+    main()
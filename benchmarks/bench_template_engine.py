@@ -0,0 +1,90 @@
+"""
+Benchmark da execução de modelos de transações (TemplateEngine).
+
+Simula o fechamento do mês: vários modelos com várias linhas, cada um lançado
+em várias datas. Compara:
+  * anterior: cada linha com um INSERT confirmado sozinho, com as contas de
+    cada perna buscadas uma a uma (duas vezes, como em executar_modelo);
+  * por execução: uma unidade de trabalho por modelo e data, um execute por linha;
+  * TemplateEngine: validação de tudo com uma consulta de contas e um único
+    executemany em uma unidade de trabalho.
+
+Uso:
+    python benchmarks/bench_template_engine.py
+    python benchmarks/bench_template_engine.py --modelos 50 --linhas 10 --datas 12
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.core.templates import TemplateEngine, TemplateRun, TemplateTransaction, TransactionTemplate
+
+SQL_INSERT = TemplateEngine.SQL_INSERT
+
+
+def gerar_execucoes(contas, n_modelos, n_linhas, n_datas, seed=42):
+    rng = random.Random(seed)
+    datas = [f"2024-{mes:02d}-28" for mes in range(1, n_datas + 1)]
+    modelos = []
+    for m in range(n_modelos):
+        linhas = []
+        for i in range(n_linhas):
+            debito, credito = rng.sample(contas, 2)
+            linhas.append(TemplateTransaction(f"Modelo {m} linha {i}", debito, credito,
+                                              Decimal(rng.randrange(100, 500000)).scaleb(-2)))
+        modelos.append(TransactionTemplate(m + 1, f"Modelo {m}", linhas))
+    return [TemplateRun(modelo, data) for modelo in modelos for data in datas]
+
+
+def anterior(db, execucoes):
+    for run in execucoes:
+        for _ in range(2):
+            for t in run.template.transactions:
+                db.execute("SELECT id, name FROM accounts WHERE id = ?", (t.debit_account,)).fetchone()
+                db.execute("SELECT id, name FROM accounts WHERE id = ?", (t.credit_account,)).fetchone()
+        for t in run.template.transactions:
+            db.execute(SQL_INSERT, (run.date, t.description, t.debit_account, t.credit_account, t.amount))
+
+
+def por_execucao(db, execucoes):
+    for run in execucoes:
+        with db.transaction():
+            for t in run.template.transactions:
+                db.execute(SQL_INSERT, (run.date, t.description, t.debit_account, t.credit_account, t.amount))
+
+
+def motor(db, execucoes):
+    TemplateEngine(db).execute(execucoes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--modelos", type=int, default=20)
+    parser.add_argument("--linhas", type=int, default=5)
+    parser.add_argument("--datas", type=int, default=12)
+    args = parser.parse_args()
+
+    total = args.modelos * args.linhas * args.datas
+    print(f"{args.modelos} modelos x {args.linhas} linhas x {args.datas} datas = {total} lançamentos")
+    print(f"{'abordagem':<16} {'tempo (ms)':>11} {'lançamentos/s':>15}")
+    print("-" * 44)
+    for nome, funcao in (("anterior", anterior), ("por execução", por_execucao), ("TemplateEngine", motor)):
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            execucoes = gerar_execucoes(contas, args.modelos, args.linhas, args.datas)
+            inicio = time.perf_counter()
+            funcao(db, execucoes)
+            decorrido = time.perf_counter() - inicio
+            assert db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == total
+            print(f"{nome:<16} {decorrido * 1000:>11.1f} {total / decorrido:>15.0f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark do lançamento de modelos recorrentes (TemplateScheduler).
+
+Cria modelos com recorrência diária, semanal, mensal e por período fiscal a
+partir de um ano atrás e mede:
+  * a recuperação de um ano de ocorrências, lançadas em uma unidade de trabalho;
+  * uma segunda execução na mesma data, que não deve lançar nada;
+  * uma execução interrompida no meio (exceção dentro da transação), que não
+    deve deixar lançamentos nem ocorrências registradas.
+
+Uso:
+    python benchmarks/bench_template_scheduler.py
+    python benchmarks/bench_template_scheduler.py --modelos 40 --linhas 10
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.core.template_scheduler import TemplateScheduler, RECORRENCIAS
+from src.core.templates import TemplateManager, TemplateTransaction, TransactionTemplate
+
+
+def criar_modelos(db, contas, n_modelos, n_linhas, inicio, seed=42):
+    rng = random.Random(seed)
+    scheduler = TemplateScheduler(db)
+    templates = TemplateManager(db)
+    regras = list(RECORRENCIAS)
+    for m in range(n_modelos):
+        linhas = []
+        for i in range(n_linhas):
+            debito, credito = rng.sample(contas, 2)
+            linhas.append(TemplateTransaction(f"Recorrente {m} linha {i}", debito, credito,
+                                              Decimal(rng.randrange(100, 500000)).scaleb(-2)))
+        modelo = TransactionTemplate(name=f"Recorrente {m}", transactions=linhas)
+        scheduler.definir_recorrencia(templates.create_template(modelo), regras[m % len(regras)], inicio)
+
+
+def criar_periodos(db, inicio, ate):
+    atual = date.fromisoformat(inicio)
+    while atual <= date.fromisoformat(ate):
+        fim = atual + timedelta(days=29)
+        db.execute("INSERT INTO fiscal_periods (start_date, end_date, interval_days) VALUES (?, ?, 30)",
+                   (atual.isoformat(), fim.isoformat()))
+        atual = fim + timedelta(days=1)
+
+
+def contar(db):
+    return (db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0],
+            db.execute("SELECT COUNT(*) FROM template_occurrences").fetchone()[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--modelos", type=int, default=20)
+    parser.add_argument("--linhas", type=int, default=5)
+    parser.add_argument("--dias", type=int, default=365, help="tamanho do atraso a recuperar")
+    args = parser.parse_args()
+
+    ate = date(2024, 12, 31)
+    inicio = (ate - timedelta(days=args.dias - 1)).isoformat()
+    ate = ate.isoformat()
+
+    db, caminho = criar_banco()
+    try:
+        contas = popular_contas(db, args.contas)
+        criar_modelos(db, contas, args.modelos, args.linhas, inicio)
+        criar_periodos(db, inicio, ate)
+        scheduler = TemplateScheduler(db)
+
+        # Execução interrompida: a exceção desfaz os lançamentos e o registro das ocorrências
+        class Interrompida(Exception):
+            pass
+        try:
+            with db.transaction():
+                scheduler.executar(ate)
+                raise Interrompida()
+        except Interrompida:
+            pass
+        assert contar(db) == (0, 0), "execução interrompida deixou lançamentos"
+
+        t0 = time.perf_counter()
+        pendentes = scheduler.pendentes(ate)
+        t_pendentes = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        primeira = scheduler.executar(ate)
+        t_primeira = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        segunda = scheduler.executar(ate)
+        t_segunda = time.perf_counter() - t0
+
+        transacoes, ocorrencias = contar(db)
+        assert primeira.ocorrencias == len(pendentes) == ocorrencias
+        assert primeira.transacoes == transacoes
+        assert segunda.ocorrencias == 0 and not primeira.recusados
+
+        print(f"{args.modelos} modelos x {args.linhas} linhas, {args.dias} dias de atraso")
+        print(f"{'etapa':<28} {'tempo (ms)':>11} {'ocorrências':>12} {'transações':>11}")
+        print("-" * 65)
+        print(f"{'cálculo das pendentes':<28} {t_pendentes * 1000:>11.1f} {len(pendentes):>12} {'':>11}")
+        print(f"{'recuperação (1ª execução)':<28} {t_primeira * 1000:>11.1f} {primeira.ocorrencias:>12} "
+              f"{primeira.transacoes:>11}")
+        print(f"{'repetição (2ª execução)':<28} {t_segunda * 1000:>11.1f} {segunda.ocorrencias:>12} "
+              f"{segunda.transacoes:>11}")
+    finally:
+        remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark da listagem de transações (TransactionManager.iter_transactions).
+
+Compara a listagem anterior (fetchall do razão inteiro com os nomes das contas)
+com a paginação por chave em (date, id): tempo até a primeira página, tempo
+para percorrer o razão inteiro página por página e pico de memória do heap
+Python (tracemalloc) de cada abordagem. Mede também a busca direta por ID
+usada na edição e na exclusão.
+
+Uso:
+    python benchmarks/bench_transaction_listing.py
+    python benchmarks/bench_transaction_listing.py --transacoes 1000000 --pagina 100
+"""
+import argparse
+import time
+import tracemalloc
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+from src.core.transactions import TransactionManager
+
+SQL_ANTERIOR = """
+SELECT t.id, t.date, t.description,
+       d.name as debito, c.name as credito,
+       t.amount
+FROM transactions t
+JOIN accounts d ON t.debit_account = d.id
+JOIN accounts c ON t.credit_account = c.id
+ORDER BY t.date ASC, t.id ASC
+"""
+
+
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    decorrido = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return decorrido, pico / 1024 / 1024, resultado
+
+
+def percorrer(paginas):
+    total = 0
+    for pagina in paginas:
+        total += len(pagina)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--pagina", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'transações':>11} {'abordagem':<26} {'tempo (ms)':>11} {'pico (MiB)':>11}")
+    print("-" * 62)
+    for n_transacoes in args.transacoes:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            popular_transacoes(db, contas, n_transacoes)
+            db.execute("ANALYZE")
+            manager = TransactionManager(db)
+
+            cenarios = [
+                ("fetchall (anterior)", lambda: len(db.execute(SQL_ANTERIOR).fetchall())),
+                ("primeira página", lambda: len(next(manager.iter_transactions(page_size=args.pagina)))),
+                ("todas as páginas", lambda: percorrer(manager.iter_transactions(page_size=args.pagina))),
+                ("busca direta por ID", lambda: manager.get_transaction(n_transacoes // 2) is not None),
+            ]
+            for nome, funcao in cenarios:
+                decorrido, pico, _ = medir(funcao)
+                print(f"{n_transacoes:>11} {nome:<26} {decorrido:>11.2f} {pico:>11.2f}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark da busca por descrição de transações (índice FTS5, migração 6).
+
+Gera um razão com descrições variadas e compara, para cada termo, a busca
+anterior (description LIKE '%termo%', varredura da tabela inteira) com
+TransactionManager.search_transactions (índice transactions_fts, bm25).
+Mostra também o custo de carga do razão (os gatilhos só marcam as transações
+pendentes) e o da indexação em lote das pendentes (sync_search_index).
+
+Uso:
+    python benchmarks/bench_transaction_search.py
+    python benchmarks/bench_transaction_search.py --transacoes 1000000 5000000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas
+
+from src.core.transactions import TransactionManager
+
+PALAVRAS = ["Aluguel", "Salário", "Energia", "Água", "Serviços", "Fornecedor", "Cliente", "Imposto",
+            "Depreciação", "Veículo", "Manutenção", "Internet", "Telefone", "Material", "Escritório",
+            "Consultoria", "Frete", "Seguro", "Juros", "Tarifa", "Bancária", "Combustível", "Limpeza"]
+TERMOS = ["aluguel", "salario", "manut veic", "tarifa bancaria", "consult", "nf 12345"]
+
+SQL_ANTERIOR = """
+SELECT t.id, t.date, t.description,
+       d.name as debito, c.name as credito,
+       t.amount
+FROM transactions t
+JOIN accounts d ON t.debit_account = d.id
+JOIN accounts c ON t.credit_account = c.id
+WHERE t.id = ? OR t.description LIKE ?
+ORDER BY t.date DESC, t.id DESC
+"""
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def popular(db, contas, quantidade, seed=42, lote=50000):
+    rng = random.Random(seed)
+    inicio = date(2015, 1, 1)
+    buffer = []
+    with db.transaction():
+        for i in range(quantidade):
+            debito, credito = rng.sample(contas, 2)
+            descricao = f"{' '.join(rng.sample(PALAVRAS, 2))} NF {rng.randrange(100000)}"
+            data = (inicio + timedelta(days=rng.randrange(3650))).isoformat()
+            buffer.append((data, descricao, debito, credito, Decimal(rng.randrange(100, 500000)).scaleb(-2)))
+            if len(buffer) >= lote:
+                db.executemany(SQL_INSERT, buffer)
+                buffer.clear()
+        if buffer:
+            db.executemany(SQL_INSERT, buffer)
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=200)
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    for n_transacoes in args.transacoes:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            t_carga, _ = medir(lambda: popular(db, contas, n_transacoes), 1)
+            db.execute("ANALYZE")
+            manager = TransactionManager(db)
+            t_indice, _ = medir(manager.sync_search_index, 1)
+            print(f"\n{n_transacoes} transações - carga: {t_carga / 1000:.1f} s, indexação: {t_indice / 1000:.1f} s")
+            print(f"{'termo':<18} {'LIKE (ms)':>10} {'FTS (ms)':>9} {'LIKE itens':>11} {'FTS itens':>10}")
+            print("-" * 62)
+            for termo in TERMOS:
+                t_like, anteriores = medir(lambda: db.execute(SQL_ANTERIOR, (-1, f"%{termo}%")).fetchall(), 1)
+                t_fts, encontradas = medir(lambda: manager.search_transactions(termo), args.repeticoes)
+                print(f"{termo:<18} {t_like:>10.1f} {t_fts:>9.2f} {len(anteriores):>11} {len(encontradas):>10}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark de vazão de escrita com unidades de trabalho (Database.transaction).
+
+Cada lançamento é um INSERT em transactions (os gatilhos atualizam os dois saldos).
+Compara o modo antigo (um COMMIT por comando) com lotes de tamanhos
+crescentes confirmados em um único COMMIT.
+
+Uso:
+    python benchmarks/bench_unit_of_work.py --lancamentos 2000 --lotes 1 10 100 1000
+"""
+import argparse
+import time
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, gerar_transacoes
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def lancar(db, lancamento):
+    db.execute(SQL_INSERT, lancamento)
+
+
+def por_comando(db, lancamentos, _lote):
+    for lancamento in lancamentos:
+        lancar(db, lancamento)
+
+
+def em_lotes(db, lancamentos, lote):
+    for inicio in range(0, len(lancamentos), lote):
+        with db.transaction():
+            for lancamento in lancamentos[inicio:inicio + lote]:
+                lancar(db, lancamento)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lancamentos", type=int, default=2000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--contas", type=int, default=100)
+    args = parser.parse_args()
+
+    cenarios = [("commit por comando", por_comando, 1)]
+    cenarios += [(f"lote de {lote}", em_lotes, lote) for lote in args.lotes]
+
+    print(f"{'cenário':<22} {'tempo (s)':>10} {'lançamentos/s':>15} {'commits':>8}")
+    print("-" * 58)
+    for nome, funcao, lote in cenarios:
+        db, caminho = criar_banco()
+        try:
+            contas = popular_contas(db, args.contas)
+            lancamentos = list(gerar_transacoes(contas, args.lancamentos))
+            inicio = time.perf_counter()
+            funcao(db, lancamentos, lote)
+            decorrido = time.perf_counter() - inicio
+            commits = args.lancamentos * 3 if funcao is por_comando else -(-args.lancamentos // lote)
+            print(f"{nome:<22} {decorrido:>10.3f} {args.lancamentos / decorrido:>15,.0f} {commits:>8}")
+        finally:
+            remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    main()
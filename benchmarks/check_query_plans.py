@@ -0,0 +1,100 @@
+"""
+Verifica o plano (EXPLAIN QUERY PLAN) das consultas de produção.
+
+Executa os caminhos de leitura dos serviços contra um razão sintético,
+grava todos os comandos enviados ao SQLite e falha (código de saída 1) se
+algum deles varrer por inteiro uma tabela do razão (ou template_lines, ou
+depreciation_schedule).
+
+Uso:
+    python benchmarks/check_query_plans.py
+"""
+import contextlib
+import io
+import sys
+
+from ledger_fixtures import criar_banco, remover_banco, popular_contas, popular_transacoes
+
+from src.core.accounts import AccountManager
+from src.core.balance_sheet import BalanceSheet
+from src.core.depreciation_schedule import DepreciationSchedule
+from src.core.templates import TemplateManager
+from src.core.transactions import TransactionManager
+from src.database.query_plan import LEDGER_TABLES, QueryRecorder, check_statements
+from src.services.depreciation_service import DepreciationService
+from src.services.drp_service import DRPService
+from src.services.fiscal_period_service import FiscalPeriodService
+from src.services.template_service import TemplateService
+from src.services.transaction_service import TransactionService
+
+# Além do razão, as linhas dos modelos (buscadas por modelo e por conta) e o cronograma de depreciação
+TABELAS = LEDGER_TABLES + ("template_lines", "depreciation_schedule")
+
+# Varreduras conhecidas e aceitas por enquanto: trecho do SQL -> motivo
+PENDENTES = {}
+
+
+def exercitar(db):
+    """Executa os caminhos de leitura de produção que não dependem de entrada do usuário."""
+    db.execute(
+        "INSERT INTO fiscal_periods (start_date, end_date, interval_days) VALUES (?, ?, ?)",
+        ("2020-01-01", "2020-12-31", 12),
+    )
+    periodo_id = db.execute("SELECT MAX(id) FROM fiscal_periods").fetchone()[0]
+
+    BalanceSheet(db).calcular_saldos_na_data("2020-12-31")
+    DRPService(db).calcular_lucro_periodo(periodo_id)
+    FiscalPeriodService(db).get_current_period()
+    transaction_service = TransactionService(db)
+    transaction_manager = transaction_service.transaction_manager
+    for filtros in ({}, {"start_date": "2020-01-01", "end_date": "2020-03-31"}, {"account_id": 1},
+                    {"min_amount": 100, "max_amount": 200}):
+        paginas = transaction_manager.iter_transactions(**filtros)
+        next(paginas, None)
+        next(paginas, None)
+    transaction_manager.get_transaction(1)
+    transaction_service.get_transactions_by_id_or_description("123")
+    transaction_service.get_transactions_by_id_or_description("aluguel")
+    transaction_service.get_transactions_by_id_or_description("lanç 12")
+    transaction_service.buscar_conta(1)
+    TemplateService(db).get_templates_by_name_or_id("")
+    TemplateService(db).get_templates_by_name_or_id("1")
+    TemplateManager(db).templates_using_account(1)
+    DepreciationService(db).visualizar_ativos()
+    cronograma = DepreciationSchedule(db)
+    cronograma.valores_contabeis("2020-06-30")
+    cronograma.depreciacao_do_periodo("2020-01-01", "2020-12-31")
+    cronograma.depreciacao_por_ativo("2020-01-01", "2020-12-31")
+    AccountManager(db).get_accounts_by_name_or_id("")
+
+
+def main():
+    db, caminho = criar_banco()
+    try:
+        contas = popular_contas(db, 200)
+        popular_transacoes(db, contas, 20000)
+        # Indexa a descrição das transações geradas antes de gravar os comandos (executemany em lote)
+        TransactionManager(db).sync_search_index()
+        db.execute("ANALYZE")
+
+        with QueryRecorder(db) as recorder, contextlib.redirect_stdout(io.StringIO()):
+            exercitar(db)
+
+        problemas = check_statements(db, recorder.statements, tables=TABELAS, allowed=tuple(PENDENTES))
+        print(f"{len(set(recorder.statements))} comandos verificados.")
+        for trecho, motivo in PENDENTES.items():
+            print(f"  (aceito) {motivo}: {trecho}")
+        if problemas:
+            for sql, scans in problemas:
+                print("\nVARREDURA COMPLETA:")
+                print(sql)
+                print("Plano:", "; ".join(scans))
+            return 1
+        print("Nenhuma varredura completa do razão encontrada.")
+        return 0
+    finally:
+        remover_banco(db, caminho)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
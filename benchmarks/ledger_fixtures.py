@@ -0,0 +1,99 @@
+"""
+Geração de livros-razão sintéticos para os benchmarks.
+
+Os bancos são criados em arquivos temporários, nunca em data/financas.db.
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Permite executar os scripts a partir da raiz do projeto (python benchmarks/...)
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from src.database.connection import Database
+
+# (type, specific_type, specific_subtype) usados na geração das contas
+PERFIS_CONTA = [
+    ("debito", "ativos", "circulante"),
+    ("debito", "ativos", "fixo"),
+    ("debito", "despesas", None),
+    ("debito", "compras", None),
+    ("credito", "passivos", "circulante"),
+    ("credito", "passivos", "não-circulante"),
+    ("credito", "patrimonio", None),
+    ("credito", "entradas", None),
+    ("credito", "vendas", None),
+]
+
+
+def criar_banco(diretorio=None, profile=None):
+    """Cria um banco vazio com o schema do sistema e retorna (db, caminho)."""
+    fd, caminho = tempfile.mkstemp(suffix=".db", dir=diretorio)
+    os.close(fd)
+    os.remove(caminho)
+    db = Database(caminho, profile=profile)
+    db.connect()
+    return db, caminho
+
+
+def remover_banco(db, caminho):
+    """Fecha a conexão e apaga o arquivo do banco (e arquivos auxiliares)."""
+    db.close()
+    for sufixo in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(caminho + sufixo):
+            os.remove(caminho + sufixo)
+
+
+def popular_contas(db, quantidade):
+    """Insere uma categoria e `quantidade` contas com perfis variados. Retorna os IDs."""
+    db.execute(
+        "INSERT INTO account_categories (name, normalized_name, description) VALUES (?, ?, ?)",
+        ("Benchmark", "benchmark", "Categoria gerada para benchmark"),
+    )
+    categoria_id = db.execute("SELECT id FROM account_categories WHERE normalized_name = 'benchmark'").fetchone()[0]
+    linhas = []
+    for i in range(quantidade):
+        tipo, specific_type, specific_subtype = PERFIS_CONTA[i % len(PERFIS_CONTA)]
+        nome = f"Conta {i:06d}"
+        linhas.append((nome, nome.lower(), tipo, specific_type, specific_subtype, categoria_id))
+    with db.transaction():
+        db.executemany(
+            """
+            INSERT INTO accounts (name, normalized_name, type, specific_type, specific_subtype, category_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            linhas,
+        )
+    return [r[0] for r in db.execute("SELECT id FROM accounts ORDER BY id")]
+
+
+def gerar_transacoes(contas, quantidade, inicio=date(2015, 1, 1), dias=3650, seed=42):
+    """Gera tuplas (date, description, debit_account, credit_account, amount)."""
+    rng = random.Random(seed)
+    for i in range(quantidade):
+        debito, credito = rng.sample(contas, 2)
+        data = (inicio + timedelta(days=rng.randrange(dias))).strftime("%Y-%m-%d")
+        valor = Decimal(rng.randrange(100, 500000)).scaleb(-2)
+        yield (data, f"Lançamento {i}", debito, credito, valor)
+
+
+def popular_transacoes(db, contas, quantidade, lote=50000, **kwargs):
+    """Insere `quantidade` transações aleatórias entre as contas informadas."""
+    sql = """
+    INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+    VALUES (?, ?, ?, ?, ?)
+    """
+    buffer = []
+    with db.transaction():
+        for linha in gerar_transacoes(contas, quantidade, **kwargs):
+            buffer.append(linha)
+            if len(buffer) >= lote:
+                db.executemany(sql, buffer)
+                buffer.clear()
+        if buffer:
+            db.executemany(sql, buffer)
@@ -1,2 +1,75 @@
+import os
+
 DATABASE_PATH = "data/financas.db"
-DATE_FORMAT = "%Y-%m-%d"
\ No newline at end of file
+DATE_FORMAT = "%Y-%m-%d"
+
+# Número máximo de conexões somente leitura mantidas pelo pool de conexões
+POOL_MAX_READERS = 4
+
+# Perfil de desempenho do SQLite aplicado em Database.connect.
+# Pode ser trocado sem editar o código com a variável de ambiente EASYACCOUNTS_DB_PROFILE.
+DATABASE_PROFILE = os.environ.get("EASYACCOUNTS_DB_PROFILE", "durable")
+
+# Perfis de PRAGMAs. cache_size negativo é em KiB (-65536 = 64 MiB); mmap_size em bytes; busy_timeout em ms.
+PRAGMA_PROFILES = {
+    # Padrão: WAL permite leituras durante a escrita; synchronous=FULL não perde nenhum COMMIT
+    "durable": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "memory",
+        "busy_timeout": 5000,
+    },
+    # WAL com synchronous=NORMAL: o banco nunca corrompe, mas uma queda de energia pode perder os últimos COMMITs
+    "balanced": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "memory",
+        "busy_timeout": 5000,
+    },
+    # Cargas em massa (importações, reconstruções): sem fsync e com cache grande.
+    # Use apenas em cargas que podem ser refeitas a partir da origem.
+    "bulk-load": {
+        "journal_mode": "wal",
+        "synchronous": "off",
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "temp_store": "memory",
+        "busy_timeout": 30000,
+    },
+    # Comportamento padrão do SQLite (rollback journal); para discos de rede onde WAL não funciona
+    "legacy": {
+        "journal_mode": "delete",
+        "synchronous": "full",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "default",
+        "busy_timeout": 5000,
+    },
+}
+
+# Importação de extratos: lançamentos gravados por unidade de trabalho e arquivo de regras padrão
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_RULES_PATH = "data/import_rules.json"
+
+# Cronograma de depreciação: ativos recalculados por unidade de trabalho na sincronização
+DEPRECIATION_SCHEDULE_CHUNK = 2000
+
+# Listagem de transações: lançamentos por página (paginação por chave em (date, id))
+TRANSACTION_PAGE_SIZE = 50
+
+# Busca textual nas descrições das transações: máximo de resultados (os mais relevantes por bm25)
+TRANSACTION_SEARCH_LIMIT = 200
+
+# Servidor HTTP (api.py): endereço, threads de leitura (cada uma com sua conexão somente leitura),
+# máximo de lançamentos por COMMIT ao agrupar POSTs simultâneos e tamanho máximo do corpo (bytes)
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_READ_THREADS = 4
+API_POST_BATCH = 5000
+API_MAX_BODY = 8 * 1024 * 1024
+# Segundos entre uma gravação e a recriação dos snapshots de saldo que ela apagou (uma por intervalo)
+API_SNAPSHOT_DELAY = 1.0
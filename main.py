@@ -6,10 +6,21 @@ project_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(project_dir)
 
 from src.interfaces.menu import MainMenu
+from src.database.connection import DatabaseUnavailableError, close_pool
+from src.utils.backup import shutdown_backup_scheduler
 
 def main():
     app = MainMenu()
-    app.run()
+    try:
+        app.run()
+    except DatabaseUnavailableError as e:
+        # Banco que não abre ou não migra (ex.: SQLite antigo): não há como seguir com o menu
+        print(f"\nErro: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        # Faz o backup pendente antes de fechar as conexões
+        shutdown_backup_scheduler()
+        close_pool()
 
 if __name__ == "__main__":
     main()
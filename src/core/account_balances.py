@@ -0,0 +1,83 @@
+# src/core/account_balances.py
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List
+
+# Saldo de cada conta calculado pelo razão inteiro, no lado natural da conta
+SQL_SALDOS_RAZAO = """
+SELECT a.id, a.name,
+       a.balance AS saldo_registrado,
+       CASE a.type WHEN 'debito' THEN COALESCE(l.debito - l.credito, 0)
+                   ELSE COALESCE(l.credito - l.debito, 0) END AS saldo_razao
+FROM accounts a
+LEFT JOIN (
+    SELECT account_id, SUM(debito) AS debito, SUM(credito) AS credito
+    FROM (
+        SELECT debit_account AS account_id, amount AS debito, 0 AS credito FROM transactions
+        UNION ALL
+        SELECT credit_account AS account_id, 0 AS debito, amount AS credito FROM transactions
+    )
+    GROUP BY account_id
+) l ON l.account_id = a.id
+"""
+
+
+@dataclass
+class BalanceDivergence:
+    id: int
+    name: str
+    saldo_registrado: Decimal
+    saldo_razao: Decimal
+
+    @property
+    def diferenca(self) -> Decimal:
+        return self.saldo_registrado - self.saldo_razao
+
+
+class AccountBalances:
+    """
+    Saldos correntes das contas (coluna accounts.balance).
+
+    Os gatilhos da migração 5 mantêm a coluna a cada INSERT, UPDATE e DELETE em
+    transactions, no lado natural da conta (débito - crédito para contas de
+    débito, crédito - débito para as demais). Os saldos correntes custam uma
+    leitura de accounts, sem varrer o razão; divergencias() confere a coluna
+    contra o razão e reconstruir() a recalcula.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def atuais(self):
+        """
+        Linhas (id, name, type, specific_type, specific_subtype, total_debito, total_credito)
+        no formato de BalanceSheet.classificar_contas, com o saldo registrado
+        no lado natural da conta e zero no outro.
+        """
+        sql = """
+        SELECT id, name, type, specific_type, specific_subtype,
+               CASE type WHEN 'debito' THEN balance ELSE 0 END AS "total_debito [MONEY]",
+               CASE type WHEN 'debito' THEN 0 ELSE balance END AS "total_credito [MONEY]"
+        FROM accounts
+        """
+        return self.db.execute(sql).fetchall()
+
+    def divergencias(self) -> List[BalanceDivergence]:
+        """Contas cujo saldo registrado difere do saldo calculado pelo razão."""
+        sql = f"""
+        SELECT id, name, saldo_registrado AS "saldo_registrado [MONEY]", saldo_razao AS "saldo_razao [MONEY]"
+        FROM ({SQL_SALDOS_RAZAO})
+        WHERE saldo_registrado <> saldo_razao
+        ORDER BY name
+        """
+        return [BalanceDivergence(*row) for row in self.db.execute(sql).fetchall()]
+
+    def reconstruir(self) -> int:
+        """Recalcula pelo razão os saldos divergentes. Retorna quantas contas foram corrigidas."""
+        with self.db.transaction():
+            divergentes = self.divergencias()
+            self.db.executemany(
+                "UPDATE accounts SET balance = ? WHERE id = ?",
+                [(conta.saldo_razao, conta.id) for conta in divergentes],
+            )
+        return len(divergentes)
@@ -0,0 +1,110 @@
+# src/core/account_directory.py
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class AccountEntry:
+    id: int
+    name: str
+    type: Optional[str]
+    specific_type: Optional[str]
+    specific_subtype: Optional[str]
+    category_id: Optional[int]
+
+
+class AccountDirectory:
+    """
+    Cadastro de contas em memória: carrega id -> (nome, tipo, tipo específico,
+    subtipo, categoria) de todas as contas com uma consulta e responde as
+    buscas sem voltar ao banco. O saldo não faz parte do cadastro (muda a cada
+    lançamento). AccountService chama invalidate_account_directory() ao
+    cadastrar, alterar ou excluir uma conta: os cadastros de todas as conexões
+    do processo são recarregados na próxima busca.
+
+    hits conta as buscas respondidas da memória; misses, as que precisaram
+    carregar o cadastro do banco.
+    """
+
+    def __init__(self, db):
+        # Referência fraca: o cadastro fica no registro por conexão e não deve mantê-la viva
+        self._db = weakref.ref(db)
+        self._entries = None
+        self._by_name = None
+        self._generation = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        sql = """
+        SELECT id, name, type, specific_type, specific_subtype, category_id
+        FROM accounts
+        ORDER BY name
+        """
+        generation = _generation
+        by_name = [AccountEntry(*row) for row in self._db().execute(sql).fetchall()]
+        self._entries = {entry.id: entry for entry in by_name}
+        self._by_name = by_name
+        self._generation = generation
+
+    def _ensure_loaded(self, reload=False):
+        """Carrega o cadastro se necessário e contabiliza a busca como hit ou miss."""
+        with self._lock:
+            if self._entries is None or reload or self._generation != _generation:
+                self.misses += 1
+                self._load()
+            else:
+                self.hits += 1
+            return self._entries, self._by_name
+
+    def get(self, account_id) -> Optional[AccountEntry]:
+        """
+        Conta pelo ID, ou None se não existir. Um ID desconhecido recarrega o
+        cadastro uma vez (a conta pode ter sido criada por outra conexão).
+        """
+        entries, _ = self._ensure_loaded()
+        entry = entries.get(account_id)
+        if entry is None:
+            entries, _ = self._ensure_loaded(reload=True)
+            entry = entries.get(account_id)
+        return entry
+
+    def all(self) -> List[AccountEntry]:
+        """Todas as contas, em ordem de nome."""
+        _, by_name = self._ensure_loaded()
+        return list(by_name)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+            self._by_name = None
+
+    def stats(self) -> dict:
+        loaded = self._entries is not None
+        return {"hits": self.hits, "misses": self.misses, "contas": len(self._entries) if loaded else 0}
+
+
+# Um cadastro por conexão (Database); some junto com a conexão
+_directories = weakref.WeakKeyDictionary()
+_directories_lock = threading.Lock()
+# Versão do cadastro; invalidate_account_directory() a incrementa e os cadastros carregados antes ficam obsoletos
+_generation = 0
+
+
+def get_account_directory(db) -> AccountDirectory:
+    """Retorna o cadastro de contas compartilhado pelos serviços que usam a conexão `db`."""
+    with _directories_lock:
+        directory = _directories.get(db)
+        if directory is None:
+            directory = _directories[db] = AccountDirectory(db)
+        return directory
+
+
+def invalidate_account_directory():
+    """Torna obsoletos os cadastros de contas de todas as conexões (após alterar a tabela accounts)."""
+    global _generation
+    with _directories_lock:
+        _generation += 1
@@ -1,4 +1,3 @@
-from decimal import Decimal
 from src.database.models import Account, AccountType
 from src.database.models import AccountCategory
 from typing import Optional, List
@@ -13,10 +12,6 @@ class AccountManager:
         cursor = self.db.execute(sql, (name, type_id, specific_subtype))
         return Account(cursor.lastrowid, name, type_id, specific_subtype)
 
-    def update_balance(self, account_id: int, amount: Decimal):
-        sql = "UPDATE accounts SET balance = balance + ? WHERE id = ?"
-        self.db.execute(sql, (amount, account_id))
-
     def get_account(self, account_id: int) -> Account:
         sql = """
         SELECT id, name, type_id, balance 
@@ -1,22 +1,67 @@
 # src/core/balance_sheet.py
 from datetime import datetime
+from src.core.account_balances import AccountBalances
+from src.core.balance_snapshots import BalanceSnapshots
 
 class BalanceSheet:
-    def __init__(self, db):
+    def __init__(self, db, use_snapshots=True):
         self.db = db
+        self.use_snapshots = use_snapshots
+        self.snapshots = BalanceSnapshots(db)
+        self.saldos = AccountBalances(db)
 
     def calcular_saldos_na_data(self, data):
         """
         Calcula os saldos das contas de ativo, passivo e patrimônio até a data especificada.
+        Parte do snapshot de saldo mais recente anterior à data (ver BalanceSnapshots)
+        e soma apenas as transações posteriores a ele, em uma única passada agrupada
+        (snapshot e pernas de débito e crédito unidos com UNION ALL). Sem snapshot,
+        soma o razão inteiro até a data. Em uma data sem lançamentos posteriores,
+        usa os saldos correntes de accounts.balance (ver AccountBalances).
+        Com use_snapshots=False, soma sempre o razão inteiro.
         Retorna listas de contas com seus saldos.
         """
-        # Consulta todas as contas
-        sql_contas = """
-        SELECT id, name, type, specific_type, specific_subtype
-        FROM accounts
+        base = ''
+        if self.use_snapshots:
+            ultima = self.db.execute("SELECT MAX(date) FROM transactions").fetchone()[0]
+            if ultima is None or data >= ultima:
+                return self.classificar_contas(self.saldos.atuais())
+            if not self.db.read_only:
+                # Cria os snapshots de períodos recém-encerrados ou invalidados por lançamentos retroativos
+                self.snapshots.refresh()
+            base = self.snapshots.anterior(data) or ''
+
+        sql = """
+        SELECT a.id, a.name, a.type, a.specific_type, a.specific_subtype,
+               COALESCE(l.total_debito, 0) AS "total_debito [MONEY]",
+               COALESCE(l.total_credito, 0) AS "total_credito [MONEY]"
+        FROM accounts a
+        LEFT JOIN (
+            SELECT account_id, SUM(debito) AS total_debito, SUM(credito) AS total_credito
+            FROM (
+                SELECT account_id, total_debit AS debito, total_credit AS credito
+                FROM balance_snapshots
+                WHERE snapshot_date = ?
+                UNION ALL
+                SELECT debit_account AS account_id, amount AS debito, 0 AS credito
+                FROM transactions
+                WHERE date > ? AND date <= ?
+                UNION ALL
+                SELECT credit_account AS account_id, 0 AS debito, amount AS credito
+                FROM transactions
+                WHERE date > ? AND date <= ?
+            )
+            GROUP BY account_id
+        ) l ON l.account_id = a.id
         """
-        contas = self.db.execute(sql_contas).fetchall()
+        contas = self.db.execute(sql, (base, base, data, base, data)).fetchall()
+        return self.classificar_contas(contas)
 
+    def classificar_contas(self, contas):
+        """
+        Recebe linhas (id, name, type, specific_type, specific_subtype, total_debito, total_credito)
+        e devolve as cinco listas do balanço com o saldo de cada conta.
+        """
         # Inicializa as listas de contas
         ativos_circulantes = []
         ativos_fixos = []
@@ -25,17 +70,7 @@ class BalanceSheet:
         patrimonio = []
 
         for conta in contas:
-            conta_id, nome, tipo, specific_type, specific_subtype = conta
-
-            # Consulta transações até a data especificada
-            sql_transacoes = """
-            SELECT COALESCE(SUM(CASE WHEN debit_account = ? THEN amount ELSE 0 END), 0) as total_debito,
-                COALESCE(SUM(CASE WHEN credit_account = ? THEN amount ELSE 0 END), 0) as total_credito
-            FROM transactions
-            WHERE date <= ?
-            """
-            transacoes = self.db.execute(sql_transacoes, (conta_id, conta_id, data)).fetchone()
-            total_debito, total_credito = transacoes
+            conta_id, nome, tipo, specific_type, specific_subtype, total_debito, total_credito = conta
 
             # Calcula o saldo da conta
             if tipo == 'debito':  # Ativo
@@ -67,7 +102,6 @@ class BalanceSheet:
                 elif specific_type == 'patrimonio':
                     patrimonio.append(conta_com_saldo)
 
-
         return ativos_circulantes, ativos_fixos, passivos_circulantes, passivos_nao_circulantes, patrimonio
 
     def calcular_totais(self, ativos_circulantes, ativos_fixos, passivos_circulantes, passivos_nao_circulantes, patrimonio, lucro_drp):
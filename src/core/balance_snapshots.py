@@ -0,0 +1,77 @@
+# src/core/balance_snapshots.py
+from datetime import date, datetime
+
+
+class BalanceSnapshots:
+    """
+    Snapshots de saldo (tabelas balance_snapshot_heads e balance_snapshots).
+
+    Um snapshot guarda, para cada conta, os totais acumulados de débito e de
+    crédito de todas as transações com data <= data de corte. Os snapshots são
+    feitos no fim de cada período fiscal encerrado; um saldo em uma data
+    qualquer é o snapshot anterior mais apenas as transações posteriores a ele.
+    Os gatilhos da migração 4 apagam os snapshots afetados por lançamentos
+    retroativos; refresh() os recria.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def anterior(self, data):
+        """Data de corte do snapshot mais recente com data <= `data`, ou None."""
+        sql = "SELECT MAX(snapshot_date) FROM balance_snapshot_heads WHERE snapshot_date <= ?"
+        return self.db.execute(sql, (data,)).fetchone()[0]
+
+    def pendentes(self, hoje=None):
+        """Datas de fim dos períodos fiscais encerrados (antes de `hoje`) que ainda não têm snapshot."""
+        hoje = hoje or date.today().strftime('%Y-%m-%d')
+        sql = """
+        SELECT DISTINCT p.end_date
+        FROM fiscal_periods p
+        LEFT JOIN balance_snapshot_heads h ON h.snapshot_date = p.end_date
+        WHERE p.end_date < ? AND h.snapshot_date IS NULL
+        ORDER BY p.end_date
+        """
+        return [row[0] for row in self.db.execute(sql, (hoje,)).fetchall()]
+
+    def refresh(self, hoje=None):
+        """
+        Cria os snapshots que faltam para os períodos encerrados, em ordem de data,
+        cada um a partir do anterior. Retorna quantos snapshots foram criados.
+        """
+        datas = self.pendentes(hoje)
+        if not datas:
+            return 0
+        sql = """
+        INSERT INTO balance_snapshots (snapshot_date, account_id, total_debit, total_credit)
+        SELECT ?, account_id, SUM(debito), SUM(credito)
+        FROM (
+            SELECT account_id, total_debit AS debito, total_credit AS credito
+            FROM balance_snapshots
+            WHERE snapshot_date = ?
+            UNION ALL
+            SELECT debit_account, amount, 0
+            FROM transactions
+            WHERE date > ? AND date <= ?
+            UNION ALL
+            SELECT credit_account, 0, amount
+            FROM transactions
+            WHERE date > ? AND date <= ?
+        )
+        GROUP BY account_id
+        """
+        with self.db.transaction():
+            for data in datas:
+                base = self.anterior(data) or ''
+                self.db.execute(sql, (data, base, base, data, base, data))
+                self.db.execute(
+                    "INSERT INTO balance_snapshot_heads (snapshot_date, created_at) VALUES (?, ?)",
+                    (data, datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                )
+        return len(datas)
+
+    def invalidar(self, data=''):
+        """Apaga os snapshots com data de corte >= `data` (todos, por padrão)."""
+        with self.db.transaction():
+            self.db.execute("DELETE FROM balance_snapshot_heads WHERE snapshot_date >= ?", (data,))
+            self.db.execute("DELETE FROM balance_snapshots WHERE snapshot_date >= ?", (data,))
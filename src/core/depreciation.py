@@ -0,0 +1,333 @@
+# src/core/depreciation.py
+"""
+Cálculo da depreciação dos ativos.
+
+valor_contabil() calcula o valor de um ativo em uma data. DepreciationEngine
+faz o mesmo cálculo para todos os ativos de uma vez: carrega os ativos em
+colunas (arrays NumPy) e calcula o valor no início e no fim do período e a
+depreciação do período de cada ativo com operações vetorizadas. Os
+resultados são iguais, centavo a centavo, aos de valor_contabil().
+"""
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List
+
+import numpy as np
+
+from src.utils.money import to_decimal, from_cents
+
+# Métodos de depreciação (depreciation_methods.name) calculados; os demais mantêm o valor de aquisição
+METODOS = ("Linear", "Declining Balance", "Sum of Years Digits")
+DIAS_POR_ANO = 365.25
+
+
+def valor_contabil(acquisition_value, salvage_value, useful_life_years, method_name, start_date,
+                   reference_date) -> Decimal:
+    """
+    Valor contábil do ativo na data de referência.
+    A curva de depreciação usa anos fracionários; o resultado é arredondado
+    para centavos e devolvido como Decimal.
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    if start_date > reference_date:
+        return to_decimal(acquisition_value)
+
+    anos_decorridos = (reference_date - start_date).days / DIAS_POR_ANO
+    if anos_decorridos >= useful_life_years:
+        return to_decimal(salvage_value)
+
+    acquisition_value = float(acquisition_value)
+    salvage_value = float(salvage_value)
+    valor_depreciavel = acquisition_value - salvage_value
+
+    if method_name == "Linear":
+        depreciacao_acumulada = valor_depreciavel * (anos_decorridos / useful_life_years)
+    elif method_name == "Declining Balance":
+        # Com vida útil de 1 ano a taxa é 200%: o valor cai direto para o residual
+        taxa = 2 / useful_life_years
+        valor_atual = acquisition_value * (max(1 - taxa, 0.0) ** anos_decorridos)
+        return to_decimal(max(valor_atual, salvage_value))
+    elif method_name == "Sum of Years Digits":
+        soma_anos = (useful_life_years * (useful_life_years + 1)) / 2
+        anos_restantes = useful_life_years - anos_decorridos
+        depreciacao_acumulada = valor_depreciavel * (1 - (anos_restantes * (anos_restantes + 1)) / soma_anos)
+    else:
+        return to_decimal(acquisition_value)
+
+    valor_atual = acquisition_value - depreciacao_acumulada
+    return to_decimal(max(valor_atual, salvage_value))
+
+
+@dataclass
+class AssetColumns:
+    """Ativos em colunas: uma posição por ativo em cada array."""
+    ids: np.ndarray            # int64
+    names: List[str]
+    methods: List[str]
+    metodo: np.ndarray         # índice em METODOS, -1 para métodos não calculados
+    aquisicao: np.ndarray      # centavos (int64)
+    residual: np.ndarray       # centavos (int64)
+    vida: np.ndarray           # anos (float64)
+    inicio: np.ndarray         # datetime64[D]
+    conta_despesa: np.ndarray      # expense_account_id (int64, 0 se não definida)
+    conta_acumulada: np.ndarray    # accumulated_account_id (int64, 0 se não definida)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def selecionar(self, indices) -> "AssetColumns":
+        """Apenas os ativos nas posições `indices` (array de posições)."""
+        posicoes = indices.tolist()
+        return AssetColumns(
+            self.ids[indices], [self.names[i] for i in posicoes], [self.methods[i] for i in posicoes],
+            self.metodo[indices], self.aquisicao[indices], self.residual[indices], self.vida[indices],
+            self.inicio[indices], self.conta_despesa[indices], self.conta_acumulada[indices],
+        )
+
+
+@dataclass
+class AssetDepreciation:
+    id: int
+    name: str
+    method: str
+    valor_inicio: Decimal
+    valor_fim: Decimal
+    depreciacao: Decimal
+
+
+@dataclass
+class DepreciationTable:
+    """Depreciação de cada ativo no período [inicio, fim]; os valores em centavos (int64)."""
+    inicio: str
+    fim: str
+    ativos: AssetColumns
+    valor_inicio: np.ndarray
+    valor_fim: np.ndarray
+    depreciacao: np.ndarray
+
+    def __len__(self):
+        return len(self.ativos)
+
+    def __iter__(self) -> Iterator[AssetDepreciation]:
+        ativos = self.ativos
+        for i, (inicio, fim, depreciacao) in enumerate(zip(self.valor_inicio.tolist(), self.valor_fim.tolist(),
+                                                           self.depreciacao.tolist())):
+            yield AssetDepreciation(int(ativos.ids[i]), ativos.names[i], ativos.methods[i],
+                                    from_cents(inicio), from_cents(fim), from_cents(depreciacao))
+
+    def total(self) -> Decimal:
+        return from_cents(int(self.depreciacao.sum()))
+
+    def linha(self, i) -> AssetDepreciation:
+        ativos = self.ativos
+        return AssetDepreciation(int(ativos.ids[i]), ativos.names[i], ativos.methods[i],
+                                 from_cents(int(self.valor_inicio[i])), from_cents(int(self.valor_fim[i])),
+                                 from_cents(int(self.depreciacao[i])))
+
+
+class DepreciationEngine:
+    """
+    Depreciação de todos os ativos ativos de uma vez (ver o docstring do módulo).
+
+    O cálculo é feito em float64, com as mesmas operações de valor_contabil().
+    O arredondamento para centavos é vetorizado; os poucos valores que caem a
+    um fio de meio centavo (onde o arredondamento do float e o do Decimal
+    podem divergir) são recalculados com valor_contabil().
+    """
+
+    SQL_ATIVOS = """
+    SELECT a.id, a.name, dm.name,
+           a.acquisition_value + 0, COALESCE(a.salvage_value, 0) + 0,
+           COALESCE(a.useful_life_years, 0), a.start_depreciation_date,
+           COALESCE(a.expense_account_id, 0), COALESCE(a.accumulated_account_id, 0)
+    FROM assets a
+    JOIN depreciation_methods dm ON a.depreciation_method_id = dm.id
+    WHERE a.is_active = 1 {filtro}
+    ORDER BY a.id
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def load(self, asset_ids=None) -> AssetColumns:
+        """Carrega os ativos ativos (ou apenas os de `asset_ids`) em colunas."""
+        if asset_ids is None:
+            rows = self.db.execute(self.SQL_ATIVOS.format(filtro="")).fetchall()
+        else:
+            filtro = "AND a.id IN (SELECT value FROM json_each(?))"
+            rows = self.db.execute(self.SQL_ATIVOS.format(filtro=filtro), (json.dumps(list(asset_ids)),)).fetchall()
+        ids, names, methods, aquisicao, residual, vida, inicio, despesa, acumulada = zip(*rows) if rows else ((),) * 9
+        return AssetColumns(
+            ids=np.array(ids, dtype=np.int64),
+            names=list(names),
+            methods=list(methods),
+            metodo=np.array([METODOS.index(m) if m in METODOS else -1 for m in methods], dtype=np.int8),
+            aquisicao=np.array(aquisicao, dtype=np.int64),
+            residual=np.array(residual, dtype=np.int64),
+            vida=np.array(vida, dtype=np.float64),
+            inicio=np.array(inicio, dtype="datetime64[D]"),
+            conta_despesa=np.array(despesa, dtype=np.int64),
+            conta_acumulada=np.array(acumulada, dtype=np.int64),
+        )
+
+    def valores_na_data(self, ativos: AssetColumns, data) -> np.ndarray:
+        """Valor contábil de cada ativo na data (YYYY-MM-DD ou date), em centavos."""
+        referencia = np.datetime64(data, "D")
+        anos = (referencia - ativos.inicio).astype(np.int64) / DIAS_POR_ANO
+        aquisicao = ativos.aquisicao / 100
+        residual = ativos.residual / 100
+        vida = ativos.vida
+        depreciavel = aquisicao - residual
+
+        # Os ramos não usados por um ativo (ex.: vida útil 0) podem dar inf/nan; são descartados abaixo
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            linear = aquisicao - depreciavel * (anos / vida)
+            saldo_decrescente = aquisicao * (np.maximum(1 - 2 / vida, 0.0) ** anos)
+            soma_anos = (vida * (vida + 1)) / 2
+            restantes = vida - anos
+            soma_digitos = aquisicao - depreciavel * (1 - (restantes * (restantes + 1)) / soma_anos)
+            valor = np.select([ativos.metodo == 0, ativos.metodo == 1, ativos.metodo == 2],
+                              [linear, saldo_decrescente, soma_digitos], default=aquisicao)
+            valor = np.maximum(valor, residual)
+
+            centavos_float = valor * 100
+            centavos = np.floor(centavos_float + 0.5).astype(np.int64)
+            # Perto de meio centavo o arredondamento do float pode divergir do Decimal (ROUND_HALF_UP)
+            fracao = centavos_float - np.floor(centavos_float)
+            duvidosos = np.abs(fracao - 0.5) < 1e-6 + np.abs(centavos_float) * 1e-12
+
+        # Mesma ordem de valor_contabil(): antes do início, vida útil esgotada, método não calculado
+        antes = anos < 0
+        esgotado = ~antes & (anos >= vida)
+        sem_metodo = ~antes & ~esgotado & (ativos.metodo < 0)
+        centavos = np.select([antes, esgotado, sem_metodo], [ativos.aquisicao, ativos.residual, ativos.aquisicao],
+                             default=centavos)
+
+        referencia = referencia.astype(date)
+        for i in np.flatnonzero(duvidosos & ~(antes | esgotado | sem_metodo)).tolist():
+            centavos[i] = int(valor_contabil(from_cents(int(ativos.aquisicao[i])), from_cents(int(ativos.residual[i])),
+                                             int(ativos.vida[i]), ativos.methods[i], ativos.inicio[i].astype(date),
+                                             referencia) * 100)
+        return centavos
+
+    def calcular_periodo(self, inicio, fim, ativos: AssetColumns = None) -> DepreciationTable:
+        """Valor no início e no fim do período e depreciação do período de cada ativo."""
+        ativos = ativos if ativos is not None else self.load()
+        valor_inicio = self.valores_na_data(ativos, inicio)
+        valor_fim = self.valores_na_data(ativos, fim)
+        return DepreciationTable(str(inicio), str(fim), ativos, valor_inicio, valor_fim, valor_inicio - valor_fim)
+
+
+@dataclass
+class DepreciationRunResult:
+    """Resumo do lançamento da depreciação de um período fiscal."""
+    periodo_id: int
+    inicio: str
+    fim: str
+    lancados: List[AssetDepreciation] = field(default_factory=list)
+    # Ativos com depreciação no período, mas sem contas padrão válidas: não lançados
+    sem_contas: List[AssetDepreciation] = field(default_factory=list)
+    ja_lancados: int = 0
+    sem_depreciacao: int = 0
+
+    def total(self) -> Decimal:
+        return sum((linha.depreciacao for linha in self.lancados), Decimal("0.00"))
+
+
+class DepreciationPosting:
+    """
+    Lançamento da depreciação de todos os ativos ativos no fechamento de um
+    período fiscal.
+
+    Calcula a depreciação do período de cada ativo com o DepreciationEngine
+    e lança uma transação por ativo (débito na conta de despesa, crédito na
+    de depreciação acumulada, ambas definidas no ativo) com um único
+    executemany, na data final do período. Em depreciation_postings fica
+    registrado, na mesma transação, cada par (ativo, período) lançado: uma
+    nova execução para o mesmo período lança apenas os ativos que faltaram
+    (ex.: os que estavam sem contas definidas).
+    """
+
+    SQL_INSERT = """
+    INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+    VALUES (?, ?, ?, ?, ?)
+    """
+
+    SQL_REGISTRO = """
+    INSERT INTO depreciation_postings (asset_id, fiscal_period_id, amount, posted_at)
+    VALUES (?, ?, ?, ?)
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.engine = DepreciationEngine(db)
+
+    def definir_contas(self, asset_id, expense_account_id, accumulated_account_id):
+        """Define as contas padrão de depreciação do ativo (despesa e depreciação acumulada)."""
+        if expense_account_id == accumulated_account_id:
+            raise ValueError("a conta de despesa e a de depreciação acumulada devem ser diferentes")
+        sql = "UPDATE assets SET expense_account_id = ?, accumulated_account_id = ? WHERE id = ?"
+        self.db.execute(sql, (expense_account_id, accumulated_account_id, asset_id))
+
+    def _periodo(self, periodo_id):
+        periodo = self.db.execute("SELECT id, start_date, end_date FROM fiscal_periods WHERE id = ?",
+                                  (periodo_id,)).fetchone()
+        if not periodo:
+            raise ValueError(f"período fiscal {periodo_id} não encontrado")
+        return periodo
+
+    def _contas_existentes(self, ativos: AssetColumns) -> np.ndarray:
+        contas = np.union1d(ativos.conta_despesa, ativos.conta_acumulada)
+        sql = "SELECT id FROM accounts WHERE id IN (SELECT value FROM json_each(?))"
+        existentes = [row[0] for row in self.db.execute(sql, (json.dumps(contas.tolist()),)).fetchall()]
+        return np.array(existentes, dtype=np.int64)
+
+    def preparar(self, periodo_id) -> DepreciationRunResult:
+        """Calcula o que seria lançado para o período, sem gravar nada."""
+        return self._preparar(periodo_id)[0]
+
+    def _preparar(self, periodo_id):
+        """Retorna o resumo do período e as contas (despesa, acumulada) de cada ativo."""
+        periodo_id, inicio, fim = self._periodo(periodo_id)
+        resultado = DepreciationRunResult(periodo_id, inicio, fim)
+        lancados = {row[0] for row in self.db.execute(
+            "SELECT asset_id FROM depreciation_postings WHERE fiscal_period_id = ?", (periodo_id,)).fetchall()}
+
+        tabela = self.engine.calcular_periodo(inicio, fim)
+        ativos = tabela.ativos
+        pendente = ~np.isin(ativos.ids, np.fromiter(lancados, dtype=np.int64, count=len(lancados)))
+        com_valor = tabela.depreciacao > 0
+        existentes = self._contas_existentes(ativos)
+        com_contas = (np.isin(ativos.conta_despesa, existentes) & np.isin(ativos.conta_acumulada, existentes)
+                      & (ativos.conta_despesa != ativos.conta_acumulada))
+
+        resultado.ja_lancados = int((~pendente).sum())
+        resultado.sem_depreciacao = int((pendente & ~com_valor).sum())
+        resultado.lancados = [tabela.linha(i) for i in np.flatnonzero(pendente & com_valor & com_contas).tolist()]
+        resultado.sem_contas = [tabela.linha(i) for i in np.flatnonzero(pendente & com_valor & ~com_contas).tolist()]
+        contas = dict(zip(ativos.ids.tolist(), zip(ativos.conta_despesa.tolist(), ativos.conta_acumulada.tolist())))
+        return resultado, contas
+
+    def executar(self, periodo_id) -> DepreciationRunResult:
+        """
+        Lança a depreciação do período de todos os ativos ainda não lançados,
+        em uma única unidade de trabalho. Retorna o resumo.
+        """
+        with self.db.transaction():
+            # Calculado já com o lock de escrita: outra execução simultânea não lança os mesmos ativos
+            resultado, contas = self._preparar(periodo_id)
+            if not resultado.lancados:
+                return resultado
+            agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.db.executemany(self.SQL_INSERT, [
+                (resultado.fim, f"Depreciação acumulada no período - {linha.name}",
+                 *contas[linha.id], linha.depreciacao)
+                for linha in resultado.lancados
+            ])
+            self.db.executemany(self.SQL_REGISTRO, [
+                (linha.id, resultado.periodo_id, linha.depreciacao, agora) for linha in resultado.lancados
+            ])
+        return resultado
@@ -0,0 +1,154 @@
+# src/core/depreciation_schedule.py
+import calendar
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import repeat
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from config.settings import DEPRECIATION_SCHEDULE_CHUNK
+from src.core.depreciation import AssetColumns, DepreciationEngine, DIAS_POR_ANO
+
+
+def fechamento_mensal(data) -> str:
+    """Último fim de mês <= `data` (a própria data, se ela for um fim de mês), como YYYY-MM-DD."""
+    if isinstance(data, str):
+        data = datetime.strptime(data, "%Y-%m-%d").date()
+    if data.day == calendar.monthrange(data.year, data.month)[1]:
+        return data.isoformat()
+    return (date(data.year, data.month, 1) - timedelta(days=1)).isoformat()
+
+
+class DepreciationSchedule:
+    """
+    Cronograma mensal de depreciação (tabela depreciation_schedule).
+
+    Para cada ativo ativo, uma linha por mês, do mês de início da depreciação
+    ao mês em que a vida útil termina: valor no início do mês, depreciação do
+    mês e valor no fim do mês, calculados pelo DepreciationEngine (os mesmos
+    valores de valor_contabil() em cada fim de mês). Com o cronograma, o valor
+    contábil de todos os ativos em um fechamento e a depreciação de um período
+    são leituras indexadas, sem recalcular a curva de cada ativo.
+
+    Os valores do cronograma são os dos fins de mês: o valor "em uma data" é
+    o do último fechamento mensal até ela, e a depreciação de um período soma
+    os meses que terminam dentro dele.
+
+    Os gatilhos da migração 10 marcam como pendentes os ativos cadastrados,
+    alterados ou excluídos; sincronizar() recalcula o cronograma deles em
+    lote e é chamado antes de cada leitura na conexão de escrita.
+    """
+
+    SQL_INSERT = """
+    INSERT INTO depreciation_schedule (asset_id, month_end, opening_value, charge, closing_value)
+    VALUES (?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.engine = DepreciationEngine(db)
+
+    def linhas(self, ativos: AssetColumns) -> Iterator[Tuple]:
+        """
+        Gera as linhas do cronograma dos ativos: (asset_id, month_end, abertura,
+        depreciação, fechamento), com os valores em centavos. Calcula um mês de
+        cada vez para todos os ativos com depreciação naquele mês e entrega as
+        linhas desse mês antes de calcular o próximo, para que o executemany as
+        grave sem que o cronograma inteiro fique em memória.
+        """
+        if not len(ativos):
+            return
+        primeiro = ativos.inicio.astype("datetime64[M]")
+        # Mês em que anos decorridos >= vida útil (valor residual); um dia de folga para o arredondamento
+        dias_de_vida = np.ceil(ativos.vida * DIAS_POR_ANO).astype(np.int64) + 1
+        ultimo = (ativos.inicio + dias_de_vida.astype("timedelta64[D]")).astype("datetime64[M]")
+
+        anterior = ativos.aquisicao.copy()
+        for mes in np.arange(primeiro.min(), ultimo.max() + 1):
+            indices = np.flatnonzero((primeiro <= mes) & (mes <= ultimo))
+            if not indices.size:
+                continue
+            fim_do_mes = (mes + 1).astype("datetime64[D]") - 1
+            fechamento = self.engine.valores_na_data(ativos.selecionar(indices), fim_do_mes)
+            abertura = anterior[indices]
+            anterior[indices] = fechamento
+            yield from zip(ativos.ids[indices].tolist(), repeat(str(fim_do_mes)), abertura.tolist(),
+                           (abertura - fechamento).tolist(), fechamento.tolist())
+
+    def sincronizar(self, bloco: int = DEPRECIATION_SCHEDULE_CHUNK) -> int:
+        """
+        Recalcula o cronograma dos ativos pendentes (marcados pelos gatilhos),
+        `bloco` ativos por unidade de trabalho: o cronograma de cada ativo é
+        trocado de uma vez, e o lock de escrita é liberado entre os blocos (após
+        a migração 10, todos os ativos existentes estão pendentes).
+        Retorna o número de ativos recalculados.
+        """
+        if not self.db.execute("SELECT EXISTS (SELECT 1 FROM depreciation_schedule_pending)").fetchone()[0]:
+            return 0
+        ids = [row[0] for row in self.db.execute(
+            "SELECT asset_id FROM depreciation_schedule_pending ORDER BY asset_id").fetchall()]
+        for inicio in range(0, len(ids), bloco):
+            parametros = [(i,) for i in ids[inicio:inicio + bloco]]
+            with self.db.transaction():
+                self.db.executemany("DELETE FROM depreciation_schedule WHERE asset_id = ?", parametros)
+                # Ativos inativos ou excluídos ficam sem cronograma
+                self.db.executemany(self.SQL_INSERT, self.linhas(self.engine.load([i for i, in parametros])))
+                self.db.executemany("DELETE FROM depreciation_schedule_pending WHERE asset_id = ?", parametros)
+        return len(ids)
+
+    def regenerar(self) -> int:
+        """Recalcula o cronograma de todos os ativos. Retorna o número de ativos recalculados."""
+        with self.db.transaction():
+            self.db.execute("DELETE FROM depreciation_schedule")
+            self.db.execute("DELETE FROM depreciation_schedule_pending")
+            ativos = self.engine.load()
+            self.db.executemany(self.SQL_INSERT, self.linhas(ativos))
+        return len(ativos)
+
+    def _atualizar(self):
+        # Conexões somente leitura leem o cronograma como sincronizado pela última vez
+        if not self.db.read_only:
+            self.sincronizar()
+
+    def valores_contabeis(self, data) -> List[Tuple[int, str, Decimal]]:
+        """
+        (id, nome, valor contábil) de cada ativo ativo no último fechamento mensal
+        até `data`: o valor de aquisição antes do início da depreciação e o residual
+        depois do fim do cronograma.
+        """
+        self._atualizar()
+        fechamento = fechamento_mensal(data)
+        sql = """
+        SELECT a.id, a.name,
+               COALESCE(s.closing_value,
+                        CASE WHEN a.start_depreciation_date > ? THEN a.acquisition_value
+                             ELSE COALESCE(a.salvage_value, 0) END) AS "valor [MONEY]"
+        FROM assets a
+        LEFT JOIN depreciation_schedule s ON s.asset_id = a.id AND s.month_end = ?
+        WHERE a.is_active = 1
+        ORDER BY a.id
+        """
+        return self.db.execute(sql, (fechamento, fechamento)).fetchall()
+
+    def depreciacao_do_periodo(self, inicio, fim) -> Decimal:
+        """Depreciação total dos meses que terminam entre `inicio` e `fim` (inclusive)."""
+        self._atualizar()
+        sql = """
+        SELECT COALESCE(SUM(charge), 0) AS "total [MONEY]"
+        FROM depreciation_schedule
+        WHERE month_end BETWEEN ? AND ?
+        """
+        return self.db.execute(sql, (str(inicio), str(fim))).fetchone()[0]
+
+    def depreciacao_por_ativo(self, inicio, fim) -> List[Tuple[int, Decimal]]:
+        """(asset_id, depreciação) dos meses que terminam entre `inicio` e `fim`, por ativo."""
+        self._atualizar()
+        sql = """
+        SELECT asset_id, SUM(charge) AS "total [MONEY]"
+        FROM depreciation_schedule
+        WHERE month_end BETWEEN ? AND ?
+        GROUP BY asset_id
+        ORDER BY asset_id
+        """
+        return self.db.execute(sql, (str(inicio), str(fim))).fetchall()
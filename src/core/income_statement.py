@@ -0,0 +1,92 @@
+# src/core/income_statement.py
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List, Optional
+
+# specific_type das contas que entram na DRP
+TIPOS_RECEITA = ('entradas', 'vendas')
+TIPOS_DESPESA = ('despesas', 'compras')
+
+
+@dataclass
+class IncomeStatementLine:
+    id: int
+    name: str
+    specific_type: str
+    total_debito: Decimal
+    total_credito: Decimal
+
+    @property
+    def net(self) -> Decimal:
+        """Saldo da conta no período pelo seu lado natural: crédito para receitas, débito para despesas."""
+        if self.specific_type in TIPOS_RECEITA:
+            return self.total_credito - self.total_debito
+        return self.total_debito - self.total_credito
+
+
+@dataclass
+class IncomeStatementResult:
+    start_date: str
+    end_date: str
+    receitas: List[IncomeStatementLine] = field(default_factory=list)
+    despesas: List[IncomeStatementLine] = field(default_factory=list)
+
+    @property
+    def total_receitas(self) -> Decimal:
+        return sum((conta.net for conta in self.receitas), Decimal("0.00"))
+
+    @property
+    def total_despesas(self) -> Decimal:
+        return sum((conta.net for conta in self.despesas), Decimal("0.00"))
+
+    @property
+    def resultado_liquido(self) -> Decimal:
+        return self.total_receitas - self.total_despesas
+
+    @property
+    def margem_liquida(self) -> Optional[Decimal]:
+        """Resultado líquido sobre as receitas, em %; None se não houver receitas."""
+        if self.total_receitas > 0:
+            return self.resultado_liquido / self.total_receitas * 100
+        return None
+
+
+class IncomeStatement:
+    def __init__(self, db):
+        self.db = db
+
+    def calcular(self, start_date, end_date) -> IncomeStatementResult:
+        """
+        Calcula a DRP do período (datas YYYY-MM-DD, inclusivas).
+        Uma única varredura do intervalo de datas no índice idx_transactions_date:
+        cada transação é desdobrada em suas pernas de débito e crédito (CROSS JOIN
+        com duas linhas constantes) e agrupada por conta; só então as contas são
+        filtradas pelos tipos de receita e despesa. Contas sem movimento no
+        período não aparecem.
+        """
+        sql = f"""
+        SELECT a.id, a.name, a.specific_type,
+               l.total_debito AS "total_debito [MONEY]",
+               l.total_credito AS "total_credito [MONEY]"
+        FROM (
+            SELECT CASE p.lado WHEN 'D' THEN t.debit_account ELSE t.credit_account END AS account_id,
+                   SUM(CASE p.lado WHEN 'D' THEN t.amount ELSE 0 END) AS total_debito,
+                   SUM(CASE p.lado WHEN 'C' THEN t.amount ELSE 0 END) AS total_credito
+            FROM transactions t
+            CROSS JOIN (SELECT 'D' AS lado UNION ALL SELECT 'C') p
+            WHERE t.date BETWEEN ? AND ?
+            GROUP BY account_id
+        ) l
+        JOIN accounts a ON a.id = l.account_id
+        WHERE a.specific_type IN ({", ".join("?" * len(TIPOS_RECEITA + TIPOS_DESPESA))})
+        ORDER BY a.name
+        """
+        params = (start_date, end_date) + TIPOS_RECEITA + TIPOS_DESPESA
+        resultado = IncomeStatementResult(start_date, end_date)
+        for row in self.db.execute(sql, params).fetchall():
+            conta = IncomeStatementLine(*row)
+            if conta.specific_type in TIPOS_RECEITA:
+                resultado.receitas.append(conta)
+            else:
+                resultado.despesas.append(conta)
+        return resultado
@@ -0,0 +1,167 @@
+# src/core/template_scheduler.py
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.core.templates import TemplateEngine, TemplateRun, TransactionTemplate
+
+# Regras de recorrência aceitas em transaction_templates.recurrence
+RECORRENCIAS = {
+    'diaria': "Diária",
+    'semanal': "Semanal",
+    'mensal': "Mensal",
+    'periodo_fiscal': "No fim de cada período fiscal",
+}
+
+
+@dataclass
+class RecurringTemplate:
+    template: TransactionTemplate
+    regra: str
+    inicio: str
+    fim: Optional[str] = None
+
+
+@dataclass
+class SchedulerResult:
+    ocorrencias: int = 0
+    transacoes: int = 0
+    # Modelos não lançados nesta execução: nome do modelo -> problemas
+    recusados: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def _dia_do_mes(ano, mes, dia):
+    """Dia `dia` do mês, limitado ao último dia (ex.: dia 31 em fevereiro -> 28 ou 29)."""
+    return date(ano, mes, min(dia, calendar.monthrange(ano, mes)[1]))
+
+
+def ocorrencias(regra, inicio, ate, fim=None, depois_de=None, fins_de_periodo=()):
+    """
+    Datas (YYYY-MM-DD) das ocorrências da regra de `inicio` até `ate` (inclusive),
+    sem passar de `fim` e apenas posteriores a `depois_de` (a última já lançada),
+    se informados. As mensais caem no dia do mês de `inicio`; as de
+    'periodo_fiscal' são as datas de `fins_de_periodo` (fins dos períodos fiscais).
+    """
+    limite = min(ate, fim) if fim else ate
+    minimo = max(inicio, depois_de) if depois_de else inicio
+    if regra == 'periodo_fiscal':
+        return sorted({d for d in fins_de_periodo if inicio <= d <= limite and (not depois_de or d > depois_de)})
+
+    primeira = datetime.strptime(inicio, "%Y-%m-%d").date()
+    ultima = datetime.strptime(limite, "%Y-%m-%d").date()
+    datas = []
+    if regra in ('diaria', 'semanal'):
+        passo = 1 if regra == 'diaria' else 7
+        atual = primeira
+        if depois_de and depois_de >= inicio:
+            # Salta direto para a primeira ocorrência depois da última já lançada
+            dias = (datetime.strptime(depois_de, "%Y-%m-%d").date() - primeira).days
+            atual = primeira + timedelta(days=(dias // passo + 1) * passo)
+        while atual <= ultima:
+            datas.append(atual.isoformat())
+            atual += timedelta(days=passo)
+    elif regra == 'mensal':
+        ano, mes = primeira.year, primeira.month
+        atual = primeira
+        while atual <= ultima:
+            if not depois_de or atual.isoformat() > minimo:
+                datas.append(atual.isoformat())
+            ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+            atual = _dia_do_mes(ano, mes, primeira.day)
+    else:
+        raise ValueError(f"regra de recorrência desconhecida: {regra}")
+    return datas
+
+
+class TemplateScheduler:
+    """
+    Lança as ocorrências vencidas dos modelos recorrentes.
+
+    Para cada modelo com recorrência, calcula as ocorrências desde a última já
+    lançada (ou desde recurrence_start) até a data de referência e lança todas
+    com o TemplateEngine em uma única unidade de trabalho, registrando cada
+    ocorrência em template_occurrences na mesma transação. Uma execução
+    interrompida não grava nada, e repetir a execução não lança de novo as
+    ocorrências registradas. Modelos com linhas inválidas (ex.: conta
+    excluída) são recusados e informados, sem impedir os demais.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.engine = TemplateEngine(db)
+
+    def recorrentes(self) -> List[RecurringTemplate]:
+        sql = """
+        SELECT id, recurrence, recurrence_start, recurrence_end
+        FROM transaction_templates
+        WHERE recurrence IS NOT NULL
+        ORDER BY id
+        """
+        regras = self.db.execute(sql).fetchall()
+        modelos = self.engine.load(row[0] for row in regras)
+        return [RecurringTemplate(modelos[row[0]], row[1], row[2], row[3]) for row in regras if row[0] in modelos]
+
+    def definir_recorrencia(self, template_id, regra, inicio=None, fim=None):
+        """Define a recorrência do modelo (regra None remove a recorrência)."""
+        if regra is not None and regra not in RECORRENCIAS:
+            raise ValueError(f"regra de recorrência desconhecida: {regra}")
+        if regra is not None and not inicio:
+            raise ValueError("informe a data da primeira ocorrência")
+        sql = """
+        UPDATE transaction_templates
+        SET recurrence = ?, recurrence_start = ?, recurrence_end = ?
+        WHERE id = ?
+        """
+        self.db.execute(sql, (regra, inicio if regra else None, fim if regra else None, template_id))
+
+    def pendentes(self, ate=None) -> List[TemplateRun]:
+        """Ocorrências vencidas até `ate` (hoje, por padrão) ainda não lançadas, em ordem de data."""
+        ate = ate or date.today().isoformat()
+        ultimas = dict(self.db.execute(
+            "SELECT template_id, MAX(occurrence_date) FROM template_occurrences GROUP BY template_id"
+        ).fetchall())
+        modelos = self.recorrentes()
+        fins_de_periodo = ()
+        if any(modelo.regra == 'periodo_fiscal' for modelo in modelos):
+            fins_de_periodo = [row[0] for row in self.db.execute(
+                "SELECT DISTINCT end_date FROM fiscal_periods WHERE end_date <= ?", (ate,)
+            ).fetchall()]
+
+        execucoes = []
+        for modelo in modelos:
+            datas = ocorrencias(modelo.regra, modelo.inicio, ate, modelo.fim,
+                                ultimas.get(modelo.template.id), fins_de_periodo)
+            execucoes += self.engine.runs_for_dates(modelo.template, datas)
+        execucoes.sort(key=lambda run: (run.date, run.template.id))
+        return execucoes
+
+    def executar(self, ate=None) -> SchedulerResult:
+        """Lança todas as ocorrências pendentes até `ate` em uma única unidade de trabalho."""
+        resultado = SchedulerResult()
+        with self.db.transaction():
+            # Calculadas já com o lock de escrita: outra execução simultânea não vê as mesmas pendentes
+            execucoes = self.pendentes(ate)
+            # Valida cada modelo uma vez com todas as suas datas: um modelo inválido fica inteiro de fora
+            por_modelo = {}
+            for run in execucoes:
+                por_modelo.setdefault(run.template.id, []).append(run)
+            validas = []
+            for runs in por_modelo.values():
+                problemas = self.engine.validate(runs)
+                if problemas:
+                    resultado.recusados[runs[0].template.name] = problemas
+                else:
+                    validas += runs
+            validas.sort(key=lambda run: (run.date, run.template.id))
+            if not validas:
+                return resultado
+
+            agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.db.executemany(
+                "INSERT INTO template_occurrences (template_id, occurrence_date, posted_at) VALUES (?, ?, ?)",
+                [(run.template.id, run.date, agora) for run in validas],
+            )
+            resultado.transacoes = self.engine.execute(validas)
+            resultado.ocorrencias = len(validas)
+        return resultado
@@ -1,16 +1,17 @@
 # src/core/templates.py
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List
 import json
 from decimal import Decimal
 from datetime import datetime
+from src.utils.money import to_decimal
 
 @dataclass
 class TemplateTransaction:
     description: str
     debit_account: int
     credit_account: int
-    amount: float
+    amount: Decimal
 
 @dataclass
 class TransactionTemplate:
@@ -18,27 +19,187 @@ class TransactionTemplate:
     name: str = ""
     transactions: List[TemplateTransaction] = None
 
-    def to_json(self):
-        return json.dumps([{
-            'description': t.description,
-            'debit_account': t.debit_account,
-            'credit_account': t.credit_account,
-            'amount': t.amount
-        } for t in self.transactions])
+
+class TemplateManager:
+    """
+    Leitura e gravação dos modelos de transações.
+
+    As linhas de cada modelo ficam em template_lines (uma linha por
+    transação, na ordem de line_no); os modelos são montados com uma única
+    consulta, sem interpretar JSON. templates_using_account() encontra os
+    modelos que usam uma conta pelos índices de débito e crédito.
+    """
+
+    SQL_SELECT = """
+    SELECT t.id, t.name, l.description, l.debit_account, l.credit_account, l.amount
+    FROM transaction_templates t
+    LEFT JOIN template_lines l ON l.template_id = t.id
+    {where}
+    ORDER BY t.id, l.line_no
+    """
+
+    SQL_INSERT_LINE = """
+    INSERT INTO template_lines (template_id, line_no, description, debit_account, credit_account, amount)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def _select(self, where="", params=()) -> List[TransactionTemplate]:
+        templates = []
+        for template_id, name, description, debit, credit, amount in self.db.execute(
+                self.SQL_SELECT.format(where=where), params).fetchall():
+            if not templates or templates[-1].id != template_id:
+                templates.append(TransactionTemplate(template_id, name, []))
+            if debit is not None:
+                templates[-1].transactions.append(TemplateTransaction(description, debit, credit, amount))
+        return templates
+
+    def get_templates(self, search_term: str = "") -> List[TransactionTemplate]:
+        """Modelos cujo ID é o termo ou cujo nome contém o termo; todos, se o termo for vazio."""
+        search_term = search_term.strip()
+        if not search_term:
+            return self._select()
+        template_id = int(search_term) if search_term.isdigit() else -1
+        return self._select("WHERE t.id = ? OR t.name LIKE ?", (template_id, f"%{search_term}%"))
+
+    def get_template(self, template_id: int):
+        templates = self._select("WHERE t.id = ?", (template_id,))
+        return templates[0] if templates else None
+
+    def load(self, template_ids) -> Dict[int, TransactionTemplate]:
+        """Carrega os modelos pelos IDs, em uma consulta. IDs inexistentes ficam de fora."""
+        templates = self._select("WHERE t.id IN (SELECT value FROM json_each(?))", (json.dumps(list(template_ids)),))
+        return {template.id: template for template in templates}
+
+    def templates_using_account(self, account_id: int) -> List[TransactionTemplate]:
+        """Modelos com alguma linha que debita ou credita a conta."""
+        return self._select("""
+        WHERE t.id IN (SELECT template_id FROM template_lines WHERE debit_account = ?
+                       UNION SELECT template_id FROM template_lines WHERE credit_account = ?)""",
+                            (account_id, account_id))
+
+    def _insert_lines(self, template: TransactionTemplate):
+        self.db.executemany(self.SQL_INSERT_LINE, [
+            (template.id, numero, t.description, t.debit_account, t.credit_account, to_decimal(t.amount))
+            for numero, t in enumerate(template.transactions or [], 1)
+        ])
+
+    def create_template(self, template: TransactionTemplate) -> int:
+        """Grava um modelo novo com suas linhas e retorna o ID."""
+        with self.db.transaction():
+            cursor = self.db.execute("INSERT INTO transaction_templates (name) VALUES (?)", (template.name,))
+            template.id = cursor.lastrowid
+            self._insert_lines(template)
+        return template.id
+
+    def update_template(self, template: TransactionTemplate):
+        """Regrava o nome e todas as linhas do modelo."""
+        with self.db.transaction():
+            self.db.execute("UPDATE transaction_templates SET name = ? WHERE id = ?", (template.name, template.id))
+            self.db.execute("DELETE FROM template_lines WHERE template_id = ?", (template.id,))
+            self._insert_lines(template)
+
+    def delete_template(self, template_id: int):
+        # As linhas e as ocorrências são apagadas pelos gatilhos de transaction_templates
+        self.db.execute("DELETE FROM transaction_templates WHERE id = ?", (template_id,))
+
+
+@dataclass
+class TemplateRun:
+    """Uma execução de modelo: todas as linhas de `template` lançadas na data `date` (YYYY-MM-DD)."""
+    template: TransactionTemplate
+    date: str
+
+
+class TemplateExecutionError(ValueError):
+    """Execução recusada na validação; `problemas` lista todas as linhas inválidas."""
+
+    def __init__(self, problemas: List[str]):
+        self.problemas = problemas
+        super().__init__("; ".join(problemas))
+
+
+class TemplateEngine:
+    """
+    Executa modelos de transações de forma atômica e em lote.
+
+    Todas as linhas de todas as execuções são validadas antes de qualquer
+    gravação (data, valor positivo, contas distintas e existentes, com as
+    contas conferidas em uma única consulta); se houver qualquer problema,
+    nada é lançado. Os lançamentos são gravados com um único executemany em
+    uma unidade de trabalho: ou entram todos, ou nenhum. Vários modelos, ou o
+    mesmo modelo em várias datas (ex.: lançamentos recorrentes de fim de
+    mês), são executados em uma chamada.
+    """
+
+    SQL_INSERT = """
+    INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+    VALUES (?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.templates = TemplateManager(db)
+
+    def load(self, template_ids) -> Dict[int, TransactionTemplate]:
+        """Carrega os modelos pelos IDs, em uma consulta. IDs inexistentes ficam de fora."""
+        return self.templates.load(template_ids)
 
     @staticmethod
-    def from_json(template_id: int, name: str, json_str: str):
-        data = json.loads(json_str)
-        transactions = [
-            TemplateTransaction(
-                description=t['description'],
-                debit_account=t['debit_account'],
-                credit_account=t['credit_account'],
-                amount=t['amount']
-            ) for t in data
-        ]
-        template = TransactionTemplate(template_id, name)
-        template.transactions = transactions
-        return template
+    def runs_for_dates(template: TransactionTemplate, dates) -> List[TemplateRun]:
+        """Execuções do mesmo modelo em cada uma das datas."""
+        return [TemplateRun(template, data) for data in dates]
+
+    def _existing_accounts(self, account_ids) -> set:
+        sql = "SELECT id FROM accounts WHERE id IN (SELECT value FROM json_each(?))"
+        return {row[0] for row in self.db.execute(sql, (json.dumps(sorted(account_ids)),)).fetchall()}
 
-# src/services/template_service.py
+    def validate(self, runs: List[TemplateRun]) -> List[str]:
+        """Retorna a lista de problemas das execuções (vazia se todas forem válidas)."""
+        account_ids = {conta for run in runs for t in (run.template.transactions or [])
+                       for conta in (t.debit_account, t.credit_account) if isinstance(conta, int)}
+        existentes = self._existing_accounts(account_ids) if account_ids else set()
+
+        problemas = []
+        for run in runs:
+            origem = f"Modelo '{run.template.name}' em {run.date}"
+            try:
+                datetime.strptime(run.date, "%Y-%m-%d")
+            except (TypeError, ValueError):
+                problemas.append(f"{origem}: data inválida (use AAAA-MM-DD)")
+            if not run.template.transactions:
+                problemas.append(f"{origem}: modelo sem transações")
+                continue
+            for numero, t in enumerate(run.template.transactions, 1):
+                linha = f"{origem}, transação {numero}"
+                try:
+                    if to_decimal(t.amount) <= 0:
+                        problemas.append(f"{linha}: o valor deve ser maior que zero")
+                except (TypeError, ValueError, ArithmeticError):
+                    problemas.append(f"{linha}: valor inválido '{t.amount}'")
+                if t.debit_account == t.credit_account:
+                    problemas.append(f"{linha}: débito e crédito na mesma conta")
+                for lado, conta in (("débito", t.debit_account), ("crédito", t.credit_account)):
+                    if conta not in existentes:
+                        problemas.append(f"{linha}: conta de {lado} {conta} não existe")
+        return problemas
+
+    def execute(self, runs: List[TemplateRun]) -> int:
+        """
+        Valida e lança todas as execuções em uma única unidade de trabalho.
+        Levanta TemplateExecutionError (sem gravar nada) se alguma linha for inválida.
+        Retorna o número de transações lançadas.
+        """
+        problemas = self.validate(runs)
+        if problemas:
+            raise TemplateExecutionError(problemas)
+        linhas = [
+            (run.date, t.description, t.debit_account, t.credit_account, to_decimal(t.amount))
+            for run in runs
+            for t in run.template.transactions
+        ]
+        with self.db.transaction():
+            self.db.executemany(self.SQL_INSERT, linhas)
+        return len(linhas)
@@ -1,7 +1,40 @@
+import re
 from decimal import Decimal
 from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 from src.database.models import Transaction
 from src.core.accounts import AccountManager
+from src.utils.money import to_decimal
+from src.utils.validators import normalizar_nome
+from config.settings import TRANSACTION_PAGE_SIZE, TRANSACTION_SEARCH_LIMIT
+
+# Pending transactions reindexed per executemany in sync_search_index
+SEARCH_SYNC_BATCH = 10000
+# Most recent matches ranked by bm25 in search_transactions
+SEARCH_RANK_CANDIDATES = 1000
+
+# Ledger row with the account names in place of the account IDs
+SQL_SELECT_WITH_NAMES = """
+SELECT t.id, t.date, t.description,
+       d.name AS debito, c.name AS credito,
+       t.amount
+FROM {source} t
+JOIN accounts d ON t.debit_account = d.id
+JOIN accounts c ON t.credit_account = c.id
+"""
+
+
+def build_fts_query(text: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 query for transactions_fts: the text is normalized
+    like normalizar_nome and every word becomes a prefix term that must match,
+    e.g. "Alug. salão" -> '"alug"* "salao"*'. Returns None if there is no word.
+    """
+    words = re.findall(r"[^\W_]+", normalizar_nome(text))
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
 
 class TransactionManager:
     def __init__(self, db):
@@ -9,27 +42,141 @@ class TransactionManager:
         self.account_manager = AccountManager(db)
 
     def create_transaction(self, transaction: Transaction) -> bool:
-        # Begin transaction
+        sql = """
+        INSERT INTO transactions 
+        (date, description, debit_account, credit_account, amount)
+        VALUES (?, ?, ?, ?, ?)
+        """
         try:
-            # Insert transaction record
-            sql = """
-            INSERT INTO transactions 
-            (date, description, debit_account, credit_account, amount)
-            VALUES (?, ?, ?, ?, ?)
-            """
+            # Account balances are maintained by the database triggers on transactions
             self.db.execute(sql, (
                 transaction.date.strftime('%Y-%m-%d'),
                 transaction.description,
                 transaction.debit_account,
                 transaction.credit_account,
-                float(transaction.amount)
+                to_decimal(transaction.amount)
             ))
 
-            # Update account balances
-            self.account_manager.update_balance(transaction.debit_account, -transaction.amount)
-            self.account_manager.update_balance(transaction.credit_account, transaction.amount)
-
             return True
         except Exception as e:
             print(f"Error creating transaction: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
+        """Looks up a single transaction by ID (account names in debit_account/credit_account)."""
+        sql = SQL_SELECT_WITH_NAMES.format(source="transactions") + "WHERE t.id = ?"
+        row = self.db.execute(sql, (transaction_id,)).fetchone()
+        return Transaction(*row) if row else None
+
+    def iter_transactions(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          account_id: Optional[int] = None, min_amount: Optional[Decimal] = None,
+                          max_amount: Optional[Decimal] = None,
+                          page_size: int = TRANSACTION_PAGE_SIZE,
+                          after: Optional[Tuple[str, int]] = None) -> Iterator[List[Transaction]]:
+        """
+        Yields the ledger in pages of up to `page_size` transactions ordered by (date, id),
+        optionally filtered by date range (inclusive), account (debit or credit side)
+        and amount range. Keyset pagination: each page starts after the (date, id)
+        of the last row of the previous one, so every page is an index range seek
+        and only one page is held in memory, whatever the size of the ledger.
+        `after` resumes from a (date, id) key, e.g. the last row of a page served earlier.
+        Account names replace the account IDs in debit_account/credit_account.
+        """
+        conditions = ["(date, id) > (?, ?)"]
+        params = []
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        if account_id is not None:
+            conditions.append("(debit_account = ? OR credit_account = ?)")
+            params += [account_id, account_id]
+        if min_amount is not None:
+            conditions.append("amount >= ?")
+            params.append(to_decimal(min_amount))
+        if max_amount is not None:
+            conditions.append("amount <= ?")
+            params.append(to_decimal(max_amount))
+
+        # The page is picked from transactions alone (index seek + LIMIT) before joining the account names
+        page = f"(SELECT * FROM transactions WHERE {' AND '.join(conditions)} ORDER BY date, id LIMIT ?)"
+        sql = SQL_SELECT_WITH_NAMES.format(source=page) + "ORDER BY t.date, t.id"
+
+        last_key = tuple(after) if after else ('', 0)
+        while True:
+            rows = self.db.execute(sql, (*last_key, *params, page_size)).fetchall()
+            if not rows:
+                return
+            yield [Transaction(*row) for row in rows]
+            if len(rows) < page_size:
+                return
+            last_key = (rows[-1][1], rows[-1][0])
+
+    def sync_search_index(self, batch_size: int = SEARCH_SYNC_BATCH) -> int:
+        """
+        Reindexes in transactions_fts the transactions recorded in transactions_fts_pending
+        by the triggers (inserted, deleted or with a new description), storing the
+        description normalized by normalizar_nome. Runs in batches with executemany,
+        in a single unit of work. Returns the number of transactions reindexed.
+        """
+        sql_pending = """
+        SELECT p.transaction_id, t.description
+        FROM transactions_fts_pending p
+        LEFT JOIN transactions t ON t.id = p.transaction_id
+        """
+        if not self.db.execute("SELECT EXISTS (SELECT 1 FROM transactions_fts_pending)").fetchone()[0]:
+            return 0
+        total = 0
+        with self.db.transaction():
+            cursor = self.db.execute(sql_pending)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                self.db.executemany("DELETE FROM transactions_fts WHERE rowid = ?", [(row[0],) for row in rows])
+                self.db.executemany(
+                    "INSERT INTO transactions_fts (rowid, description) VALUES (?, ?)",
+                    [(row[0], normalizar_nome(row[1])) for row in rows if row[1]],
+                )
+                total += len(rows)
+            if total:
+                self.db.execute("DELETE FROM transactions_fts_pending")
+        return total
+
+    def search_transactions(self, text: str, limit: int = TRANSACTION_SEARCH_LIMIT) -> List[Transaction]:
+        """
+        Full-text search over the descriptions (transactions_fts): multi-word, prefix
+        and accent/case-insensitive (see build_fts_query). Returns up to `limit`
+        transactions, most relevant first (bm25), with the account names.
+        Ranking every match of a common word costs time proportional to the
+        ledger, so only the SEARCH_RANK_CANDIDATES most recent matches are
+        ranked; below that number the ranking is exact.
+        The writer connection first indexes the pending transactions; read-only
+        connections search the index as last synchronized.
+        """
+        query = build_fts_query(text)
+        if query is None:
+            return []
+        if not self.db.read_only:
+            self.sync_search_index()
+        matches = """(
+            SELECT tr.*, f.score
+            FROM (
+                SELECT rowid, score
+                FROM (
+                    SELECT rowid, bm25(transactions_fts) AS score
+                    FROM transactions_fts
+                    WHERE transactions_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                )
+                ORDER BY score
+                LIMIT ?
+            ) f
+            JOIN transactions tr ON tr.id = f.rowid
+        )"""
+        sql = SQL_SELECT_WITH_NAMES.format(source=matches) + "ORDER BY t.score"
+        params = (query, max(limit, SEARCH_RANK_CANDIDATES), limit)
+        return [Transaction(*row) for row in self.db.execute(sql, params).fetchall()]
@@ -1,136 +1,268 @@
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from sqlite3 import Error
-from config.settings import DATABASE_PATH
+from config.settings import DATABASE_PATH, POOL_MAX_READERS, DATABASE_PROFILE, PRAGMA_PROFILES
+from src.database.migrations import migrate
+from src.utils.money import register_money_types
+
+# Valores monetários: Decimal <-> INTEGER em centavos nas colunas MONEY (ver src/utils/money.py)
+register_money_types()
+DETECT_TYPES = sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+
+# Ordem em que os PRAGMAs de um perfil são aplicados (busy_timeout primeiro, para a troca de journal esperar locks)
+PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+
+def get_profile(name=None):
+    """Retorna o dicionário de PRAGMAs do perfil informado (ou do perfil configurado)."""
+    name = name or DATABASE_PROFILE
+    if name not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Perfil de banco de dados desconhecido: {name!r}. "
+            f"Perfis disponíveis: {', '.join(PRAGMA_PROFILES)}"
+        )
+    return PRAGMA_PROFILES[name]
+
+
+def apply_profile(conn, name=None, read_only=False):
+    """
+    Aplica um perfil de PRAGMAs a uma conexão.
+    Em conexões somente leitura o journal_mode não é alterado (é uma propriedade do arquivo).
+    """
+    profile = get_profile(name)
+    for pragma in PRAGMA_ORDER:
+        if pragma not in profile:
+            continue
+        if pragma == "journal_mode" and read_only:
+            continue
+        conn.execute(f"PRAGMA {pragma} = {profile[pragma]}")
+
+
+class DatabaseUnavailableError(sqlite3.DatabaseError):
+    """O banco não pôde ser aberto, ou o schema não pôde ser criado ou atualizado."""
+
 
 class Database:
-    def __init__(self):
+    def __init__(self, db_file=None, read_only=False, profile=None):
         self.conn = None
-        self.db_file = DATABASE_PATH
+        self.db_file = db_file or DATABASE_PATH
+        self.read_only = read_only
+        self.profile = profile or DATABASE_PROFILE
+        # Profundidade de unidades de trabalho abertas (ver transaction())
+        self._depth = 0
+        self._lock = threading.RLock()
         
     def connect(self):
+        """
+        Abre a conexão e retorna-a, ou None se o arquivo não puder ser aberto.
+        Na conexão de escrita, os erros das migrações (inclusive um SQLite sem
+        os requisitos) não são engolidos: a conexão é fechada e o erro propagado.
+        """
         try:
-            self.conn = sqlite3.connect(self.db_file)
-            self.create_tables()
-            self.prepopulate_account_types()  # Add this line
-            return self.conn
+            if self.read_only:
+                # Conexões de leitura não fazem trabalho de schema; isso é feito uma vez pela conexão de escrita
+                self.conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, detect_types=DETECT_TYPES,
+                                            check_same_thread=False, isolation_level=None)
+                apply_profile(self.conn, self.profile, read_only=True)
+            else:
+                # isolation_level=None: fora de uma unidade de trabalho cada comando é confirmado sozinho;
+                # dentro de transaction() os comandos são agrupados em um único COMMIT
+                self.conn = sqlite3.connect(self.db_file, detect_types=DETECT_TYPES,
+                                            check_same_thread=False, isolation_level=None)
+                apply_profile(self.conn, self.profile)
         except Error as e:
             print(e)
+            self.close()
+            return None
+        if not self.read_only:
+            try:
+                # Em um banco atualizado isso custa uma única leitura de PRAGMA user_version
+                migrate(self)
+            except BaseException:
+                self.close()
+                raise
+        return self.conn
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
     
-    def create_tables(self):
-        sql_account_categories = """
-        CREATE TABLE IF NOT EXISTS account_categories (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,  -- Nome original (com acentos e maiúsculas/minúsculas)
-            normalized_name TEXT NOT NULL UNIQUE,  -- Nome normalizado (sem acentos e minúsculas)
-            description TEXT
-        );"""
-
-        sql_accounts = """
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,  -- Nome original (com acentos e maiúsculas/minúsculas)
-            normalized_name TEXT NOT NULL UNIQUE,  -- Nome normalizado (sem acentos e minúsculas)
-            type TEXT CHECK(type IN ('debito', 'credito')),
-            specific_type TEXT,
-            specific_subtype TEXT,
-            category_id INTEGER,
-            balance REAL DEFAULT 0,
-            FOREIGN KEY (category_id) REFERENCES account_categories(id)
-        );"""
-        
-        sql_account_types = """
-        CREATE TABLE IF NOT EXISTS account_types (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            normal_balance TEXT CHECK(normal_balance IN ('debito', 'credito'))
-        );"""
-        
-        sql_transactions = """
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY,
-            date TEXT NOT NULL,
-            description TEXT,
-            debit_account INTEGER,
-            credit_account INTEGER,
-            amount REAL NOT NULL,
-            FOREIGN KEY (debit_account) REFERENCES accounts(id),
-            FOREIGN KEY (credit_account) REFERENCES accounts(id)
-        );"""
-        
-        sql_templates = """
-        CREATE TABLE IF NOT EXISTS transaction_templates (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            details TEXT
-        );"""
-
-        sql_fiscal_periods = """
-        CREATE TABLE IF NOT EXISTS fiscal_periods (
-            id INTEGER PRIMARY KEY,
-            start_date TEXT NOT NULL,
-            end_date TEXT NOT NULL,
-            interval_days INTEGER NOT NULL
-        );"""
-
-        sql_depreciation_methods = """
-    CREATE TABLE IF NOT EXISTS depreciation_methods (
-        id INTEGER PRIMARY KEY,
-        name TEXT NOT NULL,
-        description TEXT NOT NULL,
-        annual_rate REAL
-    );"""
-
-        sql_assets = """
-        CREATE TABLE IF NOT EXISTS assets (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            acquisition_date TEXT NOT NULL,
-            acquisition_value REAL NOT NULL,
-            depreciation_method_id INTEGER,
-            useful_life_years INTEGER,
-            salvage_value REAL,
-            start_depreciation_date TEXT NOT NULL,
-            account_id INTEGER,
-            is_active BOOLEAN DEFAULT 1,
-            FOREIGN KEY (depreciation_method_id) REFERENCES depreciation_methods(id),
-            FOREIGN KEY (account_id) REFERENCES accounts(id)
-        );"""
-        
-        self.execute(sql_account_categories)
-        self.execute(sql_account_types)
-        self.execute(sql_accounts)
-        self.execute(sql_transactions)
-        self.execute(sql_templates)
-        self.execute(sql_fiscal_periods)
-        self.execute(sql_depreciation_methods)
-        self.execute(sql_assets)
-    
-    def prepopulate_account_types(self):
-        predefined_types = [
-            ("despesas", "debito"),
-            ("ativos", "debito"),
-            ("compras", "debito"),
-            ("passivos", "credito"),
-            ("entradas", "credito"),
-            ("vendas", "credito"),
-            ("patrimonio", "credito"),
-        ]
-
-        sql_select = "SELECT COUNT(*) FROM account_types WHERE name = ? AND normal_balance = ?"
-        sql_insert = "INSERT OR IGNORE INTO account_types (name, normal_balance) VALUES (?, ?)"
-
-        for name, normal_balance in predefined_types:
-            c = self.execute(sql_select, (name, normal_balance))
-            count = c.fetchone()[0]
-
-            if count == 0:
-                self.execute(sql_insert, (name, normal_balance))
+    @property
+    def in_transaction(self):
+        return self._depth > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unidade de trabalho: todos os comandos executados dentro do bloco são
+        confirmados juntos em um único COMMIT, ou desfeitos juntos se ocorrer
+        qualquer exceção. Blocos aninhados usam SAVEPOINTs.
+
+            with db.transaction():
+                db.execute("INSERT INTO transactions ...", (...))
+                db.execute("UPDATE accounts ...", (...))
+        """
+        with self._lock:
+            savepoint = f"uow_{self._depth}"
+            if self._depth == 0:
+                # IMMEDIATE reserva a escrita já no início, evitando falhas de lock no meio do lote
+                self.conn.execute("BEGIN IMMEDIATE")
+            else:
+                self.conn.execute(f"SAVEPOINT {savepoint}")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.execute("ROLLBACK")
+                else:
+                    self.conn.execute(f"ROLLBACK TO {savepoint}")
+                    self.conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.execute("COMMIT")
+                else:
+                    self.conn.execute(f"RELEASE {savepoint}")
 
     def execute(self, sql, params=()):
+        with self._lock:
+            try:
+                c = self.conn.cursor()
+                c.execute(sql, params)
+                return c
+            except Error as e:
+                if self.in_transaction:
+                    # Dentro de uma unidade de trabalho o erro precisa chegar a transaction() para o ROLLBACK
+                    raise
+                print(f"SQL Error: {e}")
+
+    def executemany(self, sql, seq_of_params):
+        with self._lock:
+            try:
+                c = self.conn.cursor()
+                c.executemany(sql, seq_of_params)
+                return c
+            except Error as e:
+                if self.in_transaction:
+                    raise
+                print(f"SQL Error: {e}")
+
+
+class ConnectionPool:
+    """
+    Provedor de conexões compartilhado pelo processo.
+
+    Mantém uma única conexão de escrita (criada sob demanda, que executa o
+    trabalho de schema uma única vez) e um conjunto limitado de conexões
+    somente leitura, emprestadas com `reader()`.
+    """
+
+    def __init__(self, db_file=None, max_readers=POOL_MAX_READERS, profile=None):
+        self.db_file = db_file or DATABASE_PATH
+        self.max_readers = max_readers
+        self.profile = profile or DATABASE_PROFILE
+        self._writer = None
+        self._readers = queue.LifoQueue()
+        self._created_readers = 0
+        self._all_readers = []
+        self._lock = threading.Lock()
+
+    def writer(self):
+        """
+        Retorna a conexão de escrita compartilhada, conectando na primeira chamada.
+        Lança DatabaseUnavailableError se o banco não puder ser aberto ou migrado;
+        nesse caso nada fica em cache, e a próxima chamada tenta de novo.
+        """
+        with self._lock:
+            if self._writer is None:
+                db = Database(self.db_file, profile=self.profile)
+                try:
+                    conectado = db.connect()
+                except Error as e:
+                    raise DatabaseUnavailableError(f"não foi possível preparar o banco {self.db_file}: {e}") from e
+                if conectado is None:
+                    raise DatabaseUnavailableError(f"não foi possível abrir o banco {self.db_file}")
+                self._writer = db
+            return self._writer
+
+    def _acquire_reader(self, timeout):
         try:
-            c = self.conn.cursor()
-            c.execute(sql, params)
-            self.conn.commit()
-            return c
-        except Error as e:
-            print(f"SQL Error: {e}")
\ No newline at end of file
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created_readers < self.max_readers:
+                self._created_readers += 1
+                create = True
+            else:
+                create = False
+
+        if not create:
+            # Pool cheio: espera uma conexão ser devolvida
+            return self._readers.get(timeout=timeout)
+
+        reader = Database(self.db_file, read_only=True, profile=self.profile)
+        reader.connect()
+        with self._lock:
+            self._all_readers.append(reader)
+        return reader
+
+    @contextmanager
+    def reader(self, timeout=None):
+        """
+        Empresta uma conexão somente leitura do pool.
+        Bloqueia (até `timeout` segundos) se todas as `max_readers` conexões estiverem em uso.
+        """
+        # Garante que o arquivo e o schema existem antes de abrir em modo somente leitura
+        self.writer()
+        reader = self._acquire_reader(timeout)
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def close(self):
+        """Fecha todas as conexões abertas pelo pool."""
+        with self._lock:
+            for reader in self._all_readers:
+                reader.close()
+            self._all_readers = []
+            self._created_readers = 0
+            self._readers = queue.LifoQueue()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Retorna o pool de conexões do processo, criando-o na primeira chamada."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+
+def get_database():
+    """Atalho para a conexão de escrita compartilhada do processo."""
+    return get_pool().writer()
+
+
+def close_pool():
+    """Fecha o pool do processo (usado no encerramento da aplicação)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,590 @@
+# src/database/migrations.py
+"""
+Migrações de schema versionadas por PRAGMA user_version.
+
+Cada migração é uma função que recebe o Database e aplica uma mudança de
+schema ou de dados. A versão do banco é o número da última migração
+aplicada; em um banco atualizado, migrate() faz apenas uma leitura de
+PRAGMA user_version. As migrações pendentes são aplicadas em uma única
+transação: ou todas entram, ou o banco permanece na versão anterior.
+
+Para uma mudança nova, acrescente uma função e uma entrada no fim de
+MIGRATIONS; nunca altere uma migração já publicada.
+"""
+import json
+import sqlite3
+
+from src.utils.money import to_decimal
+
+# Menor SQLite suportado: o índice de busca usa FTS5 com remove_diacritics 2 (3.27)
+# e as consultas por lista de IDs usam json_each (JSON1)
+SQLITE_MINIMO = (3, 27, 0)
+
+
+def _schema_inicial(db):
+    """Tabelas do sistema e dados pré-cadastrados (tipos de conta e métodos de depreciação)."""
+    # Usa IF NOT EXISTS porque bancos criados antes das migrações já têm estas tabelas (user_version = 0)
+    sql_account_categories = """
+    CREATE TABLE IF NOT EXISTS account_categories (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,  -- Nome original (com acentos e maiúsculas/minúsculas)
+        normalized_name TEXT NOT NULL UNIQUE,  -- Nome normalizado (sem acentos e minúsculas)
+        description TEXT
+    );"""
+
+    sql_accounts = """
+    CREATE TABLE IF NOT EXISTS accounts (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,  -- Nome original (com acentos e maiúsculas/minúsculas)
+        normalized_name TEXT NOT NULL UNIQUE,  -- Nome normalizado (sem acentos e minúsculas)
+        type TEXT CHECK(type IN ('debito', 'credito')),
+        specific_type TEXT,
+        specific_subtype TEXT,
+        category_id INTEGER,
+        balance REAL DEFAULT 0,
+        FOREIGN KEY (category_id) REFERENCES account_categories(id)
+    );"""
+
+    sql_account_types = """
+    CREATE TABLE IF NOT EXISTS account_types (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        normal_balance TEXT CHECK(normal_balance IN ('debito', 'credito'))
+    );"""
+
+    sql_transactions = """
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        description TEXT,
+        debit_account INTEGER,
+        credit_account INTEGER,
+        amount REAL NOT NULL,
+        FOREIGN KEY (debit_account) REFERENCES accounts(id),
+        FOREIGN KEY (credit_account) REFERENCES accounts(id)
+    );"""
+
+    sql_templates = """
+    CREATE TABLE IF NOT EXISTS transaction_templates (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        details TEXT
+    );"""
+
+    sql_fiscal_periods = """
+    CREATE TABLE IF NOT EXISTS fiscal_periods (
+        id INTEGER PRIMARY KEY,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        interval_days INTEGER NOT NULL
+    );"""
+
+    sql_depreciation_methods = """
+    CREATE TABLE IF NOT EXISTS depreciation_methods (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        annual_rate REAL
+    );"""
+
+    sql_assets = """
+    CREATE TABLE IF NOT EXISTS assets (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        acquisition_date TEXT NOT NULL,
+        acquisition_value REAL NOT NULL,
+        depreciation_method_id INTEGER,
+        useful_life_years INTEGER,
+        salvage_value REAL,
+        start_depreciation_date TEXT NOT NULL,
+        account_id INTEGER,
+        is_active BOOLEAN DEFAULT 1,
+        FOREIGN KEY (depreciation_method_id) REFERENCES depreciation_methods(id),
+        FOREIGN KEY (account_id) REFERENCES accounts(id)
+    );"""
+
+    for sql in (sql_account_categories, sql_account_types, sql_accounts, sql_transactions,
+                sql_templates, sql_fiscal_periods, sql_depreciation_methods, sql_assets):
+        db.execute(sql)
+
+    predefined_types = [
+        ("despesas", "debito"),
+        ("ativos", "debito"),
+        ("compras", "debito"),
+        ("passivos", "credito"),
+        ("entradas", "credito"),
+        ("vendas", "credito"),
+        ("patrimonio", "credito"),
+    ]
+    sql_select = "SELECT COUNT(*) FROM account_types WHERE name = ? AND normal_balance = ?"
+    sql_insert = "INSERT INTO account_types (name, normal_balance) VALUES (?, ?)"
+    for name, normal_balance in predefined_types:
+        if db.execute(sql_select, (name, normal_balance)).fetchone()[0] == 0:
+            db.execute(sql_insert, (name, normal_balance))
+
+    methods = [
+        ("Linear", "Depreciation is spread evenly across the asset's useful life", 0),
+        ("Declining Balance", "Accelerated depreciation with higher initial amounts", 2),
+        ("Sum of Years Digits", "Accelerated depreciation based on remaining life", 0),
+    ]
+    sql_select = "SELECT COUNT(*) FROM depreciation_methods WHERE name = ?"
+    sql_insert = "INSERT INTO depreciation_methods (name, description, annual_rate) VALUES (?, ?, ?)"
+    for name, description, annual_rate in methods:
+        if db.execute(sql_select, (name,)).fetchone()[0] == 0:
+            db.execute(sql_insert, (name, description, annual_rate))
+
+
+def _indices_razao(db):
+    """
+    Índices do razão, desenhados em torno dos caminhos de acesso das consultas:
+    - por data (balanço até uma data, DRP de um período, listagem ordenada por data/id);
+      cobre as contas e o valor para não precisar ler a tabela
+    - por conta de débito / crédito seguida de data e valor (saldos e extratos de uma conta)
+    """
+    db.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date, debit_account, credit_account, amount)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_transactions_debit ON transactions (debit_account, date, amount)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_transactions_credit ON transactions (credit_account, date, amount)")
+
+
+def _valores_em_centavos(db):
+    """
+    Converte os valores monetários de REAL para INTEGER em centavos (tipo MONEY).
+    O SQLite não altera o tipo de uma coluna, então as tabelas são recriadas e
+    copiadas; os índices de transactions são recriados em seguida.
+    """
+    db.execute("""
+    CREATE TABLE accounts_new (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,  -- Nome original (com acentos e maiúsculas/minúsculas)
+        normalized_name TEXT NOT NULL UNIQUE,  -- Nome normalizado (sem acentos e minúsculas)
+        type TEXT CHECK(type IN ('debito', 'credito')),
+        specific_type TEXT,
+        specific_subtype TEXT,
+        category_id INTEGER,
+        balance MONEY NOT NULL DEFAULT 0,  -- Centavos
+        FOREIGN KEY (category_id) REFERENCES account_categories(id)
+    )""")
+    db.execute("""
+    INSERT INTO accounts_new (id, name, normalized_name, type, specific_type, specific_subtype, category_id, balance)
+    SELECT id, name, normalized_name, type, specific_type, specific_subtype, category_id,
+           CAST(ROUND(COALESCE(balance, 0) * 100) AS INTEGER)
+    FROM accounts
+    """)
+
+    db.execute("""
+    CREATE TABLE transactions_new (
+        id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        description TEXT,
+        debit_account INTEGER,
+        credit_account INTEGER,
+        amount MONEY NOT NULL,  -- Centavos
+        FOREIGN KEY (debit_account) REFERENCES accounts(id),
+        FOREIGN KEY (credit_account) REFERENCES accounts(id)
+    )""")
+    db.execute("""
+    INSERT INTO transactions_new (id, date, description, debit_account, credit_account, amount)
+    SELECT id, date, description, debit_account, credit_account, CAST(ROUND(amount * 100) AS INTEGER)
+    FROM transactions
+    """)
+
+    db.execute("""
+    CREATE TABLE assets_new (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        acquisition_date TEXT NOT NULL,
+        acquisition_value MONEY NOT NULL,  -- Centavos
+        depreciation_method_id INTEGER,
+        useful_life_years INTEGER,
+        salvage_value MONEY,  -- Centavos
+        start_depreciation_date TEXT NOT NULL,
+        account_id INTEGER,
+        is_active BOOLEAN DEFAULT 1,
+        FOREIGN KEY (depreciation_method_id) REFERENCES depreciation_methods(id),
+        FOREIGN KEY (account_id) REFERENCES accounts(id)
+    )""")
+    db.execute("""
+    INSERT INTO assets_new (id, name, acquisition_date, acquisition_value, depreciation_method_id,
+                            useful_life_years, salvage_value, start_depreciation_date, account_id, is_active)
+    SELECT id, name, acquisition_date, CAST(ROUND(acquisition_value * 100) AS INTEGER), depreciation_method_id,
+           useful_life_years, CAST(ROUND(salvage_value * 100) AS INTEGER), start_depreciation_date, account_id, is_active
+    FROM assets
+    """)
+
+    for table in ("accounts", "transactions", "assets"):
+        db.execute(f"DROP TABLE {table}")
+        db.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    _indices_razao(db)
+
+
+def _snapshots_de_saldo(db):
+    """
+    Snapshots de saldo: totais acumulados de débito e crédito de cada conta até
+    a data de corte (inclusive), gravados no fim de cada período fiscal encerrado
+    (ver src/core/balance_snapshots.py). balance_snapshot_heads registra os
+    snapshots completos, inclusive os de um razão ainda sem contas movimentadas.
+
+    Os gatilhos invalidam os snapshots afetados por lançamentos retroativos:
+    inserir, alterar ou excluir uma transação com data D apaga os snapshots com
+    data de corte >= D. Lançamentos no período corrente não apagam nada.
+    """
+    db.execute("""
+    CREATE TABLE balance_snapshot_heads (
+        snapshot_date TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL
+    )""")
+    db.execute("""
+    CREATE TABLE balance_snapshots (
+        snapshot_date TEXT NOT NULL,
+        account_id INTEGER NOT NULL,
+        total_debit MONEY NOT NULL,  -- Centavos
+        total_credit MONEY NOT NULL,  -- Centavos
+        PRIMARY KEY (snapshot_date, account_id)
+    ) WITHOUT ROWID""")
+
+    invalidar = """
+        DELETE FROM balance_snapshot_heads WHERE snapshot_date >= {data};
+        DELETE FROM balance_snapshots WHERE snapshot_date >= {data};
+    """
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_snapshots_insert AFTER INSERT ON transactions
+    BEGIN {invalidar.format(data="NEW.date")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_snapshots_delete AFTER DELETE ON transactions
+    BEGIN {invalidar.format(data="OLD.date")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_snapshots_update
+    AFTER UPDATE OF date, debit_account, credit_account, amount ON transactions
+    BEGIN {invalidar.format(data="MIN(OLD.date, NEW.date)")} END""")
+
+
+def _saldos_por_gatilhos(db):
+    """
+    Saldos das contas (accounts.balance) mantidos pelo próprio banco.
+
+    O saldo fica no lado natural da conta, como no balanço patrimonial: contas
+    de débito somam os débitos e subtraem os créditos; as demais, o contrário.
+    Os gatilhos de transactions aplicam cada lançamento (e revertem o antigo, na
+    alteração ou exclusão) no mesmo comando que grava a transação; o gatilho de
+    accounts inverte o saldo quando a conta troca de lado natural. Os saldos
+    existentes são recalculados a partir do razão.
+    """
+    # Subconsultas correlacionadas (e não UPDATE ... FROM, que exige SQLite 3.33)
+    db.execute("""
+    UPDATE accounts
+    SET balance = (CASE accounts.type WHEN 'debito' THEN 1 ELSE -1 END) * (
+        COALESCE((SELECT SUM(amount) FROM transactions WHERE debit_account = accounts.id), 0)
+        - COALESCE((SELECT SUM(amount) FROM transactions WHERE credit_account = accounts.id), 0)
+    )""")
+
+    # Débito na conta de débito e crédito na de crédito; o estorno troca os sinais
+    aplicar = """
+        UPDATE accounts SET balance = balance + CASE type WHEN 'debito' THEN {debito} ELSE {credito} END
+        WHERE id = {t}.debit_account;
+        UPDATE accounts SET balance = balance + CASE type WHEN 'debito' THEN {credito} ELSE {debito} END
+        WHERE id = {t}.credit_account;
+    """
+    lancar = aplicar.format(t="NEW", debito="NEW.amount", credito="-NEW.amount")
+    estornar = aplicar.format(t="OLD", debito="-OLD.amount", credito="OLD.amount")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_balance_insert AFTER INSERT ON transactions
+    BEGIN {lancar} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_balance_delete AFTER DELETE ON transactions
+    BEGIN {estornar} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_balance_update
+    AFTER UPDATE OF debit_account, credit_account, amount ON transactions
+    BEGIN {estornar} {lancar} END""")
+    db.execute("""
+    CREATE TRIGGER trg_accounts_balance_type AFTER UPDATE OF type ON accounts
+    WHEN (COALESCE(OLD.type, '') = 'debito') <> (COALESCE(NEW.type, '') = 'debito')
+    BEGIN
+        UPDATE accounts SET balance = -balance WHERE id = NEW.id;
+    END""")
+
+
+def _busca_textual(db):
+    """
+    Índice de texto completo (FTS5) das descrições das transações.
+
+    transactions_fts guarda a descrição normalizada (normalizar_nome) de cada
+    transação, com rowid = transactions.id. O índice é atualizado em lote, e
+    não por gatilho: em um gatilho, o FTS5 grava um segmento novo a cada
+    linha, o que torna a inserção em massa várias vezes mais lenta. Os
+    gatilhos apenas registram em transactions_fts_pending os ids inseridos,
+    excluídos ou com descrição alterada; TransactionManager.sync_search_index()
+    reindexa essas transações antes de cada busca. As transações existentes
+    ficam pendentes e são indexadas na primeira busca.
+    """
+    db.execute("""
+    CREATE VIRTUAL TABLE transactions_fts USING fts5(
+        description,
+        tokenize='unicode61 remove_diacritics 2'
+    )""")
+    db.execute("""
+    CREATE TABLE transactions_fts_pending (
+        transaction_id INTEGER PRIMARY KEY
+    )""")
+
+    pendente = "INSERT OR IGNORE INTO transactions_fts_pending (transaction_id) VALUES ({id});"
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_fts_insert AFTER INSERT ON transactions
+    BEGIN {pendente.format(id="NEW.id")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_fts_delete AFTER DELETE ON transactions
+    BEGIN {pendente.format(id="OLD.id")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_transactions_fts_update AFTER UPDATE OF id, description ON transactions
+    BEGIN {pendente.format(id="OLD.id")} {pendente.format(id="NEW.id")} END""")
+    db.execute("INSERT INTO transactions_fts_pending (transaction_id) SELECT id FROM transactions")
+
+
+def _modelos_recorrentes(db):
+    """
+    Recorrência dos modelos de transações (ver src/core/template_scheduler.py).
+
+    recurrence é a regra ('diaria', 'semanal', 'mensal' ou 'periodo_fiscal',
+    NULL para modelos sem recorrência); recurrence_start é a primeira
+    ocorrência (e o dia do mês das mensais) e recurrence_end, opcional, a
+    última data possível. template_occurrences registra cada ocorrência
+    lançada, na mesma transação dos lançamentos: a chave primária impede que
+    uma ocorrência seja lançada duas vezes. Excluir um modelo apaga suas
+    ocorrências (as chaves estrangeiras não são verificadas).
+    """
+    db.execute("""
+    ALTER TABLE transaction_templates ADD COLUMN recurrence TEXT
+        CHECK(recurrence IN ('diaria', 'semanal', 'mensal', 'periodo_fiscal'))""")
+    db.execute("ALTER TABLE transaction_templates ADD COLUMN recurrence_start TEXT")
+    db.execute("ALTER TABLE transaction_templates ADD COLUMN recurrence_end TEXT")
+    db.execute("""
+    CREATE TABLE template_occurrences (
+        template_id INTEGER NOT NULL,
+        occurrence_date TEXT NOT NULL,
+        posted_at TEXT NOT NULL,
+        PRIMARY KEY (template_id, occurrence_date),
+        FOREIGN KEY (template_id) REFERENCES transaction_templates(id)
+    ) WITHOUT ROWID""")
+    db.execute("""
+    CREATE TRIGGER trg_transaction_templates_occurrences_delete AFTER DELETE ON transaction_templates
+    BEGIN
+        DELETE FROM template_occurrences WHERE template_id = OLD.id;
+    END""")
+
+
+def _linhas_de_modelo(db):
+    """
+    Linhas dos modelos de transações em uma tabela própria (template_lines).
+
+    Antes, as linhas ficavam em transaction_templates.details como um texto
+    JSON, lido e interpretado a cada listagem, e não era possível saber quais
+    modelos usam uma conta sem interpretar todos. Cada linha passa a ser um
+    registro com as contas de débito e crédito indexadas (modelos por conta)
+    e o valor em centavos (MONEY). As linhas são convertidas do JSON e a
+    coluna details é removida. Excluir um modelo apaga suas linhas (as chaves
+    estrangeiras não são verificadas).
+    """
+    db.execute("""
+    CREATE TABLE template_lines (
+        template_id INTEGER NOT NULL,
+        line_no INTEGER NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        debit_account INTEGER NOT NULL,
+        credit_account INTEGER NOT NULL,
+        amount MONEY NOT NULL,
+        PRIMARY KEY (template_id, line_no),
+        FOREIGN KEY (template_id) REFERENCES transaction_templates(id),
+        FOREIGN KEY (debit_account) REFERENCES accounts(id),
+        FOREIGN KEY (credit_account) REFERENCES accounts(id)
+    ) WITHOUT ROWID""")
+    db.execute("CREATE INDEX idx_template_lines_debit ON template_lines (debit_account, template_id)")
+    db.execute("CREATE INDEX idx_template_lines_credit ON template_lines (credit_account, template_id)")
+    db.execute("""
+    CREATE TRIGGER trg_transaction_templates_lines_delete AFTER DELETE ON transaction_templates
+    BEGIN
+        DELETE FROM template_lines WHERE template_id = OLD.id;
+    END""")
+
+    linhas = []
+    for template_id, details in db.execute("SELECT id, details FROM transaction_templates").fetchall():
+        try:
+            itens = json.loads(details) if details else []
+        except ValueError:
+            itens = []
+        for numero, item in enumerate(itens, 1):
+            linhas.append((template_id, numero, item.get('description') or '',
+                           item['debit_account'], item['credit_account'], to_decimal(item['amount'])))
+    if linhas:
+        db.executemany("""
+        INSERT INTO template_lines (template_id, line_no, description, debit_account, credit_account, amount)
+        VALUES (?, ?, ?, ?, ?, ?)""", linhas)
+    # Sem ALTER TABLE ... DROP COLUMN (SQLite 3.35): a tabela é recriada sem details,
+    # e os gatilhos de exclusão, apagados com ela, são recriados
+    db.execute("""
+    CREATE TABLE transaction_templates_new (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        recurrence TEXT CHECK(recurrence IN ('diaria', 'semanal', 'mensal', 'periodo_fiscal')),
+        recurrence_start TEXT,
+        recurrence_end TEXT
+    )""")
+    db.execute("""
+    INSERT INTO transaction_templates_new (id, name, recurrence, recurrence_start, recurrence_end)
+    SELECT id, name, recurrence, recurrence_start, recurrence_end FROM transaction_templates""")
+    db.execute("DROP TABLE transaction_templates")
+    db.execute("ALTER TABLE transaction_templates_new RENAME TO transaction_templates")
+    db.execute("""
+    CREATE TRIGGER trg_transaction_templates_occurrences_delete AFTER DELETE ON transaction_templates
+    BEGIN
+        DELETE FROM template_occurrences WHERE template_id = OLD.id;
+    END""")
+    db.execute("""
+    CREATE TRIGGER trg_transaction_templates_lines_delete AFTER DELETE ON transaction_templates
+    BEGIN
+        DELETE FROM template_lines WHERE template_id = OLD.id;
+    END""")
+
+
+def _lancamentos_de_depreciacao(db):
+    """
+    Lançamento da depreciação de todos os ativos no fechamento do período
+    (ver DepreciationPosting em src/core/depreciation.py).
+
+    Cada ativo ganha contas padrão de depreciação: a de despesa (débito) e a
+    de depreciação acumulada (crédito). depreciation_postings registra a
+    depreciação lançada de cada ativo em cada período fiscal, na mesma
+    transação dos lançamentos; a chave primária (ativo, período) impede que
+    ela seja lançada duas vezes. Excluir um período fiscal apaga seus
+    registros (as chaves estrangeiras não são verificadas).
+    """
+    db.execute("ALTER TABLE assets ADD COLUMN expense_account_id INTEGER REFERENCES accounts(id)")
+    db.execute("ALTER TABLE assets ADD COLUMN accumulated_account_id INTEGER REFERENCES accounts(id)")
+    db.execute("""
+    CREATE TABLE depreciation_postings (
+        asset_id INTEGER NOT NULL,
+        fiscal_period_id INTEGER NOT NULL,
+        amount MONEY NOT NULL,
+        posted_at TEXT NOT NULL,
+        PRIMARY KEY (asset_id, fiscal_period_id),
+        FOREIGN KEY (asset_id) REFERENCES assets(id),
+        FOREIGN KEY (fiscal_period_id) REFERENCES fiscal_periods(id)
+    ) WITHOUT ROWID""")
+    db.execute("CREATE INDEX idx_depreciation_postings_period ON depreciation_postings (fiscal_period_id)")
+    db.execute("""
+    CREATE TRIGGER trg_fiscal_periods_depreciation_delete AFTER DELETE ON fiscal_periods
+    BEGIN
+        DELETE FROM depreciation_postings WHERE fiscal_period_id = OLD.id;
+    END""")
+
+
+def _cronograma_de_depreciacao(db):
+    """
+    Cronograma mensal de depreciação de cada ativo (depreciation_schedule, ver
+    src/core/depreciation_schedule.py): valor no início do mês, depreciação do
+    mês e valor no fim do mês, do mês de início da depreciação até o fim da
+    vida útil. O índice por mês cobre as somas de depreciação de um período.
+
+    Como no índice de busca (migração 6), os gatilhos apenas registram em
+    depreciation_schedule_pending os ativos cadastrados, alterados ou
+    excluídos; DepreciationSchedule.sincronizar() recalcula o cronograma
+    desses ativos em lote antes de cada leitura. Os ativos existentes ficam
+    pendentes e são calculados na primeira leitura.
+    """
+    db.execute("""
+    CREATE TABLE depreciation_schedule (
+        asset_id INTEGER NOT NULL,
+        month_end TEXT NOT NULL,
+        opening_value MONEY NOT NULL,
+        charge MONEY NOT NULL,
+        closing_value MONEY NOT NULL,
+        PRIMARY KEY (asset_id, month_end),
+        FOREIGN KEY (asset_id) REFERENCES assets(id)
+    ) WITHOUT ROWID""")
+    db.execute("CREATE INDEX idx_depreciation_schedule_month ON depreciation_schedule (month_end, asset_id, charge)")
+    db.execute("""
+    CREATE TABLE depreciation_schedule_pending (
+        asset_id INTEGER PRIMARY KEY
+    )""")
+
+    pendente = "INSERT OR IGNORE INTO depreciation_schedule_pending (asset_id) VALUES ({id});"
+    db.execute(f"""
+    CREATE TRIGGER trg_assets_schedule_insert AFTER INSERT ON assets
+    BEGIN {pendente.format(id="NEW.id")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_assets_schedule_delete AFTER DELETE ON assets
+    BEGIN {pendente.format(id="OLD.id")} END""")
+    db.execute(f"""
+    CREATE TRIGGER trg_assets_schedule_update
+    AFTER UPDATE OF id, acquisition_value, depreciation_method_id, useful_life_years, salvage_value,
+                    start_depreciation_date, is_active ON assets
+    BEGIN {pendente.format(id="OLD.id")} {pendente.format(id="NEW.id")} END""")
+    db.execute("INSERT INTO depreciation_schedule_pending (asset_id) SELECT id FROM assets")
+
+
+# (versão, descrição, função) em ordem crescente de versão
+MIGRATIONS = [
+    (1, "Schema inicial", _schema_inicial),
+    (2, "Índices do razão", _indices_razao),
+    (3, "Valores monetários em centavos", _valores_em_centavos),
+    (4, "Snapshots de saldo por período fiscal", _snapshots_de_saldo),
+    (5, "Saldos das contas mantidos por gatilhos", _saldos_por_gatilhos),
+    (6, "Busca textual nas descrições das transações", _busca_textual),
+    (7, "Modelos recorrentes", _modelos_recorrentes),
+    (8, "Linhas dos modelos em tabela própria", _linhas_de_modelo),
+    (9, "Lançamentos de depreciação por período", _lancamentos_de_depreciacao),
+    (10, "Cronograma mensal de depreciação", _cronograma_de_depreciacao),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(db):
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(version):
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+
+def verificar_sqlite(db):
+    """
+    Lança sqlite3.NotSupportedError, com o que falta, se a biblioteca SQLite
+    em uso for anterior a SQLITE_MINIMO ou não tiver FTS5 e JSON1.
+    """
+    faltando = []
+    if sqlite3.sqlite_version_info < SQLITE_MINIMO:
+        faltando.append(f"versão {'.'.join(map(str, SQLITE_MINIMO))} ou mais recente (encontrada: {sqlite3.sqlite_version})")
+    # Direto na conexão: fora de uma unidade de trabalho, Database.execute engole OperationalError
+    if not db.conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0]:
+        faltando.append("extensão FTS5")
+    try:
+        db.conn.execute("SELECT json_valid('[]')")
+    except sqlite3.OperationalError:
+        faltando.append("extensão JSON1")
+    if faltando:
+        raise sqlite3.NotSupportedError(
+            "O SQLite deste Python não atende aos requisitos do sistema: " + "; ".join(faltando)
+            + ". Atualize o Python ou instale um SQLite mais recente (ver README.md).")
+
+
+def migrate(db):
+    """
+    Aplica as migrações pendentes e retorna a versão final do banco.
+    Em um banco atualizado custa apenas a leitura de PRAGMA user_version.
+    Antes de migrar, confere se o SQLite tem o que as migrações usam.
+    """
+    if get_version(db) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    verificar_sqlite(db)
+    with db.transaction():
+        # Relê a versão já com o lock de escrita: outro processo pode ter migrado nesse meio tempo
+        version = get_version(db)
+        for number, description, apply in pending_migrations(version):
+            try:
+                apply(db)
+            except sqlite3.Error as e:
+                raise type(e)(f"migração {number} ({description}) falhou: {e}") from e
+        db.execute(f"PRAGMA user_version = {LATEST_VERSION}")
+    return LATEST_VERSION
@@ -33,7 +33,7 @@ class TemplateTransaction:  # Add this class
     description: str
     debit_account: int
     credit_account: int
-    amount: float
+    amount: Decimal
 
 @dataclass
 class TransactionTemplate:
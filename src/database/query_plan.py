@@ -0,0 +1,111 @@
+# src/database/query_plan.py
+"""
+Verificação de planos de consulta (EXPLAIN QUERY PLAN).
+
+Usado para garantir que as consultas de produção usam os índices do razão
+em vez de varrer a tabela inteira. O fluxo típico é gravar as consultas
+executadas por um trecho de código e depois verificar o plano de cada uma:
+
+    with QueryRecorder(db) as recorder:
+        BalanceSheet(db).calcular_saldos_na_data("2024-12-31")
+    problemas = check_statements(db, recorder.statements)
+"""
+import re
+
+# Tabelas que crescem com o volume de lançamentos e nunca devem ser varridas por inteiro
+LEDGER_TABLES = ("transactions",)
+
+# Comandos cujo plano é verificado (INSERTs não leem o razão)
+_CHECKED_PREFIXES = ("select", "with", "update", "delete")
+
+
+class FullScanError(AssertionError):
+    """Uma consulta varre uma tabela do razão por inteiro."""
+
+
+def explain(db, sql, params=()):
+    """Retorna as linhas de detalhe do EXPLAIN QUERY PLAN da consulta."""
+    rows = db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in rows]
+
+
+def _ledger_aliases(sql, tables):
+    """Nomes pelos quais as tabelas do razão aparecem no plano (o próprio nome e os aliases)."""
+    aliases = set(tables)
+    for table in tables:
+        pattern = rf"\b{table}\b\s+(?:AS\s+)?(\w+)"
+        for match in re.finditer(pattern, sql, flags=re.IGNORECASE):
+            alias = match.group(1)
+            if alias.upper() not in ("WHERE", "JOIN", "LEFT", "INNER", "CROSS", "ON", "ORDER",
+                                     "GROUP", "UNION", "SET", "VALUES", "LIMIT", "USING"):
+                aliases.add(alias)
+    return aliases
+
+
+def find_full_scans(db, sql, params=(), tables=LEDGER_TABLES):
+    """
+    Retorna as linhas do plano que leem uma tabela do razão por inteiro:
+    "SCAN <tabela>" sem índice, ou percorrendo um índice não-cobridor
+    (que lê todas as linhas da tabela pelo índice).
+    Varreduras completas de um índice cobridor não são consideradas.
+    """
+    aliases = _ledger_aliases(sql, tables)
+    scans = []
+    for detail in explain(db, sql, params):
+        match = re.match(r"SCAN (\w+)(.*)", detail)
+        if not match or match.group(1) not in aliases:
+            continue
+        if "COVERING INDEX" in match.group(2):
+            continue
+        scans.append(detail)
+    return scans
+
+
+def assert_no_full_scan(db, sql, params=(), tables=LEDGER_TABLES):
+    """Lança FullScanError se a consulta varrer alguma tabela do razão."""
+    scans = find_full_scans(db, sql, params, tables)
+    if scans:
+        raise FullScanError(f"Varredura completa do razão em:\n{sql.strip()}\nPlano: {'; '.join(scans)}")
+
+
+class QueryRecorder:
+    """
+    Grava, com os parâmetros já substituídos, todos os comandos executados
+    na conexão enquanto o bloco `with` estiver ativo.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+
+    def _trace(self, statement):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.db.conn.set_trace_callback(self._trace)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.db.conn.set_trace_callback(None)
+        return False
+
+
+def check_statements(db, statements, tables=LEDGER_TABLES, allowed=()):
+    """
+    Verifica o plano de cada comando distinto gravado.
+    `allowed` é uma lista de trechos de SQL cuja varredura é conhecida e aceita.
+    Retorna uma lista de (sql, linhas_do_plano) com as varreduras encontradas.
+    """
+    problems = []
+    seen = set()
+    for statement in statements:
+        sql = statement.strip()
+        if sql in seen or not sql.lower().startswith(_CHECKED_PREFIXES):
+            continue
+        seen.add(sql)
+        if any(fragment in sql for fragment in allowed):
+            continue
+        scans = find_full_scans(db, sql, tables=tables)
+        if scans:
+            problems.append((sql, scans))
+    return problems
@@ -0,0 +1,537 @@
+# src/interfaces/api.py
+"""
+Servidor HTTP/JSON local (api.py na raiz do projeto) para outros sistemas
+lançarem transações e consultarem saldos e relatórios sem o menu interativo.
+
+O laço de eventos (asyncio) só cuida das conexões HTTP; as chamadas ao
+SQLite, que bloqueiam, rodam em threads (ver DatabaseWorkers):
+  * leituras em um conjunto limitado de API_READ_THREADS threads, cada uma
+    com a sua conexão somente leitura (em WAL, leem enquanto há escrita);
+  * escritas em uma única thread com a conexão de escrita, já que o SQLite
+    aceita um escritor por vez.
+
+Lançamentos recebidos ao mesmo tempo são agrupados (ver PostingBatcher):
+enquanto a thread de escrita grava um grupo, os POSTs seguintes se acumulam
+e vão juntos no próximo COMMIT. Cada requisição continua tudo-ou-nada: com
+algum lançamento inválido, nenhum lançamento dela é gravado, e os pedidos
+dos outros clientes no mesmo grupo não são afetados. A resposta só sai
+depois do COMMIT. Até API_SNAPSHOT_DELAY segundos depois de uma gravação,
+a thread de escrita recria os snapshots de saldo apagados por lançamentos
+retroativos; as leituras não esperam por ela e, enquanto isso, partem do
+snapshot anterior.
+
+Rotas (corpo e respostas em JSON, valores monetários em texto: "1500.00"):
+    GET  /accounts                      contas com o saldo corrente
+    GET  /accounts/{id}
+    GET  /transactions                  ?inicio=&fim=&conta=&limite=&apos= (página por cursor)
+    GET  /transactions/{id}
+    POST /transactions                  um lançamento ou uma lista (ver import_service.JOURNAL_COLUMNS)
+    GET  /templates
+    GET  /templates/{id}
+    POST /templates/{id}/run            {"data": "AAAA-MM-DD"} ou {"datas": [...]}
+    GET  /fiscal-periods
+    GET  /reports/drp                   ?periodo= ou ?inicio=&fim=
+    GET  /reports/balance               ?periodo= ou ?data=[&inicio=]
+
+Uso:
+    python api.py
+    python api.py --porta 8080 --leitores 8 --banco data/financas.db
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings import (API_HOST, API_MAX_BODY, API_PORT, API_POST_BATCH, API_READ_THREADS,
+                             API_SNAPSHOT_DELAY, DATABASE_PATH, DATABASE_PROFILE, PRAGMA_PROFILES)
+from src.database.connection import Database
+from src.interfaces import consultas
+
+
+class HTTPError(Exception):
+    def __init__(self, status, mensagem, **extra):
+        super().__init__(mensagem)
+        self.status = status
+        self.dados = {"erro": mensagem, **extra}
+
+
+class DatabaseWorkers:
+    """
+    Threads que executam as chamadas ao banco. `ler(funcao, ...)` e
+    `gravar(funcao, ...)` chamam funcao(db, ...) em uma thread de leitura ou
+    na thread de escrita, com a conexão da própria thread, sem bloquear o laço
+    de eventos.
+    """
+
+    def __init__(self, db_file, leitores=API_READ_THREADS, profile=None):
+        self.db_file = db_file
+        self.profile = profile
+        self._local = threading.local()
+        self._conexoes = []
+        self._lock = threading.Lock()
+        self.escrita = ThreadPoolExecutor(1, "api-escrita", self._conectar, (False,))
+        self.leitura = ThreadPoolExecutor(leitores, "api-leitura", self._conectar, (True,))
+
+    def _conectar(self, read_only):
+        db = Database(self.db_file, read_only=read_only, profile=self.profile)
+        if db.connect() is None:
+            raise RuntimeError(f"não foi possível abrir o banco {self.db_file}")
+        self._local.db = db
+        with self._lock:
+            self._conexoes.append(db)
+
+    def _chamar(self, funcao, args):
+        return funcao(self._local.db, *args)
+
+    async def iniciar(self):
+        # A conexão de escrita cria o arquivo e migra o schema antes de qualquer leitura
+        await self.gravar(lambda db: None)
+
+    async def ler(self, funcao, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.leitura, self._chamar, funcao, args)
+
+    async def gravar(self, funcao, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.escrita, self._chamar, funcao, args)
+
+    def agendar(self, funcao, *args):
+        """Enfileira funcao(db, ...) na thread de escrita sem esperar o resultado; erros vão para stderr."""
+        def registrar_erro(futuro):
+            if not futuro.cancelled() and futuro.exception() is not None:
+                print(f"Erro em {funcao.__name__}: {futuro.exception()!r}", file=sys.stderr)
+        self.escrita.submit(self._chamar, funcao, args).add_done_callback(registrar_erro)
+
+    def fechar(self):
+        self.leitura.shutdown(wait=True)
+        self.escrita.shutdown(wait=True)
+        with self._lock:
+            for db in self._conexoes:
+                db.close()
+            self._conexoes = []
+
+
+# Falhas na gravação causadas pelos dados do pedido (respondidas com 422); as demais são erro interno
+_ERROS_DE_DADOS = (ValueError, OverflowError, sqlite3.IntegrityError, sqlite3.DataError)
+
+
+def _gravar_pedidos(db, pedidos):
+    """
+    Valida os lançamentos de cada pedido (lista de JournalLine) e grava os
+    pedidos válidos com um executemany em uma única unidade de trabalho. Se a
+    gravação do grupo falhar, cada pedido é gravado na sua própria unidade de
+    trabalho, para que só o pedido com problema seja recusado.
+    Retorna, para cada pedido, o número de lançamentos gravados, a lista de
+    erros ou a exceção de uma falha que não vem dos dados.
+    """
+    from src.services.import_service import SQL_INSERT, ImportService
+    validar = ImportService(db).validador_de_lancamentos()
+    resultados, validos = [], {}
+    for numero, linhas in enumerate(pedidos):
+        erros, parametros = [], []
+        for linha in linhas:
+            try:
+                parametros.append(validar(linha))
+            except ValueError as e:
+                erros.append({"linha": linha.line, "motivo": str(e)})
+        if erros:
+            resultados.append(erros)
+        else:
+            validos[numero] = parametros
+            resultados.append(len(parametros))
+    if not validos:
+        return resultados
+    try:
+        with db.transaction():
+            db.executemany(SQL_INSERT, [parametro for parametros in validos.values() for parametro in parametros])
+        return resultados
+    except Exception:
+        pass
+    for numero, parametros in validos.items():
+        try:
+            with db.transaction():
+                db.executemany(SQL_INSERT, parametros)
+        except _ERROS_DE_DADOS as e:
+            resultados[numero] = [{"linha": None, "motivo": str(e)}]
+        except Exception as e:
+            resultados[numero] = e
+    return resultados
+
+
+class PostingBatcher:
+    """
+    Agrupa os POSTs de lançamentos em COMMITs de até `lote` lançamentos: um
+    único consumidor leva à thread de escrita todos os pedidos que chegaram
+    enquanto o grupo anterior era gravado. Um pedido maior que `lote` vai
+    sozinho, inteiro.
+    """
+
+    def __init__(self, workers, lote=API_POST_BATCH, ao_gravar=None):
+        self.workers = workers
+        self.lote = lote
+        self.ao_gravar = ao_gravar
+        self.fila = asyncio.Queue()
+        self.grupos = 0
+        self.pedidos = 0
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.create_task(self._consumir())
+
+    async def lancar(self, linhas):
+        """Grava os lançamentos do pedido; retorna o total gravado ou a lista de erros."""
+        futuro = asyncio.get_running_loop().create_future()
+        await self.fila.put((linhas, futuro))
+        return await futuro
+
+    async def _consumir(self):
+        proximo = None
+        while True:
+            pedidos = [proximo or await self.fila.get()]
+            proximo = None
+            total = len(pedidos[0][0])
+            while not self.fila.empty():
+                pedido = self.fila.get_nowait()
+                if total + len(pedido[0]) > self.lote:
+                    # Não cabe neste COMMIT: abre o próximo grupo
+                    proximo = pedido
+                    break
+                pedidos.append(pedido)
+                total += len(pedido[0])
+            try:
+                resultados = await self.workers.gravar(_gravar_pedidos, [linhas for linhas, _ in pedidos])
+            except Exception as e:
+                for _, futuro in pedidos:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            self.grupos += 1
+            self.pedidos += len(pedidos)
+            for (_, futuro), resultado in zip(pedidos, resultados):
+                if futuro.done():
+                    continue
+                if isinstance(resultado, Exception):
+                    futuro.set_exception(resultado)
+                else:
+                    futuro.set_result(resultado)
+            if self.ao_gravar and any(isinstance(resultado, int) for resultado in resultados):
+                self.ao_gravar()
+
+    async def fechar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+
+
+def _inteiro(parametros, nome, padrao=None, minimo=None, maximo=consultas.MAX_ID):
+    valor = parametros.get(nome, padrao)
+    if valor is None or isinstance(valor, int):
+        return valor
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um número inteiro")
+    # Sem limite explícito, o do INTEGER do SQLite (acima dele o sqlite3 lança OverflowError)
+    if not (-consultas.MAX_ID if minimo is None else minimo) <= numero <= maximo:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{nome}' fora do intervalo permitido")
+    return numero
+
+
+def _transacao(db, transacao_id):
+    from src.core.transactions import TransactionManager
+    t = TransactionManager(db).get_transaction(transacao_id)
+    if t is None:
+        return None
+    return {"id": t.id, "data": t.date, "descricao": t.description, "debito": t.debit_account,
+            "credito": t.credit_account, "valor": t.amount}
+
+
+def _modelos(db):
+    from src.core.templates import TemplateManager
+    return [consultas.modelo(template) for template in TemplateManager(db).get_templates()]
+
+
+def _modelo(db, template_id):
+    from src.core.templates import TemplateManager
+    template = TemplateManager(db).get_template(template_id)
+    return consultas.modelo(template) if template else None
+
+
+def _executar_modelo(db, template_id, datas):
+    """Lança o modelo nas datas em uma unidade de trabalho; None se o modelo não existir."""
+    from src.core.templates import TemplateEngine
+    engine = TemplateEngine(db)
+    template = engine.load([template_id]).get(template_id)
+    if template is None:
+        return None
+    return engine.execute(engine.runs_for_dates(template, datas))
+
+
+class APIServer:
+    def __init__(self, db_file=DATABASE_PATH, profile=None, leitores=API_READ_THREADS, lote=API_POST_BATCH):
+        self.db_file = db_file
+        self.workers = DatabaseWorkers(db_file, leitores, profile)
+        self.batcher = None
+        self.lote = lote
+        self._snapshots_agendados = False
+        self._agendamento = None
+        self.rotas = [
+            ("GET", r"/accounts", self.contas),
+            ("GET", r"/accounts/(\d+)", self.conta),
+            ("GET", r"/transactions", self.transacoes),
+            ("POST", r"/transactions", self.lancar),
+            ("GET", r"/transactions/(\d+)", self.transacao),
+            ("GET", r"/templates", self.modelos),
+            ("GET", r"/templates/(\d+)", self.modelo),
+            ("POST", r"/templates/(\d+)/run", self.executar_modelo),
+            ("GET", r"/fiscal-periods", self.periodos),
+            ("GET", r"/reports/drp", self.drp),
+            ("GET", r"/reports/balance", self.balanco),
+        ]
+        self.rotas = [(metodo, re.compile(padrao + "$"), funcao) for metodo, padrao, funcao in self.rotas]
+
+    def _gravou(self):
+        # Snapshots apagados por lançamentos retroativos são refeitos na thread de escrita uma vez por
+        # intervalo, e não a cada grupo: em uma carga retroativa, cada grupo apagaria o snapshot refeito
+        if not self._snapshots_agendados:
+            self._snapshots_agendados = True
+            self._agendamento = asyncio.get_running_loop().call_later(
+                API_SNAPSHOT_DELAY, self.workers.agendar, self._atualizar_snapshots)
+        # Como nas ações do menu, escritas no banco principal agendam um backup
+        if os.path.abspath(self.db_file) == os.path.abspath(DATABASE_PATH):
+            from src.utils.backup import schedule_backup
+            schedule_backup()
+
+    def _atualizar_snapshots(self, db):
+        from src.core.balance_snapshots import BalanceSnapshots
+        self._snapshots_agendados = False
+        self._agendamento = None
+        BalanceSnapshots(db).refresh()
+
+    async def iniciar(self, host=API_HOST, porta=API_PORT):
+        await self.workers.iniciar()
+        # Snapshots dos períodos encerrados desde a última execução
+        await self.workers.gravar(self._atualizar_snapshots)
+        self.batcher = PostingBatcher(self.workers, self.lote, self._gravou)
+        self.batcher.iniciar()
+        return await asyncio.start_server(self._conexao, host, porta)
+
+    async def fechar(self):
+        if self.batcher:
+            await self.batcher.fechar()
+        if self._agendamento:
+            self._agendamento.cancel()
+        self.workers.fechar()
+
+    # --- Rotas -------------------------------------------------------------
+
+    async def contas(self, parametros, corpo):
+        return await self.workers.ler(consultas.contas)
+
+    async def conta(self, parametros, corpo, conta_id):
+        contas = await self.workers.ler(consultas.contas, int(conta_id))
+        return contas[0] if contas else None
+
+    async def transacoes(self, parametros, corpo):
+        return await self.workers.ler(
+            consultas.transacoes, parametros.get("inicio"), parametros.get("fim"),
+            _inteiro(parametros, "conta"), _inteiro(parametros, "limite", 50, 1, 1000), parametros.get("apos"))
+
+    async def transacao(self, parametros, corpo, transacao_id):
+        return await self.workers.ler(_transacao, int(transacao_id))
+
+    async def lancar(self, parametros, corpo):
+        from src.services.import_service import lancamento_de_objeto
+        dados = _json(corpo)
+        objetos = dados if isinstance(dados, list) else [dados]
+        if not objetos:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "nenhum lançamento informado")
+        resultado = await self.batcher.lancar([lancamento_de_objeto(i, o) for i, o in enumerate(objetos, 1)])
+        if isinstance(resultado, list):
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, "lançamentos inválidos; nada foi gravado", erros=resultado)
+        return HTTPStatus.CREATED, {"lancados": resultado}
+
+    async def modelos(self, parametros, corpo):
+        return await self.workers.ler(_modelos)
+
+    async def modelo(self, parametros, corpo, template_id):
+        return await self.workers.ler(_modelo, int(template_id))
+
+    async def executar_modelo(self, parametros, corpo, template_id):
+        from src.core.templates import TemplateExecutionError
+        dados = _json(corpo) if corpo else {}
+        if not isinstance(dados, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'informe {"data": ...} ou {"datas": [...]}')
+        datas = dados.get("datas") or [dados.get("data")]
+        if not isinstance(datas, list) or not all(isinstance(data, str) for data in datas):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'informe {"data": "AAAA-MM-DD"} ou {"datas": [...]}')
+        try:
+            lancados = await self.workers.gravar(_executar_modelo, int(template_id), datas)
+        except TemplateExecutionError as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, "modelo não lançado", erros=e.problemas)
+        if lancados is None:
+            return None
+        self._gravou()
+        return HTTPStatus.CREATED, {"lancados": lancados}
+
+    async def periodos(self, parametros, corpo):
+        return await self.workers.ler(consultas.periodos)
+
+    async def drp(self, parametros, corpo):
+        return await self.workers.ler(consultas.demonstracao, _inteiro(parametros, "periodo"),
+                                      parametros.get("inicio"), parametros.get("fim"))
+
+    async def balanco(self, parametros, corpo):
+        return await self.workers.ler(consultas.balanco, _inteiro(parametros, "periodo"),
+                                      parametros.get("data"), parametros.get("inicio"))
+
+    # --- HTTP --------------------------------------------------------------
+
+    async def despachar(self, metodo, alvo, corpo):
+        """Executa a rota e retorna (status, dados)."""
+        url = urlsplit(alvo)
+        parametros = {nome: valores[-1] for nome, valores in parse_qs(url.query).items()}
+        caminho = url.path.rstrip("/") or "/"
+        metodos = []
+        for metodo_rota, padrao, funcao in self.rotas:
+            encontrado = padrao.match(caminho)
+            if not encontrado:
+                continue
+            metodos.append(metodo_rota)
+            if metodo_rota != metodo:
+                continue
+            if any(int(grupo) > consultas.MAX_ID for grupo in encontrado.groups()):
+                # Os ids das rotas são (\d+): acima do maior INTEGER do SQLite, não há registro
+                return HTTPStatus.NOT_FOUND, {"erro": "não encontrado"}
+            try:
+                resposta = await funcao(parametros, corpo, *encontrado.groups())
+            except HTTPError as e:
+                return e.status, e.dados
+            except ValueError as e:
+                # QueryParameterError, datas inválidas etc.
+                return HTTPStatus.BAD_REQUEST, {"erro": str(e)}
+            if resposta is None:
+                return HTTPStatus.NOT_FOUND, {"erro": "não encontrado"}
+            if isinstance(resposta, tuple):
+                return resposta
+            return HTTPStatus.OK, resposta
+        if metodos:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"erro": f"use {', '.join(metodos)}"}
+        return HTTPStatus.NOT_FOUND, {"erro": "rota não encontrada"}
+
+    async def _conexao(self, leitor, escritor):
+        """Atende uma conexão HTTP/1.1 (keep-alive) até o cliente fechá-la."""
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, alvo, versao = linha.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST, {"erro": "requisição inválida"}, False)
+                    break
+                cabecalhos = {}
+                while True:
+                    cabecalho = await leitor.readline()
+                    if cabecalho in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = cabecalho.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                conexao = cabecalhos.get("connection", "").lower()
+                manter = conexao == "keep-alive" if versao == "HTTP/1.0" else conexao != "close"
+
+                if "transfer-encoding" in cabecalhos:
+                    await self._responder(escritor, HTTPStatus.NOT_IMPLEMENTED,
+                                          {"erro": "envie o corpo com Content-Length"}, False)
+                    break
+                try:
+                    tamanho = int(cabecalhos.get("content-length", 0))
+                except ValueError:
+                    tamanho = -1
+                if not 0 <= tamanho <= API_MAX_BODY:
+                    await self._responder(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                          {"erro": f"corpo acima de {API_MAX_BODY} bytes"}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                try:
+                    status, dados = await self.despachar(metodo, alvo, corpo)
+                except Exception as e:
+                    print(f"Erro em {metodo} {alvo}: {e!r}", file=sys.stderr)
+                    status, dados = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "erro interno"}
+                await self._responder(escritor, status, dados, manter)
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, status, dados, manter):
+        corpo = json.dumps(dados, default=consultas.json_padrao, ensure_ascii=False).encode("utf-8")
+        cabecalho = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+        )
+        escritor.write(cabecalho.encode("latin-1") + corpo)
+        await escritor.drain()
+
+
+def _json(corpo):
+    try:
+        return json.loads(corpo)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}")
+
+
+async def servir(args):
+    servidor_api = APIServer(args.banco, args.perfil, args.leitores, args.lote)
+    servidor = await servidor_api.iniciar(args.host, args.porta)
+    host, porta = servidor.sockets[0].getsockname()[:2]
+    print(f"API em http://{host}:{porta} (banco {args.banco}, {args.leitores} threads de leitura)", flush=True)
+
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sinal, parar.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C chega como KeyboardInterrupt
+    try:
+        async with servidor:
+            await parar.wait()
+    finally:
+        servidor.close()
+        await servidor_api.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="api.py", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--banco", default=DATABASE_PATH, help=f"arquivo do banco (padrão: {DATABASE_PATH})")
+    parser.add_argument("--perfil", default=DATABASE_PROFILE, choices=list(PRAGMA_PROFILES),
+                        help=f"perfil de PRAGMAs do SQLite (padrão: {DATABASE_PROFILE})")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--porta", type=int, default=API_PORT, help="0 escolhe uma porta livre")
+    parser.add_argument("--leitores", type=int, default=API_READ_THREADS, help="threads (e conexões) de leitura")
+    parser.add_argument("--lote", type=int, default=API_POST_BATCH, help="máximo de lançamentos por COMMIT")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        from src.utils.backup import shutdown_backup_scheduler
+        shutdown_backup_scheduler()
+    return 0
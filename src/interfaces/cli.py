@@ -0,0 +1,271 @@
+# src/interfaces/cli.py
+"""
+Interface de linha de comando não interativa (cli.py na raiz do projeto).
+
+Cada subcomando executa uma operação em lote com a mesma lógica dos serviços
+do menu, mas sem prompts: a entrada vem de arquivos (CSV/JSON) e o resultado
+sai em JSON (ou CSV, nos relatórios) na saída padrão ou em --saida. Mensagens
+de erro vão para a saída de erro.
+
+Códigos de saída: 0 quando tudo foi feito; 1 em erro ou quando parte da
+operação ficou de fora (lançamentos rejeitados, modelos recusados, ativos sem
+contas de depreciação); 2 em argumentos inválidos.
+
+Uso:
+    python cli.py post lancamentos.csv
+    python cli.py --perfil bulk-load post - --formato jsonl < lancamentos.jsonl
+    python cli.py import extrato.ofx --conta "Conta Corrente"
+    python cli.py report drp --periodo 3 --formato csv --saida drp.csv
+    python cli.py report balance --data 2024-12-31 --inicio 2024-01-01
+    python cli.py depreciate --periodo 3
+    python cli.py templates --ate 2024-12-31
+    python cli.py backup
+    python cli.py vacuum
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+from config.settings import DATABASE_PATH, DATABASE_PROFILE, IMPORT_CHUNK_SIZE, IMPORT_RULES_PATH, PRAGMA_PROFILES
+from src.database.connection import Database
+from src.interfaces.consultas import SECOES_BALANCO, balanco, data_iso, demonstracao, json_padrao, periodo_fiscal
+
+
+class _Desfeito(Exception):
+    """Interrompe a unidade de trabalho de um `post --tudo-ou-nada` com rejeições."""
+
+
+@contextmanager
+def _saida(caminho):
+    if caminho in (None, "-"):
+        yield sys.stdout
+    else:
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            yield arquivo
+
+
+def escrever_json(dados, caminho=None):
+    with _saida(caminho) as arquivo:
+        json.dump(dados, arquivo, default=json_padrao, ensure_ascii=False, indent=2)
+        arquivo.write("\n")
+
+
+def escrever_csv(cabecalho, linhas, caminho=None):
+    with _saida(caminho) as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";", lineterminator="\n")
+        escritor.writerow(cabecalho)
+        escritor.writerows(linhas)
+
+
+def _resumo_importacao(resultado):
+    return {
+        "lidas": resultado.lidas,
+        "importadas": resultado.importadas,
+        "rejeitadas": resultado.rejeitadas,
+        "erros": [{"linha": linha, "motivo": motivo} for linha, motivo in resultado.erros],
+        "segundos": round(resultado.segundos, 3),
+    }
+
+
+def cmd_post(db, args):
+    from src.services.import_service import ImportService, ler_lancamentos
+    servico = ImportService(db)
+    linhas = ler_lancamentos(args.arquivo, args.formato)
+    if not args.tudo_ou_nada:
+        resultado = servico.lancar(linhas, args.bloco)
+        escrever_json(_resumo_importacao(resultado), args.saida)
+        return 1 if resultado.rejeitadas else 0
+
+    # Os blocos viram SAVEPOINTs dentro de uma única unidade de trabalho
+    resultado = None
+    try:
+        with db.transaction():
+            resultado = servico.lancar(linhas, args.bloco)
+            if resultado.rejeitadas:
+                raise _Desfeito()
+    except _Desfeito:
+        resultado.importadas = 0
+    resumo = _resumo_importacao(resultado)
+    resumo["desfeito"] = bool(resultado.rejeitadas)
+    escrever_json(resumo, args.saida)
+    return 1 if resultado.rejeitadas else 0
+
+
+def cmd_import(db, args):
+    from src.services.import_service import ImportRules, ImportService, ler_extrato
+    servico = ImportService(db)
+    conta_extrato = servico.buscar_conta(args.conta)
+    regras = ImportRules.from_file(db, args.regras)
+    resultado = servico.importar(ler_extrato(args.arquivo), conta_extrato, regras, args.bloco)
+    escrever_json(_resumo_importacao(resultado), args.saida)
+    return 1 if resultado.rejeitadas else 0
+
+
+def cmd_report_drp(db, args):
+    drp = demonstracao(db, args.periodo, args.inicio, args.fim)
+    if args.formato == "csv":
+        escrever_csv(
+            ["grupo", "conta_id", "conta", "debito", "credito", "saldo"],
+            [[grupo, c["id"], c["conta"], c["debito"], c["credito"], c["saldo"]]
+             for grupo, chave in (("receita", "receitas"), ("despesa", "despesas")) for c in drp[chave]],
+            args.saida,
+        )
+    else:
+        escrever_json(drp, args.saida)
+    return 0
+
+
+def cmd_report_balance(db, args):
+    dados = balanco(db, args.periodo, args.data, args.inicio)
+    if args.formato == "csv":
+        linhas = [[secao, c["id"], c["conta"], c["saldo"]] for secao in SECOES_BALANCO for c in dados[secao]]
+        linhas += [[chave, "", "", dados[chave]] for chave in ("lucro_drp", "total_ativos", "total_passivos_patrimonio")]
+        escrever_csv(["secao", "conta_id", "conta", "saldo"], linhas, args.saida)
+    else:
+        escrever_json(dados, args.saida)
+    return 0
+
+
+def cmd_depreciate(db, args):
+    from src.core.depreciation import DepreciationPosting
+    # Período inexistente (ou id fora da faixa do SQLite) sai como erro, código 1
+    periodo_fiscal(db, args.periodo)
+    lancamento = DepreciationPosting(db)
+    resultado = lancamento.preparar(args.periodo) if args.simular else lancamento.executar(args.periodo)
+    escrever_json({
+        "periodo": resultado.periodo_id,
+        "inicio": resultado.inicio,
+        "fim": resultado.fim,
+        "simulacao": args.simular,
+        "lancados": len(resultado.lancados),
+        "total": resultado.total(),
+        "ja_lancados": resultado.ja_lancados,
+        "sem_depreciacao": resultado.sem_depreciacao,
+        "sem_contas": [{"id": linha.id, "ativo": linha.name, "depreciacao": linha.depreciacao}
+                       for linha in resultado.sem_contas],
+    }, args.saida)
+    return 1 if resultado.sem_contas else 0
+
+
+def cmd_templates(db, args):
+    from src.core.template_scheduler import TemplateScheduler
+    # Sem validar, uma data fora do formato (ex.: "zzz") ficaria depois de qualquer ocorrência
+    ate = data_iso(args.ate, "--ate") if args.ate else None
+    resultado = TemplateScheduler(db).executar(ate)
+    escrever_json({
+        "ocorrencias": resultado.ocorrencias,
+        "transacoes": resultado.transacoes,
+        "recusados": resultado.recusados,
+    }, args.saida)
+    return 1 if resultado.recusados else 0
+
+
+def cmd_backup(db, args):
+    from src.utils.backup import BACKUP_DIR, create_backup
+    arquivo = create_backup(db.db_file, args.destino or BACKUP_DIR, verbose=False)
+    escrever_json({"arquivo": arquivo, "bytes": os.path.getsize(arquivo)}, args.saida)
+    return 0
+
+
+def cmd_vacuum(db, args):
+    from src.core.transactions import TransactionManager
+    antes = os.path.getsize(db.db_file)
+    # Índice de busca em dia e compactado antes da reconstrução do arquivo
+    TransactionManager(db).sync_search_index()
+    db.conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('optimize')")
+    db.conn.execute("VACUUM")
+    db.conn.execute("ANALYZE")
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    escrever_json({"bytes_antes": antes, "bytes_depois": os.path.getsize(db.db_file)}, args.saida)
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description=__doc__.split("\n\n")[0].strip(),
+        epilog="Códigos de saída: 0 sucesso; 1 erro ou operação parcial; 2 argumentos inválidos.",
+    )
+    parser.add_argument("--banco", default=DATABASE_PATH, help=f"arquivo do banco (padrão: {DATABASE_PATH})")
+    parser.add_argument("--perfil", default=DATABASE_PROFILE, choices=list(PRAGMA_PROFILES),
+                        help=f"perfil de PRAGMAs do SQLite (padrão: {DATABASE_PROFILE})")
+    comandos = parser.add_subparsers(dest="comando", metavar="COMANDO", required=True)
+
+    def comando(nome, funcao, ajuda, destino=comandos):
+        sub = destino.add_parser(nome, help=ajuda, description=ajuda)
+        sub.set_defaults(funcao=funcao)
+        sub.add_argument("--saida", help="arquivo de saída (padrão: saída padrão)")
+        return sub
+
+    sub = comando("post", cmd_post, "lança transações de um arquivo CSV, JSON ou JSON Lines")
+    sub.add_argument("arquivo", help='arquivo de lançamentos ("-" para a entrada padrão)')
+    sub.add_argument("--formato", choices=("csv", "json", "jsonl"), help="padrão: pela extensão do arquivo")
+    sub.add_argument("--bloco", type=int, default=IMPORT_CHUNK_SIZE, help="lançamentos por COMMIT")
+    sub.add_argument("--tudo-ou-nada", action="store_true",
+                     help="grava tudo em uma unidade de trabalho e desfaz se algum lançamento for rejeitado")
+
+    sub = comando("import", cmd_import, "importa um extrato bancário (CSV/OFX) com as regras de importação")
+    sub.add_argument("arquivo")
+    sub.add_argument("--conta", required=True, help="conta do extrato (ID ou nome)")
+    sub.add_argument("--regras", default=IMPORT_RULES_PATH, help=f"arquivo de regras (padrão: {IMPORT_RULES_PATH})")
+    sub.add_argument("--bloco", type=int, default=IMPORT_CHUNK_SIZE, help="lançamentos por COMMIT")
+
+    relatorios = comandos.add_parser("report", help="relatórios (drp, balance)").add_subparsers(
+        dest="relatorio", metavar="RELATORIO", required=True)
+    sub = comando("drp", cmd_report_drp, "demonstração do resultado do período", relatorios)
+    sub.add_argument("--periodo", type=int, help="ID do período fiscal")
+    sub.add_argument("--inicio", help="data inicial (AAAA-MM-DD), sem --periodo")
+    sub.add_argument("--fim", help="data final (AAAA-MM-DD), sem --periodo")
+    sub.add_argument("--formato", choices=("json", "csv"), default="json")
+    sub = comando("balance", cmd_report_balance, "balanço patrimonial", relatorios)
+    sub.add_argument("--periodo", type=int, help="ID do período fiscal (balanço na data final, com o lucro do período)")
+    sub.add_argument("--data", help="data do balanço (AAAA-MM-DD), sem --periodo")
+    sub.add_argument("--inicio", help="início do resultado somado ao patrimônio, com --data (padrão: sem resultado)")
+    sub.add_argument("--formato", choices=("json", "csv"), default="json")
+
+    sub = comando("depreciate", cmd_depreciate, "lança a depreciação de todos os ativos no período fiscal")
+    sub.add_argument("--periodo", type=int, required=True, help="ID do período fiscal")
+    sub.add_argument("--simular", action="store_true", help="apenas calcula, sem lançar")
+
+    sub = comando("templates", cmd_templates, "lança as ocorrências pendentes dos modelos recorrentes")
+    sub.add_argument("--ate", help="data de referência (AAAA-MM-DD, padrão: hoje)")
+
+    sub = comando("backup", cmd_backup, "cria um backup do banco")
+    sub.add_argument("--destino", help="pasta dos backups (padrão: data/backups)")
+
+    comando("vacuum", cmd_vacuum, "compacta o banco e atualiza as estatísticas do planejador")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    db = Database(args.banco, profile=args.perfil)
+    try:
+        conectado = db.connect()
+    except sqlite3.Error as e:
+        # Migração que falhou ou SQLite sem os requisitos (ver migrations.verificar_sqlite)
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    if conectado is None:
+        print(f"Erro: não foi possível abrir o banco {args.banco}", file=sys.stderr)
+        return 1
+    # Linhas alteradas pela migração do schema não contam como escrita do comando
+    alteracoes = db.conn.total_changes
+    try:
+        codigo = args.funcao(db, args)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        # StatementImportError, QueryParameterError e o período inexistente da depreciação são ValueError
+        print(f"Erro: {e}", file=sys.stderr)
+        codigo = 1
+    finally:
+        gravou = db.conn.total_changes > alteracoes
+        db.close()
+    if gravou and os.path.abspath(args.banco) == os.path.abspath(DATABASE_PATH):
+        # Como nas ações do menu, toda escrita no banco principal gera um backup (feito antes de sair)
+        from src.utils.backup import schedule_backup, shutdown_backup_scheduler
+        schedule_backup()
+        shutdown_backup_scheduler()
+    return codigo
@@ -0,0 +1,165 @@
+# src/interfaces/consultas.py
+"""
+Consultas das interfaces não interativas (cli.py e o servidor HTTP de
+api.py), com resultados em dicionários e listas prontos para JSON. Os valores
+monetários ficam em Decimal; json_padrao os converte em texto ("1500.00").
+"""
+from datetime import datetime
+from decimal import Decimal
+
+# Maior id que cabe em um INTEGER do SQLite; acima disso o sqlite3 lança OverflowError
+MAX_ID = 2 ** 63 - 1
+
+
+class QueryParameterError(ValueError):
+    """Parâmetros de consulta inválidos ou registro inexistente (ex.: período fiscal)."""
+
+
+def data_iso(texto, nome="data"):
+    """`texto` como data AAAA-MM-DD (normalizada: "2024-1-5" vira "2024-01-05"); QueryParameterError se inválida."""
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d").date().isoformat()
+    except (TypeError, ValueError):
+        raise QueryParameterError(f"{nome} inválida: {texto!r} (use AAAA-MM-DD)")
+
+
+def _intervalo(inicio, fim):
+    inicio, fim = data_iso(inicio, "data inicial"), data_iso(fim, "data final")
+    if inicio > fim:
+        raise QueryParameterError(f"data inicial {inicio} posterior à data final {fim}")
+    return inicio, fim
+
+
+def json_padrao(valor):
+    """`default` do json.dump: Decimal vira texto, sem perder centavos."""
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"{type(valor).__name__} não serializável em JSON")
+
+
+def periodo_fiscal(db, periodo_id):
+    """(start_date, end_date) do período fiscal; QueryParameterError se não existir."""
+    if not 0 < periodo_id <= MAX_ID:
+        raise QueryParameterError(f"período fiscal {periodo_id} não encontrado")
+    periodo = db.execute("SELECT start_date, end_date FROM fiscal_periods WHERE id = ?", (periodo_id,)).fetchone()
+    if not periodo:
+        raise QueryParameterError(f"período fiscal {periodo_id} não encontrado")
+    return periodo[0], periodo[1]
+
+
+def periodos(db):
+    sql = "SELECT id, start_date, end_date, interval_days FROM fiscal_periods ORDER BY start_date DESC"
+    return [{"id": p[0], "inicio": p[1], "fim": p[2], "intervalo_dias": p[3]} for p in db.execute(sql).fetchall()]
+
+
+def contas(db, conta_id=None):
+    """Contas com o saldo corrente (accounts.balance, mantido pelos gatilhos), por nome."""
+    sql = """
+    SELECT id, name, type, specific_type, specific_subtype, category_id, balance
+    FROM accounts
+    {filtro}
+    ORDER BY name
+    """
+    if conta_id is None:
+        linhas = db.execute(sql.format(filtro="")).fetchall()
+    elif not 0 < conta_id <= MAX_ID:
+        return []
+    else:
+        linhas = db.execute(sql.format(filtro="WHERE id = ?"), (conta_id,)).fetchall()
+    return [{"id": c[0], "nome": c[1], "tipo": c[2], "tipo_especifico": c[3], "subtipo": c[4],
+             "categoria_id": c[5], "saldo": c[6]} for c in linhas]
+
+
+def transacoes(db, inicio=None, fim=None, conta_id=None, limite=50, apos=None):
+    """
+    Uma página do razão em ordem de (data, id), com os filtros de
+    TransactionManager.iter_transactions. `apos` é o cursor "data,id" devolvido
+    em "proximo" pela página anterior (None na última página).
+    """
+    from src.core.transactions import TransactionManager
+    inicio = data_iso(inicio, "data inicial") if inicio else None
+    fim = data_iso(fim, "data final") if fim else None
+    chave = None
+    if apos:
+        try:
+            data, transacao_id = apos.rsplit(",", 1)
+            chave = (data_iso(data), int(transacao_id))
+        except ValueError:
+            raise QueryParameterError(f"cursor inválido: {apos!r}")
+        if not 0 <= chave[1] <= MAX_ID:
+            raise QueryParameterError(f"cursor inválido: {apos!r}")
+    pagina = next(TransactionManager(db).iter_transactions(inicio, fim, conta_id, page_size=limite, after=chave), [])
+    proximo = f"{pagina[-1].date},{pagina[-1].id}" if len(pagina) == limite else None
+    return {
+        "transacoes": [{"id": t.id, "data": t.date, "descricao": t.description, "debito": t.debit_account,
+                        "credito": t.credit_account, "valor": t.amount} for t in pagina],
+        "proximo": proximo,
+    }
+
+
+def modelo(template):
+    return {
+        "id": template.id,
+        "nome": template.name,
+        "transacoes": [{"descricao": t.description, "debito": t.debit_account, "credito": t.credit_account,
+                        "valor": t.amount} for t in template.transactions or []],
+    }
+
+
+def demonstracao(db, periodo=None, inicio=None, fim=None):
+    """DRP do período fiscal `periodo`, ou de `inicio` a `fim` (AAAA-MM-DD)."""
+    from src.core.income_statement import IncomeStatement
+    if periodo is not None:
+        inicio, fim = periodo_fiscal(db, periodo)
+    if not inicio or not fim:
+        raise QueryParameterError("informe o período fiscal, ou as datas inicial e final")
+    inicio, fim = _intervalo(inicio, fim)
+    drp = IncomeStatement(db).calcular(inicio, fim)
+    return {
+        "inicio": drp.start_date,
+        "fim": drp.end_date,
+        "receitas": [_linha_drp(c) for c in drp.receitas],
+        "despesas": [_linha_drp(c) for c in drp.despesas],
+        "total_receitas": drp.total_receitas,
+        "total_despesas": drp.total_despesas,
+        "resultado_liquido": drp.resultado_liquido,
+        "margem_liquida": None if drp.margem_liquida is None else round(float(drp.margem_liquida), 2),
+    }
+
+
+def _linha_drp(conta):
+    return {"id": conta.id, "conta": conta.name, "debito": conta.total_debito,
+            "credito": conta.total_credito, "saldo": conta.net}
+
+
+# Seções do balanço, na ordem devolvida por BalanceSheet.calcular_saldos_na_data
+SECOES_BALANCO = ("ativos_circulantes", "ativos_fixos", "passivos_circulantes",
+                  "passivos_nao_circulantes", "patrimonio")
+
+
+def balanco(db, periodo=None, data=None, inicio=None):
+    """
+    Balanço patrimonial na data final do período fiscal `periodo`, com o lucro
+    da DRP do período somado ao patrimônio (como no menu), ou na `data`, com o
+    resultado de `inicio` até a data (sem `inicio`, sem resultado).
+    """
+    from src.core.balance_sheet import BalanceSheet
+    from src.core.income_statement import IncomeStatement
+    if periodo is not None:
+        inicio, data = periodo_fiscal(db, periodo)
+    elif not data:
+        raise QueryParameterError("informe o período fiscal ou a data do balanço")
+    if inicio:
+        inicio, data = _intervalo(inicio, data)
+    else:
+        data = data_iso(data, "data do balanço")
+    lucro = IncomeStatement(db).calcular(inicio, data).resultado_liquido if inicio else Decimal("0.00")
+    calculo = BalanceSheet(db)
+    secoes = calculo.calcular_saldos_na_data(data)
+    total_ativos, total_passivos_patrimonio = calculo.calcular_totais(*secoes, lucro)
+    dados = {"data": data, "lucro_drp": lucro}
+    for secao, linhas in zip(SECOES_BALANCO, secoes):
+        dados[secao] = [{"id": c["id"], "conta": c["name"], "saldo": c["balance"]} for c in linhas]
+    dados["total_ativos"] = total_ativos
+    dados["total_passivos_patrimonio"] = total_passivos_patrimonio
+    return dados
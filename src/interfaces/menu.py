@@ -1,28 +1,60 @@
 # src/interfaces/menu.py
-from src.database.connection import Database
-from src.services.account_service import AccountService
-from src.services.transaction_service import TransactionService
-from src.services.template_service import TemplateService
-from src.services.fiscal_period_service import FiscalPeriodService
-from src.services.report_service import ReportService
-from src.services.drp_service import DRPService
-from src.utils.backup import import_from_backup, get_backup_files
-from src.services.depreciation_service import DepreciationService
+import importlib
 import os
 
+from src.database.connection import get_database
+
+# Serviços do menu: atributo -> (módulo, classe). Cada um é importado e criado só
+# quando o primeiro menu que o usa é aberto; alguns puxam dependências pesadas
+# (numpy, rich, tabulate) que não devem pesar na abertura do programa.
+SERVICOS = {
+    'account_service': ('src.services.account_service', 'AccountService'),
+    'transaction_service': ('src.services.transaction_service', 'TransactionService'),
+    'template_service': ('src.services.template_service', 'TemplateService'),
+    'fiscal_period_service': ('src.services.fiscal_period_service', 'FiscalPeriodService'),
+    'drp_service': ('src.services.drp_service', 'DRPService'),
+    'report_service': ('src.services.report_service', 'ReportService'),
+    'depreciation_service': ('src.services.depreciation_service', 'DepreciationService'),
+    'import_service': ('src.services.import_service', 'ImportService'),
+}
+
+# Serviços consultados, em ordem, para as ações de cada menu
+SERVICOS_POR_MENU = {
+    'categorias': ('account_service',),
+    'contas': ('account_service',),
+    'periodo_exercicio': ('fiscal_period_service',),
+    'transacoes': ('transaction_service', 'template_service'),
+    'modelos': ('template_service',),
+    'relatorios': ('report_service',),
+    'ativos_depreciacao': ('depreciation_service',),
+    'backup_importacao': ('import_service',),
+}
+
 
 class MainMenu:
     def __init__(self):
-        self.db = Database()
-        self.db.connect()
         self.current_menu = 'main'
-        self.account_service = AccountService()
-        self.transaction_service = TransactionService()
-        self.template_service = TemplateService()  
-        self.fiscal_period_service = FiscalPeriodService()
-        self.drp_service = DRPService()  # Inicialize o DRPService
-        self.report_service = ReportService(self.db, self.drp_service)  # Passe o drp_service
-        self.depreciation_service = DepreciationService()
+        self._db = None
+
+    @property
+    def db(self):
+        # Uma única conexão compartilhada por todos os serviços (schema criado uma vez),
+        # aberta na primeira ação que precisa do banco
+        if self._db is None:
+            self._db = get_database()
+        return self._db
+
+    def __getattr__(self, nome):
+        if nome not in SERVICOS:
+            raise AttributeError(nome)
+        modulo, classe = SERVICOS[nome]
+        cls = getattr(importlib.import_module(modulo), classe)
+        if nome == 'report_service':
+            servico = cls(self.db, self.drp_service)
+        else:
+            servico = cls(self.db)
+        setattr(self, nome, servico)
+        return servico
 
     def draw_menu(self, items, title=None):
         print("\n" + "=" * 30)
@@ -50,6 +82,7 @@ class MainMenu:
         """Menu para backup e importação de dados."""
         menu_items = [
             {"label": "Importar Dados de Backup", "action": "importar_backup"},
+            {"label": "Importar Extrato Bancário (CSV/OFX)", "action": "importar_extrato"},
             {"label": "Voltar", "action": "main"}
         ]
         self.draw_menu(menu_items, "Menu de Backup/Importação")
@@ -83,6 +116,7 @@ class MainMenu:
             {"label": "Visualizar Contas", "action": "visualizar_contas"},
             {"label": "Atualizar Conta", "action": "atualizar_conta"},
             {"label": "Excluir Conta", "action": "excluir_conta"},
+            {"label": "Verificar Saldos", "action": "verificar_saldos"},
             {"label": "Voltar", "action": "cadastros"}
         ]
         self.draw_menu(menu_items, "Contas")
@@ -104,6 +138,10 @@ class MainMenu:
             {"label": "Visualizar Modelos", "action": "visualizar_modelos"},
             {"label": "Editar Modelo", "action": "editar_modelo"},
             {"label": "Excluir Modelo", "action": "excluir_modelo"},
+            {"label": "Modelos por Conta", "action": "modelos_por_conta"},
+            {"label": "Executar Modelos em Lote", "action": "executar_modelos_em_lote"},
+            {"label": "Recorrência de Modelo", "action": "configurar_recorrencia"},
+            {"label": "Executar Modelos Recorrentes", "action": "executar_recorrencias"},
             {"label": "Voltar", "action": "main"}
         ]
         self.draw_menu(menu_items, "Modelos")
@@ -148,6 +186,11 @@ class MainMenu:
             {"label": "Cadastrar Ativo", "action": "cadastrar_ativo"},
             {"label": "Visualizar Ativos", "action": "visualizar_ativos"},
             {"label": "Calcular Depreciação", "action": "calcular_depreciacao"},
+            {"label": "Depreciação de Todos os Ativos", "action": "calcular_depreciacao_em_lote"},
+            {"label": "Contas de Depreciação do Ativo", "action": "definir_contas_depreciacao"},
+            {"label": "Lançar Depreciação do Período", "action": "lancar_depreciacao_periodo"},
+            {"label": "Valor Contábil dos Ativos na Data", "action": "valores_contabeis_na_data"},
+            {"label": "Regenerar Cronogramas de Depreciação", "action": "regenerar_cronogramas"},
             {"label": "Voltar", "action": "main"}
         ]
         self.draw_menu(menu_items, "Ativos com Depreciação")
@@ -202,21 +245,14 @@ class MainMenu:
                         self.report_service.balanco_patrimonial(self.fiscal_period_service)
                     elif action == "importar_backup":
                         self.importar_backup()
-                    # Add specific handling for depreciation actions
-                    elif action in ["cadastrar_ativo", "visualizar_ativos", "calcular_depreciacao"]:
-                        method = getattr(self.depreciation_service, action)
-                        method()
+                    elif action == "importar_extrato":
+                        self.import_service.importar_extrato()
                     else:
-                        if hasattr(self.account_service, action):
-                            getattr(self.account_service, action)()
-                        elif hasattr(self.transaction_service, action):
-                            getattr(self.transaction_service, action)()
-                        elif hasattr(self.template_service, action):
-                            getattr(self.template_service, action)()
-                        elif hasattr(self.fiscal_period_service, action):
-                            getattr(self.fiscal_period_service, action)()
-                        elif hasattr(self.report_service, action):
-                            getattr(self.report_service, action)()
+                        for nome in SERVICOS_POR_MENU.get(self.current_menu, ()):
+                            servico = getattr(self, nome)
+                            if hasattr(servico, action):
+                                getattr(servico, action)()
+                                break
                 else:
                     print("Opção inválida. Tente novamente.")
             except ValueError:
@@ -224,6 +260,10 @@ class MainMenu:
 
     def importar_backup(self):
         """Permite ao usuário importar dados de um backup CSV."""
+        from src.database.migrations import migrate
+        from src.core.account_directory import invalidate_account_directory
+        from src.utils.backup import import_from_backup, get_backup_files
+
         print("\n=== Importar Dados de Backup ===")
         
         # Lista os arquivos de backup disponíveis
@@ -242,6 +282,9 @@ class MainMenu:
                 selected_file = backup_files[choice]
                 print(f"\nImportando dados de {os.path.basename(selected_file)}...")
                 import_from_backup(selected_file)
+                # Backups antigos podem estar em uma versão anterior do schema
+                migrate(self.db)
+                invalidate_account_directory()
             else:
                 print("Opção inválida.")
         except ValueError:
@@ -1,17 +1,18 @@
-from src.database.connection import Database
+from src.database.connection import get_database
 from src.core.accounts import AccountManager
+from src.core.account_balances import AccountBalances
+from src.core.account_directory import invalidate_account_directory
 from src.utils.validators import validate_account_type
 from src.utils.validators import normalizar_nome
 from src.utils.search_utils import select_from_list  # Import the function
 from typing import List, Optional
 from src.database.models import AccountCategory
-from src.utils.backup import create_backup
+from src.utils.backup import schedule_backup
 import sqlite3
 
 class AccountService:
-    def __init__(self):
-        self.db = Database()
-        self.db.connect()
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
         self.account_manager = AccountManager(self.db)
 
     def cadastros_menu(self):
@@ -111,7 +112,7 @@ class AccountService:
         VALUES (?, ?, ?)
         """
         self.db.execute(sql, (nome, nome_normalizado, descricao))
-        create_backup()
+        schedule_backup()
         print("Categoria cadastrada com sucesso!")
 
     def visualizar_categorias(self):
@@ -179,7 +180,7 @@ class AccountService:
         # Atualiza a categoria no banco de dados
         sql = "UPDATE account_categories SET name = ?, description = ? WHERE id = ?"
         self.db.execute(sql, (novo_nome, nova_desc, categoria_selecionada.id))
-        create_backup()
+        schedule_backup()
         print("Categoria atualizada com sucesso!")
 
     def excluir_categoria(self):
@@ -201,7 +202,7 @@ class AccountService:
         if confirma == 's':
             sql = "DELETE FROM account_categories WHERE id = ?"
             self.db.execute(sql, (categoria_selecionada.id,))
-            create_backup()
+            schedule_backup()
             print("Categoria excluída com sucesso!")
         else:
             print("Operação cancelada.")
@@ -311,7 +312,8 @@ class AccountService:
             VALUES (?, ?, ?, ?, ?, ?)
             """
             self.db.execute(sql, (nome, nome_normalizado, tipo, specific_type, specific_subtype, categoria_id))
-            create_backup()
+            invalidate_account_directory()
+            schedule_backup()
             print("Conta cadastrada com sucesso!")
         except sqlite3.IntegrityError as e:
             print("Erro: Já existe uma conta com esse nome.")
@@ -399,7 +401,8 @@ class AccountService:
         
         # Atualiza a conta no banco de dados
         if self.account_manager.update_account(conta_selecionada.id, novo_nome, novo_tipo, novo_subtipo):
-            create_backup()
+            invalidate_account_directory()
+            schedule_backup()
             print("Conta atualizada com sucesso!")
         else:
             print("Erro ao atualizar conta.")
@@ -426,9 +429,31 @@ class AccountService:
         confirma = input("Tem certeza que deseja excluir esta conta? (s/n): ").lower()
         if confirma == 's':
             if self.account_manager.delete_account(conta_selecionada.id):
-                create_backup()
+                invalidate_account_directory()
+                schedule_backup()
                 print("Conta excluída com sucesso!")
             else:
                 print("Erro ao excluir conta.")
         else:
-            print("Operação cancelada.")
\ No newline at end of file
+            print("Operação cancelada.")
+
+    def verificar_saldos(self):
+        """Confere os saldos registrados das contas contra o razão e, se o usuário desejar, os corrige."""
+        print("\n--- Verificar Saldos das Contas ---")
+        saldos = AccountBalances(self.db)
+        divergencias = saldos.divergencias()
+        if not divergencias:
+            print("Todos os saldos conferem com o razão.")
+            return
+
+        print(f"{'ID':>5} {'Conta':<30} {'Registrado':>15} {'Razão':>15}")
+        for conta in divergencias:
+            print(f"{conta.id:>5} {conta.name[:30]:<30} {conta.saldo_registrado:>15.2f} {conta.saldo_razao:>15.2f}")
+
+        confirma = input(f"\n{len(divergencias)} conta(s) com saldo divergente. Recalcular pelo razão? (s/n): ").lower()
+        if confirma == 's':
+            corrigidas = saldos.reconstruir()
+            schedule_backup()
+            print(f"{corrigidas} saldo(s) recalculado(s).")
+        else:
+            print("Operação cancelada.")
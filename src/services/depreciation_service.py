@@ -1,99 +1,56 @@
 from datetime import datetime, date
 from decimal import Decimal
 from typing import List, Optional
-from src.database.connection import Database
+from src.database.connection import get_database
 from src.database.models import Asset, DepreciationMethod
 from src.utils.validators import validate_and_convert_date
-from src.utils.formatters import format_currency
+from src.utils.formatters import format_currency, convert_comma_to_decimal
 from src.utils.search_utils import select_from_list
 from src.services.fiscal_period_service import FiscalPeriodService
+from src.core.depreciation import DepreciationEngine, DepreciationPosting, valor_contabil
+from src.core.depreciation_schedule import DepreciationSchedule, fechamento_mensal
+from src.utils.backup import schedule_backup
 
 class DepreciationService:
-    def __init__(self):
-        self.db = Database()
-        self.db.connect()
-        self.setup_depreciation_methods()
-        self.create_tables()
-        self.fiscal_period_service = FiscalPeriodService()
-
-    def create_tables(self):
-        # Create depreciation_methods table
-        sql_depreciation_methods = """
-        CREATE TABLE IF NOT EXISTS depreciation_methods (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            description TEXT NOT NULL,
-            annual_rate REAL
-        );"""
-
-        # Create assets table
-        sql_assets = """
-        CREATE TABLE IF NOT EXISTS assets (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            acquisition_date TEXT NOT NULL,
-            acquisition_value REAL NOT NULL,
-            depreciation_method_id INTEGER,
-            useful_life_years INTEGER,
-            salvage_value REAL,
-            start_depreciation_date TEXT NOT NULL,
-            account_id INTEGER,
-            is_active BOOLEAN DEFAULT 1,
-            FOREIGN KEY (depreciation_method_id) REFERENCES depreciation_methods(id),
-            FOREIGN KEY (account_id) REFERENCES accounts(id)
-        );"""
-
-        self.db.execute(sql_depreciation_methods)
-        self.db.execute(sql_assets)
-
-    def setup_depreciation_methods(self):
-        """Initialize predefined depreciation methods."""
-        methods = [
-            ("Linear", "Depreciation is spread evenly across the asset's useful life", 0),
-            ("Declining Balance", "Accelerated depreciation with higher initial amounts", 2),
-            ("Sum of Years Digits", "Accelerated depreciation based on remaining life", 0),
-        ]
-
-        sql = "INSERT OR IGNORE INTO depreciation_methods (name, description, annual_rate) VALUES (?, ?, ?)"
-        for method in methods:
-            self.db.execute(sql, method)
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
+        self.fiscal_period_service = FiscalPeriodService(self.db)
+        self.engine = DepreciationEngine(self.db)
+        self.posting = DepreciationPosting(self.db)
+        self.schedule = DepreciationSchedule(self.db)
+        self._transaction_service = None
+
+    @property
+    def transaction_service(self):
+        # Criado na primeira seleção de conta, sobre a mesma conexão
+        if self._transaction_service is None:
+            from src.services.transaction_service import TransactionService
+            self._transaction_service = TransactionService(self.db)
+        return self._transaction_service
+
+    def selecionar_contas_depreciacao(self):
+        """Seleciona a conta de despesa (débito) e a de depreciação acumulada (crédito). Retorna (despesa, acumulada) ou None."""
+        print("\nSelecione a conta de débito (despesa de depreciação):")
+        despesa = self.transaction_service.selecionar_conta("débito")
+        if not despesa:
+            return None
+        print("\nSelecione a conta de crédito (depreciação acumulada):")
+        acumulada = self.transaction_service.selecionar_conta("crédito")
+        if not acumulada:
+            return None
+        if despesa[0] == acumulada[0]:
+            print("Erro: A conta de débito e crédito não podem ser a mesma.")
+            return None
+        return despesa, acumulada
 
     def calcular_valor_atual(self, asset, reference_date=None):
+        """
+        Valor contábil do ativo na data de referência (hoje, por padrão).
+        A curva de depreciação usa anos fracionários; o resultado é arredondado
+        para centavos e devolvido como Decimal.
+        """
         today = reference_date or datetime.now().date()
-        start_date = datetime.strptime(asset[7], '%Y-%m-%d').date()
-        acquisition_value = asset[3]
-        salvage_value = asset[6]
-        useful_life_years = asset[5]
-        method_name = asset[4]
-
-        if start_date > today:
-            return acquisition_value
-
-        dias_decorridos = (today - start_date).days
-        anos_decorridos = dias_decorridos / 365.25
-
-        if anos_decorridos >= useful_life_years:
-            return salvage_value
-
-        valor_depreciavel = acquisition_value - salvage_value
-
-        if method_name == "Linear":
-            depreciacao_acumulada = valor_depreciavel * (anos_decorridos / useful_life_years)
-        elif method_name == "Declining Balance":
-            taxa = 2 / useful_life_years
-            valor_atual = acquisition_value * ((1 - taxa) ** anos_decorridos)
-            return max(valor_atual, salvage_value)
-        elif method_name == "Sum of Years Digits":
-            soma_anos = (useful_life_years * (useful_life_years + 1)) / 2
-            anos_restantes = useful_life_years - anos_decorridos
-            depreciacao_acumulada = valor_depreciavel * (1 - (anos_restantes * (anos_restantes + 1)) / soma_anos)
-        else:
-            return acquisition_value
-
-        valor_atual = acquisition_value - depreciacao_acumulada
-        return max(valor_atual, salvage_value)
-
-
+        return valor_contabil(asset[3], asset[6], asset[5], asset[4], asset[7], today)
 
     def visualizar_ativos(self):
         print("\n=== Ativos Cadastrados ===")
@@ -158,7 +115,7 @@ class DepreciationService:
         # Get acquisition value
         while True:
             try:
-                acquisition_value = float(input("Valor de aquisição: R$ ").replace(',', '.'))
+                acquisition_value = convert_comma_to_decimal(input("Valor de aquisição: R$ "))
                 if acquisition_value <= 0:
                     print("O valor deve ser maior que zero.")
                     continue
@@ -196,7 +153,7 @@ class DepreciationService:
         # Get salvage value
         while True:
             try:
-                salvage_value = float(input("Valor residual: R$ ").replace(',', '.'))
+                salvage_value = convert_comma_to_decimal(input("Valor residual: R$ "))
                 if salvage_value < 0:
                     print("O valor residual não pode ser negativo.")
                     continue
@@ -217,13 +174,16 @@ class DepreciationService:
 
         # Select account
         print("\nSelecione a conta do ativo:")
-        from src.services.transaction_service import TransactionService
-        transaction_service = TransactionService()
-        account = transaction_service.selecionar_conta("ativo")
+        account = self.transaction_service.selecionar_conta("ativo")
         if not account:
             print("Operação cancelada.")
             return
 
+        # Contas padrão usadas no lançamento da depreciação do período (opcionais)
+        contas_depreciacao = None
+        if input("\nDefinir agora as contas de lançamento da depreciação? (s/n): ").lower() == 's':
+            contas_depreciacao = self.selecionar_contas_depreciacao()
+
         # Confirm information
         print("\nConfirme as informações do ativo:")
         print(f"Nome: {name}")
@@ -234,6 +194,9 @@ class DepreciationService:
         print(f"Valor residual: R$ {salvage_value:.2f}")
         print(f"Data de início da depreciação: {formatted_start_date}")
         print(f"Conta: {account[1]}")
+        if contas_depreciacao:
+            print(f"Despesa de depreciação: {contas_depreciacao[0][1]}")
+            print(f"Depreciação acumulada: {contas_depreciacao[1][1]}")
 
         if input("\nConfirmar cadastro? (s/n): ").lower() != 's':
             print("Operação cancelada.")
@@ -243,13 +206,18 @@ class DepreciationService:
         sql = """
         INSERT INTO assets (
             name, acquisition_date, acquisition_value, depreciation_method_id,
-            useful_life_years, salvage_value, start_depreciation_date, account_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            useful_life_years, salvage_value, start_depreciation_date, account_id,
+            expense_account_id, accumulated_account_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         self.db.execute(sql, (
             name, formatted_date, acquisition_value, method_id,
-            useful_life, salvage_value, formatted_start_date, account[0]
+            useful_life, salvage_value, formatted_start_date, account[0],
+            contas_depreciacao[0][0] if contas_depreciacao else None,
+            contas_depreciacao[1][0] if contas_depreciacao else None
         ))
+        # Gera o cronograma mensal do ativo novo
+        self.schedule.sincronizar()
         print("\nAtivo cadastrado com sucesso!")
 
     def calcular_depreciacao(self):
@@ -304,7 +272,7 @@ class DepreciationService:
             anual_depreciacao = (asset[3] - asset[6]) / asset[5]
         elif method_name == "Declining Balance":
             # Para saldo decrescente, a taxa é o quociente de dois pela vida útil.
-            taxa = 2 / asset[5]
+            taxa = Decimal(2) / asset[5]
             # A depreciação anual estimada é o valor no início do período multiplicado pela taxa.
             anual_depreciacao = valor_inicio * taxa
         elif method_name == "Sum of Years Digits":
@@ -314,14 +282,14 @@ class DepreciationService:
             current_year = int(anos_decorridos) + 1
             total_years = asset[5]
             if current_year > total_years:
-                anual_depreciacao = 0
+                anual_depreciacao = Decimal("0.00")
             else:
                 # A soma dos dígitos é obtida multiplicando a vida útil pelo valor da vida útil mais um e dividindo por dois.
-                soma_anos = total_years * (total_years + 1) / 2
+                soma_anos = Decimal(total_years * (total_years + 1)) / 2
                 # A depreciação anual é calculada multiplicando a base depreciável pela fração dos anos restantes sobre a soma dos dígitos.
-                anual_depreciacao = ((total_years - current_year + 1) / soma_anos) * (asset[3] - asset[6])
+                anual_depreciacao = (Decimal(total_years - current_year + 1) / soma_anos) * (asset[3] - asset[6])
         else:
-            anual_depreciacao = 0
+            anual_depreciacao = Decimal("0.00")
 
         mensal_depreciacao = anual_depreciacao / 12
 
@@ -334,31 +302,178 @@ class DepreciationService:
 
         # Registra a transação, se o usuário desejar, usando a data final do período fiscal e o valor acumulado
         if input("\nDeseja registrar a depreciação como transação? (s/n): ").lower() == 's':
-            print("\nSelecione a conta de débito (despesa de depreciação):")
-            from src.services.transaction_service import TransactionService
-            ts = TransactionService()
-            debit_account = ts.selecionar_conta("débito")
-            if not debit_account:
+            ja_lancada = self.db.execute(
+                "SELECT 1 FROM depreciation_postings WHERE asset_id = ? AND fiscal_period_id = ?",
+                (asset[0], fiscal_period[0])).fetchone()
+            if ja_lancada:
+                print("\nA depreciação deste ativo já foi lançada neste período.")
                 return
-
-            print("\nSelecione a conta de crédito (depreciação acumulada):")
-            credit_account = ts.selecionar_conta("crédito")
-            if not credit_account:
+            if depreciacao_total <= 0:
+                print("\nNão há depreciação a lançar neste período.")
                 return
 
+            contas = self.db.execute(
+                "SELECT expense_account_id, accumulated_account_id FROM assets WHERE id = ?", (asset[0],)).fetchone()
+            if contas and contas[0] and contas[1]:
+                debit_account, credit_account = contas
+            else:
+                selecionadas = self.selecionar_contas_depreciacao()
+                if not selecionadas:
+                    return
+                debit_account, credit_account = selecionadas[0][0], selecionadas[1][0]
+
             description = f"Depreciação acumulada no período - {asset[1]}"
-            sql = """
-            INSERT INTO transactions (date, description, debit_account, credit_account, amount)
-            VALUES (?, ?, ?, ?, ?)
-            """
             transaction_date = end_date.strftime("%Y-%m-%d")
-            self.db.execute(sql, (transaction_date, description, debit_account[0], credit_account[0], depreciacao_total))
-            self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                            (depreciacao_total, debit_account[0]))
-            self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                            (depreciacao_total, credit_account[0]))
+            with self.db.transaction():
+                self.db.execute(DepreciationPosting.SQL_INSERT,
+                                (transaction_date, description, debit_account, credit_account, depreciacao_total))
+                self.db.execute(DepreciationPosting.SQL_REGISTRO, (asset[0], fiscal_period[0], depreciacao_total,
+                                                                  datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            schedule_backup()
             print("\nTransação de depreciação registrada com sucesso!")
 
+    def calcular_depreciacao_em_lote(self):
+        """Calcula a depreciação de todos os ativos ativos no período fiscal corrente."""
+        print("\n=== Depreciação de Todos os Ativos ===")
+        fiscal_period = self.fiscal_period_service.get_current_period()
+        if not fiscal_period:
+            print("Nenhum período fiscal encontrado.")
+            return
+        tabela = self.engine.calcular_periodo(fiscal_period[1], fiscal_period[2])
+        if not len(tabela):
+            print("Nenhum ativo cadastrado.")
+            return
+
+        print(f"\nPeríodo: {fiscal_period[1]} a {fiscal_period[2]}")
+        print("\n{:<5} {:<25} {:<20} {:>15} {:>15} {:>15}".format(
+            "ID", "Nome", "Método", "Valor Início", "Valor Fim", "Depreciação"))
+        print("-" * 100)
+        for linha in tabela:
+            print(f"{linha.id:<5} {linha.name[:25]:<25} {linha.method[:20]:<20} {linha.valor_inicio:>15.2f} "
+                  f"{linha.valor_fim:>15.2f} {linha.depreciacao:>15.2f}")
+        print("-" * 100)
+        print(f"{len(tabela)} ativo(s). Depreciação total no período: {format_currency(tabela.total())}")
+        return tabela
+
+    def definir_contas_depreciacao(self):
+        """Define as contas padrão de lançamento da depreciação de um ativo."""
+        print("\n=== Contas de Depreciação do Ativo ===")
+        sql = """
+        SELECT a.id, a.name, d.name, c.name
+        FROM assets a
+        LEFT JOIN accounts d ON a.expense_account_id = d.id
+        LEFT JOIN accounts c ON a.accumulated_account_id = c.id
+        WHERE a.is_active = 1
+        ORDER BY a.name
+        """
+        assets = self.db.execute(sql).fetchall()
+        if not assets:
+            print("Nenhum ativo cadastrado.")
+            return
+
+        print("\nAtivos disponíveis:")
+        for idx, asset in enumerate(assets, 1):
+            print(f"{idx}. {asset[1]} (Despesa: {asset[2] or '-'}, Acumulada: {asset[3] or '-'})")
+        try:
+            choice = int(input("\nSelecione o ativo: ")) - 1
+        except ValueError:
+            print("Digite um número válido.")
+            return
+        if not 0 <= choice < len(assets):
+            print("Opção inválida.")
+            return
+
+        contas = self.selecionar_contas_depreciacao()
+        if not contas:
+            return
+        self.posting.definir_contas(assets[choice][0], contas[0][0], contas[1][0])
+        schedule_backup()
+        print(f"\nContas de depreciação de '{assets[choice][1]}' atualizadas.")
+
+    def lancar_depreciacao_periodo(self):
+        """
+        Fechamento do período: lança, em uma única unidade de trabalho, a
+        depreciação de todos os ativos ativos ainda não lançada no período fiscal escolhido.
+        """
+        print("\n=== Lançar Depreciação do Período ===")
+        periodos = self.fiscal_period_service.visualizar_periodos()
+        if not periodos:
+            return
+        try:
+            periodo_id = int(input("\nID do período fiscal: "))
+        except ValueError:
+            print("ID inválido.")
+            return
+        try:
+            previa = self.posting.preparar(periodo_id)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return
+
+        self._imprimir_resumo_depreciacao(previa)
+        if not previa.lancados:
+            print("\nNada a lançar neste período.")
+            return
+        if input(f"\nLançar a depreciação de {len(previa.lancados)} ativo(s)? (s/n): ").lower() != 's':
+            print("Operação cancelada.")
+            return
+
+        resultado = self.posting.executar(periodo_id)
+        schedule_backup()
+        print(f"\n{len(resultado.lancados)} lançamento(s) de depreciação registrados, "
+              f"total {format_currency(resultado.total())}.")
+        return resultado
+
+    def _imprimir_resumo_depreciacao(self, resultado):
+        print(f"\nPeríodo {resultado.periodo_id}: {resultado.inicio} a {resultado.fim}")
+        if resultado.lancados:
+            print("\n{:<5} {:<30} {:>15}".format("ID", "Ativo", "Depreciação"))
+            print("-" * 52)
+            for linha in resultado.lancados:
+                print(f"{linha.id:<5} {linha.name[:30]:<30} {linha.depreciacao:>15.2f}")
+            print("-" * 52)
+            print(f"{'Total':<36} {resultado.total():>15.2f}")
+        print(f"\nA lançar: {len(resultado.lancados)}")
+        print(f"Já lançados neste período: {resultado.ja_lancados}")
+        print(f"Sem depreciação no período: {resultado.sem_depreciacao}")
+        if resultado.sem_contas:
+            print(f"Sem contas de depreciação definidas (não serão lançados): {len(resultado.sem_contas)}")
+            for linha in resultado.sem_contas:
+                print(f"  - {linha.name} (ID {linha.id}): {format_currency(linha.depreciacao)}")
+
+    def valores_contabeis_na_data(self):
+        """Valor contábil de todos os ativos no fechamento mensal de uma data, pelo cronograma de depreciação."""
+        print("\n=== Valor Contábil dos Ativos ===")
+        data = validate_and_convert_date(input("Data (qualquer formato com dia, mês e ano): "), "%Y-%m-%d")
+        if not data:
+            print("Data inválida.")
+            return
+        valores = self.schedule.valores_contabeis(data)
+        if not valores:
+            print("Nenhum ativo cadastrado.")
+            return
+
+        fechamento = fechamento_mensal(data)
+        print(f"\nValores no fechamento de {datetime.strptime(fechamento, '%Y-%m-%d').strftime('%d/%m/%Y')}:")
+        print("\n{:<5} {:<30} {:>15}".format("ID", "Ativo", "Valor Contábil"))
+        print("-" * 52)
+        for asset_id, nome, valor in valores:
+            print(f"{asset_id:<5} {nome[:30]:<30} {valor:>15.2f}")
+        print("-" * 52)
+        print(f"{'Total':<36} {sum(v[2] for v in valores):>15.2f}")
+
+        fiscal_period = self.fiscal_period_service.get_current_period()
+        if fiscal_period:
+            total = self.schedule.depreciacao_do_periodo(fiscal_period[1], fiscal_period[2])
+            print(f"\nDepreciação no período fiscal corrente ({fiscal_period[1]} a {fiscal_period[2]}): "
+                  f"{format_currency(total)}")
+        return valores
+
+    def regenerar_cronogramas(self):
+        """Recalcula o cronograma mensal de depreciação de todos os ativos."""
+        print("\n=== Regenerar Cronogramas de Depreciação ===")
+        ativos = self.schedule.regenerar()
+        print(f"Cronograma de {ativos} ativo(s) recalculado.")
 
     def calcular_depreciacao_por_periodo(self):
         print("\n=== Calcular Depreciação por Período Fiscal ===")
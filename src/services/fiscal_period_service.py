@@ -1,12 +1,11 @@
 # src/services/fiscal_period_service.py
 from datetime import datetime, timedelta
-from src.database.connection import Database
+from src.database.connection import get_database
 from src.utils.validators import validate_and_convert_date
 
 class FiscalPeriodService:
-    def __init__(self):
-        self.db = Database()
-        self.db.connect()
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
 
     def cadastrar_periodo(self):
         print("\n=== Cadastrar Período de Exercício ===")
@@ -153,6 +152,15 @@ class FiscalPeriodService:
         self.db.execute(sql, (periodo_id,))
         print("Período excluído com sucesso!")
 
+    def get_period(self, periodo_id):
+        """Returns the fiscal period (id, start_date, end_date, interval_days) with the given ID, or None"""
+        sql = """
+        SELECT id, start_date, end_date, interval_days
+        FROM fiscal_periods
+        WHERE id = ?
+        """
+        return self.db.execute(sql, (periodo_id,)).fetchone()
+
     def get_current_period(self):
         """Returns the most recent fiscal period that includes the current date"""
         current_date = datetime.now().strftime('%Y-%m-%d')
@@ -0,0 +1,584 @@
+# src/services/import_service.py
+"""
+Importação em lote de extratos bancários (CSV e OFX).
+
+O arquivo é lido como um fluxo: os leitores são geradores que produzem um
+lançamento de extrato por vez, e os lançamentos válidos são gravados em
+blocos de IMPORT_CHUNK_SIZE com executemany, cada bloco em uma única
+unidade de trabalho. O uso de memória depende do tamanho do bloco, e não
+do tamanho do arquivo.
+
+Cada lançamento do extrato é mapeado para um par de contas:
+- a conta do extrato (ex.: conta corrente) recebe o débito quando o valor é
+  positivo (entrada de dinheiro) e o crédito quando é negativo (saída);
+- a contrapartida é escolhida pelas regras de importação, pela primeira
+  regra cujo padrão aparece na descrição.
+
+Arquivo de regras (JSON), com contas por ID ou por nome:
+
+    {
+        "regras": [
+            {"padrao": "aluguel", "conta": "Despesas com Aluguel"},
+            {"padrao": "^PIX RECEBIDO", "regex": true, "conta": 12},
+            {"padrao": "tarifa", "debito": "Tarifas Bancárias", "credito": "Conta Corrente"}
+        ],
+        "padrao": "Despesas a Classificar"
+    }
+
+"padrao" (fora da lista) é a contrapartida dos lançamentos que não casam com
+nenhuma regra; sem ele, esses lançamentos são rejeitados.
+
+Lançamentos com as duas contas explícitas (ImportService.lancar, usado pelo
+comando `post` do cli.py) são lidos de CSV, JSON (lista de objetos) ou JSON
+Lines (um objeto por linha), com as colunas/chaves de JOURNAL_COLUMNS e
+contas por ID ou por nome:
+
+    data;descricao;debito;credito;valor
+    2024-01-31;Aluguel de janeiro;Despesas com Aluguel;Conta Corrente;1500,00
+
+    {"data": "2024-01-31", "descricao": "Aluguel", "debito": 12, "credito": "Conta Corrente", "valor": "1500.00"}
+"""
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from config.settings import IMPORT_CHUNK_SIZE, IMPORT_RULES_PATH
+from src.database.connection import get_database
+from src.utils.backup import schedule_backup
+from src.utils.money import to_decimal
+from src.utils.validators import normalizar_nome, validate_and_convert_date
+
+# Lançamento lido do extrato, ainda sem validação (date e amount como texto)
+StatementLine = namedtuple("StatementLine", ["line", "date", "description", "amount"])
+
+# Lançamento com as contas explícitas (débito e crédito por ID ou nome), ainda sem validação
+JournalLine = namedtuple("JournalLine", ["line", "date", "description", "debit", "credit", "amount"])
+
+# Nomes aceitos (normalizados) para as colunas do CSV
+CSV_COLUMNS = {
+    "date": ("data", "date", "data lancamento", "data do lancamento", "dt"),
+    "description": ("descricao", "description", "historico", "memo", "lancamento"),
+    "amount": ("valor", "amount", "valor (r$)", "quantia"),
+}
+
+# Colunas (CSV) ou chaves (JSON) dos lançamentos com contas explícitas
+JOURNAL_COLUMNS = dict(
+    CSV_COLUMNS,
+    debit=("debito", "debit", "conta debito", "conta de debito"),
+    credit=("credito", "credit", "conta credito", "conta de credito"),
+)
+
+# Formatos de data reconhecidos sem o parser genérico (muito mais lento):
+# (expressão, posição dos grupos de ano, mês e dia)
+DATE_PATTERNS = (
+    (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$"), (1, 2, 3)),
+    (re.compile(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})$"), (3, 2, 1)),
+    (re.compile(r"(\d{4})(\d{2})(\d{2})$"), (1, 2, 3)),  # OFX: YYYYMMDD
+)
+
+# Quantidade de erros guardados no relatório (os demais são apenas contados)
+MAX_REPORTED_ERRORS = 20
+
+SQL_INSERT = """
+INSERT INTO transactions (date, description, debit_account, credit_account, amount)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class StatementImportError(ValueError):
+    """Arquivo, regra ou lançamento de extrato inválido."""
+
+
+def ler_csv(caminho, delimitador=None, encoding="utf-8-sig"):
+    """
+    Gera os lançamentos de um extrato CSV. As colunas são identificadas pelo
+    cabeçalho (ver CSV_COLUMNS); o delimitador é detectado se não for informado.
+    """
+    with open(caminho, newline="", encoding=encoding) as arquivo:
+        if delimitador is None:
+            amostra = arquivo.read(4096)
+            arquivo.seek(0)
+            try:
+                delimitador = csv.Sniffer().sniff(amostra, delimiters=",;\t|").delimiter
+            except csv.Error:
+                delimitador = ";"
+        leitor = csv.reader(arquivo, delimiter=delimitador)
+        cabecalho = next(leitor, None)
+        if cabecalho is None:
+            return
+        indices = _indices_colunas(cabecalho)
+        i_data, i_descricao, i_valor = indices["date"], indices["description"], indices["amount"]
+        for linha in leitor:
+            if not linha or not any(campo.strip() for campo in linha):
+                continue
+            try:
+                yield StatementLine(leitor.line_num, linha[i_data], linha[i_descricao], linha[i_valor])
+            except IndexError:
+                yield StatementLine(leitor.line_num, None, None, None)
+
+
+def _indices_colunas(cabecalho, colunas=CSV_COLUMNS):
+    nomes = [normalizar_nome(coluna.strip()) for coluna in cabecalho]
+    indices = {}
+    for campo, aceitos in colunas.items():
+        encontrado = next((i for i, nome in enumerate(nomes) if nome in aceitos), None)
+        if encontrado is None:
+            raise StatementImportError(f"Coluna '{campo}' não encontrada no cabeçalho: {cabecalho}")
+        indices[campo] = encontrado
+    return indices
+
+
+def ler_ofx(caminho, bloco=65536):
+    """
+    Gera os lançamentos (<STMTTRN>) de um extrato OFX, tanto no formato SGML
+    (tags sem fechamento) quanto XML. O arquivo é lido em blocos, então
+    extratos em uma única linha também não são carregados inteiros.
+    """
+    with open(caminho, "rb") as arquivo:
+        cabecalho = arquivo.read(1024).upper()
+    encoding = "utf-8" if b"UTF-8" in cabecalho or b"CHARSET:65001" in cabecalho else "cp1252"
+
+    atual = None
+    numero = 0
+    for tag, valor in _tags_ofx(caminho, encoding, bloco):
+        # No SGML o </STMTTRN> é opcional: o lançamento termina no próximo <STMTTRN> ou no fim da lista
+        if tag in ("STMTTRN", "/STMTTRN", "/BANKTRANLIST") and atual is not None:
+            numero += 1
+            yield _lancamento_ofx(numero, atual)
+            atual = None
+        if tag == "STMTTRN":
+            atual = {}
+        elif atual is not None and not tag.startswith("/"):
+            atual[tag] = valor
+    if atual is not None:
+        yield _lancamento_ofx(numero + 1, atual)
+
+
+def _lancamento_ofx(numero, campos):
+    descricao = campos.get("MEMO") or campos.get("NAME") or ""
+    data = campos.get("DTPOSTED")
+    return StatementLine(numero, data[:8] if data else None, descricao, campos.get("TRNAMT"))
+
+
+def _tags_ofx(caminho, encoding, bloco):
+    """Gera pares (TAG, valor) do OFX; tags de fechamento vêm como ('/TAG', '')."""
+    with open(caminho, encoding=encoding, errors="replace") as arquivo:
+        resto = ""
+        while True:
+            dados = arquivo.read(bloco)
+            if not dados:
+                break
+            partes = (resto + dados).split("<")
+            resto = partes.pop()
+            for parte in partes:
+                tag, _, valor = parte.partition(">")
+                if tag:
+                    yield tag.strip().upper(), valor.strip()
+        tag, _, valor = resto.partition(">")
+        if tag:
+            yield tag.strip().upper(), valor.strip()
+
+
+def ler_extrato(caminho, **kwargs):
+    """Escolhe o leitor pela extensão do arquivo (.ofx/.qfx ou CSV)."""
+    if os.path.splitext(caminho)[1].lower() in (".ofx", ".qfx"):
+        return ler_ofx(caminho)
+    return ler_csv(caminho, **kwargs)
+
+
+def ler_lancamentos(caminho, formato=None):
+    """
+    Gera os lançamentos (JournalLine) de um arquivo CSV, JSON ou JSON Lines;
+    "-" lê da entrada padrão. O formato vem da extensão (.json, .jsonl/.ndjson,
+    os demais CSV) se não for informado.
+    """
+    if formato is None:
+        extensao = os.path.splitext(caminho)[1].lower()
+        formato = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extensao, "csv")
+    if formato not in ("csv", "json", "jsonl"):
+        raise StatementImportError(f"Formato de lançamentos desconhecido: {formato!r}")
+    if caminho == "-":
+        # newline="" como no open(): o csv trata as quebras de linha dentro dos campos
+        arquivo = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    else:
+        arquivo = open(caminho, newline="", encoding="utf-8-sig")
+    with arquivo:
+        if formato == "csv":
+            yield from _lancamentos_csv(arquivo)
+        elif formato == "json":
+            try:
+                objetos = json.load(arquivo)
+            except json.JSONDecodeError as e:
+                raise StatementImportError(f"JSON inválido: {e}")
+            if not isinstance(objetos, list):
+                raise StatementImportError("O JSON deve ser uma lista de lançamentos.")
+            for numero, objeto in enumerate(objetos, 1):
+                yield lancamento_de_objeto(numero, objeto)
+        else:
+            for numero, texto in enumerate(arquivo, 1):
+                if not texto.strip():
+                    continue
+                try:
+                    objeto = json.loads(texto)
+                except json.JSONDecodeError:
+                    yield JournalLine(numero, None, None, None, None, None)
+                    continue
+                yield lancamento_de_objeto(numero, objeto)
+
+
+def _lancamentos_csv(arquivo):
+    amostra = arquivo.read(4096)
+    try:
+        delimitador = csv.Sniffer().sniff(amostra, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimitador = ";"
+    # A entrada padrão não volta ao início: a amostra é lida de novo antes do restante
+    leitor = csv.reader(_com_amostra(amostra, arquivo), delimiter=delimitador)
+    cabecalho = next(leitor, None)
+    if cabecalho is None:
+        return
+    indices = _indices_colunas(cabecalho, JOURNAL_COLUMNS)
+    for linha in leitor:
+        if not linha or not any(campo.strip() for campo in linha):
+            continue
+        try:
+            yield JournalLine(leitor.line_num, *(linha[indices[campo]] for campo in JournalLine._fields[1:]))
+        except IndexError:
+            yield JournalLine(leitor.line_num, None, None, None, None, None)
+
+
+def _com_amostra(amostra, arquivo):
+    # A amostra termina no meio de uma linha: completa a linha antes de seguir com o arquivo
+    yield from io.StringIO(amostra + arquivo.readline(), newline="")
+    yield from arquivo
+
+
+def lancamento_de_objeto(numero, objeto):
+    """JournalLine de um objeto JSON (dict) com as chaves de JOURNAL_COLUMNS."""
+    if not isinstance(objeto, dict):
+        return JournalLine(numero, None, None, None, None, None)
+    campos = {}
+    for chave, valor in objeto.items():
+        nome = normalizar_nome(str(chave).strip())
+        campo = next((campo for campo, aceitos in JOURNAL_COLUMNS.items() if nome in aceitos), None)
+        if campo is not None:
+            campos[campo] = valor
+    texto = {campo: None if campos.get(campo) is None else str(campos[campo])
+             for campo in ("date", "description", "amount")}
+    return JournalLine(numero, texto["date"], texto["description"], campos.get("debit"),
+                       campos.get("credit"), texto["amount"])
+
+
+def parse_valor(texto):
+    """
+    Converte o valor do extrato em Decimal: aceita "1.234,56", "1,234.56",
+    "-12.5", "R$ 10,00" e "(10,00)" (negativo). Lança ValueError se inválido,
+    com mais de duas casas decimais ou ambíguo: um único separador seguido de
+    exatamente três dígitos ("1.234" pode ser mil duzentos e trinta e quatro).
+    """
+    if texto is None:
+        raise ValueError("valor ausente")
+    valor = texto.strip().replace("R$", "").replace(" ", "")
+    negativo = valor.startswith("(") and valor.endswith(")")
+    if negativo:
+        valor = valor[1:-1]
+    if "," in valor and "." in valor:
+        # O separador que aparece por último é o decimal
+        if valor.rfind(",") > valor.rfind("."):
+            valor = valor.replace(".", "").replace(",", ".")
+        else:
+            valor = valor.replace(",", "")
+    elif valor.count(",") + valor.count(".") == 1:
+        valor = valor.replace(",", ".")
+        if len(valor.partition(".")[2]) == 3:
+            raise ValueError(f"valor ambíguo (separador de milhar ou decimal?): {texto!r}")
+    numero = to_decimal(valor)
+    # to_decimal arredonda para centavos; aqui centavos a mais são erro, e não arredondamento
+    if numero != Decimal(valor):
+        raise ValueError(f"valor com mais de duas casas decimais: {texto!r}")
+    return -numero if negativo else numero
+
+
+def parse_data(texto):
+    """
+    Converte a data do extrato para YYYY-MM-DD. Os formatos de DATE_PATTERNS
+    são lidos diretamente; os demais passam pelo parser genérico (dia primeiro).
+    Lança ValueError se inválida.
+    """
+    if not texto:
+        raise ValueError("data ausente")
+    texto = texto.strip()
+    for expressao, (ano, mes, dia) in DATE_PATTERNS:
+        partes = expressao.match(texto)
+        if partes:
+            try:
+                return date(int(partes[ano]), int(partes[mes]), int(partes[dia])).isoformat()
+            except ValueError:
+                raise ValueError(f"data inválida: {texto!r}")
+    data = validate_and_convert_date(texto, "%Y-%m-%d")
+    if data is None:
+        raise ValueError(f"data inválida: {texto!r}")
+    return data
+
+
+class ImportRules:
+    """
+    Regras de mapeamento de descrição para contas.
+    Cada regra é (casa(descricao_normalizada) -> bool, contrapartida, debito, credito),
+    com contas já resolvidas para IDs.
+    """
+
+    def __init__(self, regras, padrao=None):
+        self.regras = regras
+        self.padrao = padrao
+
+    @classmethod
+    def from_dict(cls, db, dados):
+        contas = _AccountResolver(db)
+        regras = []
+        for i, regra in enumerate(dados.get("regras", []), 1):
+            padrao = regra.get("padrao")
+            if not padrao:
+                raise StatementImportError(f"Regra {i}: 'padrao' é obrigatório.")
+            if regra.get("regex"):
+                expressao = re.compile(padrao, re.IGNORECASE)
+                casa = lambda descricao, expressao=expressao: expressao.search(descricao) is not None
+            else:
+                termo = normalizar_nome(padrao)
+                casa = lambda descricao, termo=termo: termo in descricao
+            if "conta" in regra:
+                regras.append((casa, contas.resolver(regra["conta"], i), None, None))
+            elif "debito" in regra and "credito" in regra:
+                regras.append((casa, None, contas.resolver(regra["debito"], i), contas.resolver(regra["credito"], i)))
+            else:
+                raise StatementImportError(f"Regra {i}: informe 'conta' ou 'debito' e 'credito'.")
+        padrao = dados.get("padrao")
+        return cls(regras, contas.resolver(padrao, "padrao") if padrao is not None else None)
+
+    @classmethod
+    def from_file(cls, db, caminho):
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except (OSError, json.JSONDecodeError) as e:
+            raise StatementImportError(f"Não foi possível ler as regras em {caminho}: {e}")
+        return cls.from_dict(db, dados)
+
+    def contas(self, conta_extrato, descricao, valor):
+        """Retorna (debito, credito) do lançamento, ou None se nenhuma regra se aplicar."""
+        # Descrições ASCII (a maioria nos extratos) dispensam a normalização Unicode
+        normalizada = descricao.lower() if descricao.isascii() else normalizar_nome(descricao)
+        for casa, contrapartida, debito, credito in self.regras:
+            if casa(normalizada):
+                if contrapartida is None:
+                    return debito, credito
+                return _lados(conta_extrato, contrapartida, valor)
+        if self.padrao is not None:
+            return _lados(conta_extrato, self.padrao, valor)
+        return None
+
+
+def _lados(conta_extrato, contrapartida, valor):
+    # Entrada de dinheiro: debita a conta do extrato; saída: credita
+    if valor > 0:
+        return conta_extrato, contrapartida
+    return contrapartida, conta_extrato
+
+
+class _AccountResolver:
+    """Resolve contas das regras por ID ou nome (normalizado) com uma única consulta."""
+
+    def __init__(self, db):
+        linhas = db.execute("SELECT id, normalized_name FROM accounts").fetchall()
+        self.ids = {conta_id for conta_id, _ in linhas}
+        self.nomes = {nome: conta_id for conta_id, nome in linhas}
+
+    def buscar(self, conta):
+        """ID da conta (por ID, inclusive em texto, ou por nome), ou None se não existir."""
+        if isinstance(conta, str):
+            texto = conta.strip()
+            if texto.isdigit() and int(texto) in self.ids:
+                return int(texto)
+            return self.nomes.get(normalizar_nome(texto))
+        if isinstance(conta, int) and conta in self.ids:
+            return conta
+        return None
+
+    def resolver(self, conta, regra):
+        if isinstance(conta, int) and conta in self.ids:
+            return conta
+        if isinstance(conta, str) and normalizar_nome(conta.strip()) in self.nomes:
+            return self.nomes[normalizar_nome(conta.strip())]
+        raise StatementImportError(f"Regra {regra}: conta não encontrada: {conta!r}")
+
+
+class ImportResult:
+    """Resumo de uma importação: contagens, primeiros erros e vazão."""
+
+    def __init__(self):
+        self.lidas = 0
+        self.importadas = 0
+        self.rejeitadas = 0
+        self.erros = []
+        self.segundos = 0.0
+
+    def rejeitar(self, linha, motivo):
+        self.rejeitadas += 1
+        if len(self.erros) < MAX_REPORTED_ERRORS:
+            self.erros.append((linha, motivo))
+
+    @property
+    def linhas_por_segundo(self):
+        return self.lidas / self.segundos if self.segundos else 0.0
+
+    def __str__(self):
+        return (f"{self.importadas} lançamentos importados, {self.rejeitadas} rejeitados, "
+                f"{self.lidas} lidos em {self.segundos:.2f}s ({self.linhas_por_segundo:,.0f} linhas/s)")
+
+
+class ImportService:
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
+
+    def buscar_conta(self, conta):
+        """ID da conta informada por ID ou nome; StatementImportError se não existir."""
+        conta_id = _AccountResolver(self.db).buscar(conta)
+        if conta_id is None:
+            raise StatementImportError(f"Conta não encontrada: {conta!r}")
+        return conta_id
+
+    def importar(self, linhas, conta_extrato, regras, tamanho_bloco=IMPORT_CHUNK_SIZE):
+        """
+        Valida e grava os lançamentos de `linhas` (iterável de StatementLine).
+        Cada bloco de até `tamanho_bloco` lançamentos é gravado em uma unidade
+        de trabalho, com um executemany dos INSERTs (os saldos das contas são
+        mantidos pelos gatilhos de transactions). Lançamentos inválidos são rejeitados e
+        registrados no resultado, sem interromper a importação.
+        Retorna um ImportResult.
+        """
+        resultado = ImportResult()
+        inicio = time.perf_counter()
+        bloco = []
+        for linha in linhas:
+            resultado.lidas += 1
+            try:
+                data = parse_data(linha.date)
+                valor = parse_valor(linha.amount)
+            except ValueError as e:
+                resultado.rejeitar(linha.line, str(e))
+                continue
+            if valor == 0:
+                resultado.rejeitar(linha.line, "valor zero")
+                continue
+            descricao = (linha.description or "").strip()
+            contas = regras.contas(conta_extrato, descricao, valor)
+            if contas is None:
+                resultado.rejeitar(linha.line, f"nenhuma regra para '{descricao}'")
+                continue
+            debito, credito = contas
+            if debito == credito:
+                resultado.rejeitar(linha.line, "débito e crédito na mesma conta")
+                continue
+            bloco.append((data, descricao, debito, credito, abs(valor)))
+            if len(bloco) >= tamanho_bloco:
+                self._gravar_bloco(bloco)
+                resultado.importadas += len(bloco)
+                bloco.clear()
+        if bloco:
+            self._gravar_bloco(bloco)
+            resultado.importadas += len(bloco)
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def lancar(self, linhas, tamanho_bloco=IMPORT_CHUNK_SIZE):
+        """
+        Valida e grava os lançamentos de `linhas` (iterável de JournalLine), que
+        já trazem as contas de débito e crédito. Como em importar(), os
+        lançamentos válidos são gravados em blocos de até `tamanho_bloco`, um
+        COMMIT por bloco, e os inválidos são rejeitados no resultado.
+        Retorna um ImportResult.
+        """
+        resultado = ImportResult()
+        inicio = time.perf_counter()
+        validar = self.validador_de_lancamentos()
+        bloco = []
+        for linha in linhas:
+            resultado.lidas += 1
+            try:
+                bloco.append(validar(linha))
+            except ValueError as e:
+                resultado.rejeitar(linha.line, str(e))
+                continue
+            if len(bloco) >= tamanho_bloco:
+                self._gravar_bloco(bloco)
+                resultado.importadas += len(bloco)
+                bloco.clear()
+        if bloco:
+            self._gravar_bloco(bloco)
+            resultado.importadas += len(bloco)
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def validador_de_lancamentos(self):
+        """
+        Função que converte um JournalLine nos parâmetros de SQL_INSERT, ou lança
+        ValueError com o motivo da rejeição. As contas são carregadas uma vez,
+        na criação do validador.
+        """
+        contas = _AccountResolver(self.db)
+
+        def validar(linha):
+            data = parse_data(linha.date)
+            valor = parse_valor(linha.amount)
+            if valor <= 0:
+                raise ValueError("o valor deve ser maior que zero")
+            debito, credito = contas.buscar(linha.debit), contas.buscar(linha.credit)
+            if debito is None or credito is None:
+                lado, conta = ("débito", linha.debit) if debito is None else ("crédito", linha.credit)
+                raise ValueError(f"conta de {lado} não encontrada: {conta!r}")
+            if debito == credito:
+                raise ValueError("débito e crédito na mesma conta")
+            return data, (linha.description or "").strip(), debito, credito, valor
+
+        return validar
+
+    def _gravar_bloco(self, bloco):
+        # Um COMMIT por bloco; os saldos das contas são atualizados pelos gatilhos do banco
+        with self.db.transaction():
+            self.db.executemany(SQL_INSERT, bloco)
+
+    def importar_extrato(self):
+        print("\n--- Importar Extrato Bancário (CSV/OFX) ---")
+        caminho = input("Caminho do arquivo: ").strip().strip('"')
+        if not os.path.isfile(caminho):
+            print("Arquivo não encontrado.")
+            return
+
+        from src.services.transaction_service import TransactionService
+        print("\nSeleção da conta do extrato (ex.: conta corrente):")
+        conta_extrato = TransactionService(self.db).selecionar_conta("do extrato")
+        if not conta_extrato:
+            return
+
+        caminho_regras = input(f"Arquivo de regras [{IMPORT_RULES_PATH}]: ").strip() or IMPORT_RULES_PATH
+        try:
+            regras = ImportRules.from_file(self.db, caminho_regras)
+            resultado = self.importar(ler_extrato(caminho), conta_extrato[0], regras)
+        except (StatementImportError, OSError, UnicodeDecodeError) as e:
+            print(f"Erro: {e}")
+            return
+
+        print(f"\n{resultado}")
+        for linha, motivo in resultado.erros:
+            print(f"  linha {linha}: {motivo}")
+        if resultado.rejeitadas > len(resultado.erros):
+            print(f"  ... e mais {resultado.rejeitadas - len(resultado.erros)} rejeitados.")
+        if resultado.importadas:
+            schedule_backup()
@@ -1,51 +1,31 @@
-from src.database.connection import Database
-from src.core.templates import TransactionTemplate, TemplateTransaction
+from src.database.connection import get_database
+from src.core.templates import (TransactionTemplate, TemplateTransaction, TemplateManager, TemplateEngine,
+                                TemplateRun, TemplateExecutionError)
+from src.core.template_scheduler import TemplateScheduler, RECORRENCIAS
 from src.services.transaction_service import TransactionService
 from src.utils.search_utils import select_from_list
-from src.utils.formatters import convert_comma_to_float
-from src.utils.backup import create_backup
-from collections import namedtuple
+from src.utils.formatters import convert_comma_to_decimal
+from src.utils.validators import validate_and_convert_date
+from src.utils.backup import schedule_backup
 from datetime import datetime
+from decimal import Decimal
 
 from typing import List
-import json
 
 class TemplateService:
-    def __init__(self):
-        self.db = Database()
-        self.db.connect()
-        self.transaction_service = TransactionService()
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
+        self.transaction_service = TransactionService(self.db)
+        self.templates = TemplateManager(self.db)
+        self.engine = TemplateEngine(self.db)
+        self.scheduler = TemplateScheduler(self.db)
 
     def get_templates_by_name_or_id(self, search_term: str) -> List[TransactionTemplate]:
         """
         Retrieves templates that match the search term (ID or name).
         If search_term is empty, returns all templates.
         """
-        sql = """
-        SELECT id, name, details 
-        FROM transaction_templates 
-        WHERE id = ? OR name LIKE ?
-        """
-        try:
-            # Try to convert the search term to an integer (for ID search)
-            template_id = int(search_term)
-            results = self.db.execute(sql, (template_id, f"%{search_term}%")).fetchall()
-        except ValueError:
-            # If search term is not a number, search only by name
-            if search_term.strip():  # If search_term is not empty
-                results = self.db.execute(sql, (-1, f"%{search_term}%")).fetchall()
-            else:
-                # If search_term is empty, return all templates
-                sql_all = "SELECT id, name, details FROM transaction_templates"
-                results = self.db.execute(sql_all).fetchall()
-
-        # Convert results to TransactionTemplate objects
-        templates = []
-        for result in results:
-            template = TransactionTemplate.from_json(result[0], result[1], result[2])
-            templates.append(template)
-
-        return templates
+        return self.templates.get_templates(search_term)
 
     def novo_modelo(self):
         """Creates a new transaction template."""
@@ -75,7 +55,7 @@ class TemplateService:
             # Pegar descrição e valor
             descricao = input("Descrição da transação: ")
             try:
-                valor = convert_comma_to_float(input("Valor: R$ "))
+                valor = convert_comma_to_decimal(input("Valor: R$ "))
                 if valor <= 0:
                     print("Erro: O valor deve ser maior que zero.")
                     continue
@@ -100,17 +80,15 @@ class TemplateService:
         # Criar e salvar o template
         template = TransactionTemplate(name=nome, transactions=transactions)
         
-        sql = "INSERT INTO transaction_templates (name, details) VALUES (?, ?)"
-        self.db.execute(sql, (nome, template.to_json()))
-        create_backup()
+        self.templates.create_template(template)
+        schedule_backup()
         print("\nModelo criado com sucesso!")
 
     def visualizar_modelos(self):
         """Lista todos os modelos disponíveis"""
         print("\n=== Modelos de Transações Disponíveis ===")
         
-        sql = "SELECT id, name, details FROM transaction_templates ORDER BY ID"
-        modelos = self.db.execute(sql).fetchall()
+        modelos = self.templates.get_templates()
         
         if not modelos:
             print("Nenhum modelo cadastrado.")
@@ -120,11 +98,10 @@ class TemplateService:
         print("-" * 35)
         
         for modelo in modelos:
-            print(f"{modelo[0]:<5} {modelo[1]:<30}")
-            template = TransactionTemplate.from_json(modelo[0], modelo[1], modelo[2])
-            
+            print(f"{modelo.id:<5} {modelo.name:<30}")
+
             print("\nTransações no modelo:")
-            for idx, trans in enumerate(template.transactions, 1):
+            for idx, trans in enumerate(modelo.transactions, 1):
                 print(f"\n  Transação {idx}:")
                 conta_debito = self.transaction_service.buscar_conta(trans.debit_account)
                 conta_credito = self.transaction_service.buscar_conta(trans.credit_account)
@@ -142,26 +119,10 @@ class TemplateService:
         if not modelos:
             return
 
-        # Define a estrutura de dados Modelo
-        Modelo = namedtuple('Modelo', ['id', 'name', 'details'])
-
-        # Criar lista de objetos Modelo
-        modelos_list = [Modelo(id=modelo[0], name=modelo[1], details=modelo[2]) for modelo in modelos]
-
         # Usar a função select_from_list para selecionar o modelo
-        modelo_selecionado = select_from_list(modelos_list, "Selecione o modelo que deseja executar", key='name')
-        if not modelo_selecionado:
-            return
-
-        # Buscar o modelo
-        sql = "SELECT id, name, details FROM transaction_templates WHERE id = ?"
-        result = self.db.execute(sql, (modelo_selecionado.id,)).fetchone()
-        
-        if not result:
-            print("Erro: Modelo não encontrado.")
+        template = select_from_list(modelos, "Selecione o modelo que deseja executar", key='name')
+        if not template:
             return
-
-        template = TransactionTemplate.from_json(result[0], result[1], result[2])
         
         # Lista para armazenar os novos valores
         new_transactions = []
@@ -183,7 +144,7 @@ class TemplateService:
             if modificar == 's':
                 while True:
                     try:
-                        novo_valor = convert_comma_to_float(input("Digite o novo valor: R$ "))
+                        novo_valor = convert_comma_to_decimal(input("Digite o novo valor: R$ "))
                         if novo_valor <= 0:
                             print("Erro: O valor deve ser maior que zero.")
                             continue
@@ -217,34 +178,166 @@ class TemplateService:
             print("Execução cancelada.")
             return
 
-        # Executar todas as transações
+        # Validar e lançar todas as transações em uma única unidade de trabalho:
+        # ou o modelo inteiro é lançado, ou nada é
         data = datetime.now().strftime("%Y-%m-%d")
-        for trans in new_transactions:
-            sql = """
-            INSERT INTO transactions 
-            (date, description, debit_account, credit_account, amount) 
-            VALUES (?, ?, ?, ?, ?)
-            """
-            self.db.execute(sql, (
-                data,
-                trans.description,
-                trans.debit_account,
-                trans.credit_account,
-                trans.amount
-            ))
-
-            # Atualizar saldos
-            self.db.execute(
-                "UPDATE accounts SET balance = balance - ? WHERE id = ?",
-                (trans.amount, trans.debit_account)
-            )
-            self.db.execute(
-                "UPDATE accounts SET balance = balance + ? WHERE id = ?",
-                (trans.amount, trans.credit_account)
-            )
+        modelo = TransactionTemplate(template.id, template.name, new_transactions)
+        try:
+            self.engine.execute([TemplateRun(modelo, data)])
+        except TemplateExecutionError as e:
+            print("\nModelo não executado:")
+            for problema in e.problemas:
+                print(f"  - {problema}")
+            return
 
+        schedule_backup()
         print("\nModelo executado com sucesso!")
 
+    def executar_modelos_em_lote(self):
+        """
+        Executa vários modelos, cada um em uma ou mais datas, em uma única unidade
+        de trabalho (ex.: lançamentos recorrentes de fim de mês), com os valores
+        gravados nos modelos.
+        """
+        print("\n=== Executar Modelos em Lote ===")
+        ids = input("IDs dos modelos (separados por vírgula): ").replace(" ", "").split(",")
+        try:
+            ids = [int(i) for i in ids if i]
+        except ValueError:
+            print("Erro: IDs inválidos.")
+            return
+        modelos = self.engine.load(ids)
+        faltando = [i for i in ids if i not in modelos]
+        if not ids or faltando:
+            print(f"Erro: modelo(s) não encontrado(s): {', '.join(map(str, faltando)) or 'nenhum informado'}")
+            return
+
+        datas = []
+        for texto in input("Datas de lançamento (separadas por vírgula): ").split(","):
+            if not texto.strip():
+                continue
+            data = validate_and_convert_date(texto.strip(), "%Y-%m-%d")
+            if not data:
+                print(f"Erro: data inválida '{texto.strip()}'.")
+                return
+            datas.append(data)
+        if not datas:
+            print("Erro: informe ao menos uma data.")
+            return
+
+        execucoes = [run for i in ids for run in self.engine.runs_for_dates(modelos[i], datas)]
+        total = sum((t.amount for run in execucoes for t in run.template.transactions), Decimal("0.00"))
+        quantidade = sum(len(run.template.transactions) for run in execucoes)
+        print(f"\n{len(ids)} modelo(s) x {len(datas)} data(s): {quantidade} transações, total R$ {total:.2f}")
+        if input("Confirma a execução? (s/n): ").lower() != 's':
+            print("Execução cancelada.")
+            return
+
+        try:
+            lancadas = self.engine.execute(execucoes)
+        except TemplateExecutionError as e:
+            print("\nNenhum modelo foi executado:")
+            for problema in e.problemas:
+                print(f"  - {problema}")
+            return
+        schedule_backup()
+        print(f"\n{lancadas} transações lançadas com sucesso!")
+
+    def modelos_por_conta(self):
+        """Lista os modelos que debitam ou creditam uma conta."""
+        print("\n=== Modelos por Conta ===")
+        conta = select_from_list(self.transaction_service.accounts.all(), "Selecione a conta")
+        if not conta:
+            return
+        modelos = self.templates.templates_using_account(conta.id)
+        if not modelos:
+            print(f"Nenhum modelo usa a conta '{conta.name}'.")
+            return
+        print(f"\nModelos que usam a conta '{conta.name}':")
+        print("\n{:<5} {:<30} {:>8}".format("ID", "Nome", "Linhas"))
+        print("-" * 45)
+        for modelo in modelos:
+            linhas = sum(1 for t in modelo.transactions if conta.id in (t.debit_account, t.credit_account))
+            print(f"{modelo.id:<5} {modelo.name:<30} {linhas:>8}")
+        return modelos
+
+    def configurar_recorrencia(self):
+        """Define (ou remove) a regra de recorrência de um modelo."""
+        print("\n=== Recorrência de Modelo ===")
+        modelos = self.get_templates_by_name_or_id("")
+        if not modelos:
+            print("Nenhum modelo cadastrado.")
+            return
+        modelo = select_from_list(modelos, "Selecione o modelo")
+        if not modelo:
+            return
+
+        regras = list(RECORRENCIAS)
+        print("\nRegras de recorrência:")
+        for i, regra in enumerate(regras, 1):
+            print(f"{i}. {RECORRENCIAS[regra]}")
+        print("0. Sem recorrência")
+        escolha = input("Escolha: ").strip()
+        if escolha == "0":
+            self.scheduler.definir_recorrencia(modelo.id, None)
+            print("\nRecorrência removida.")
+            return
+        if not escolha.isdigit() or not 1 <= int(escolha) <= len(regras):
+            print("Erro: opção inválida.")
+            return
+        regra = regras[int(escolha) - 1]
+
+        inicio = validate_and_convert_date(input("Data da primeira ocorrência (AAAA-MM-DD): ").strip(), "%Y-%m-%d")
+        if not inicio:
+            print("Erro: data inválida.")
+            return
+        fim = input("Data final (AAAA-MM-DD, vazio para sem fim): ").strip()
+        if fim:
+            fim = validate_and_convert_date(fim, "%Y-%m-%d")
+            if not fim or fim < inicio:
+                print("Erro: data final inválida.")
+                return
+        self.scheduler.definir_recorrencia(modelo.id, regra, inicio, fim or None)
+        schedule_backup()
+        print(f"\nModelo '{modelo.name}': recorrência {RECORRENCIAS[regra].lower()} a partir de {inicio}.")
+
+    def executar_recorrencias(self):
+        """Lança, em uma única unidade de trabalho, todas as ocorrências vencidas dos modelos recorrentes."""
+        print("\n=== Executar Modelos Recorrentes ===")
+        ate = input("Lançar ocorrências até (AAAA-MM-DD, vazio para hoje): ").strip()
+        if ate:
+            ate = validate_and_convert_date(ate, "%Y-%m-%d")
+            if not ate:
+                print("Erro: data inválida.")
+                return
+
+        pendentes = self.scheduler.pendentes(ate or None)
+        if not pendentes:
+            print("Nenhuma ocorrência pendente.")
+            return
+        resumo = {}
+        for run in pendentes:
+            datas = resumo.setdefault(run.template.name, [])
+            datas.append(run.date)
+        print(f"\n{'Modelo':<30} {'Ocorrências':>11}  Período")
+        print("-" * 70)
+        for nome, datas in resumo.items():
+            print(f"{nome:<30} {len(datas):>11}  {datas[0]} a {datas[-1]}")
+        if input("\nConfirma o lançamento das ocorrências pendentes? (s/n): ").lower() != 's':
+            print("Execução cancelada.")
+            return
+
+        resultado = self.scheduler.executar(ate or None)
+        for nome, problemas in resultado.recusados.items():
+            print(f"\nModelo '{nome}' não lançado:")
+            for problema in problemas[:5]:
+                print(f"  - {problema}")
+            if len(problemas) > 5:
+                print(f"  ... e mais {len(problemas) - 5} problema(s)")
+        if resultado.ocorrencias:
+            schedule_backup()
+        print(f"\n{resultado.ocorrencias} ocorrência(s) lançada(s), {resultado.transacoes} transações.")
+
     def editar_modelo(self):
         """Edita um modelo existente."""
         print("\n=== Editar Modelo ===")
@@ -314,7 +407,7 @@ class TemplateService:
                 # Pegar novo valor
                 try:
                     novo_valor = input(f"Novo valor [R$ {trans.amount:.2f}]: ").strip()
-                    novo_valor = float(novo_valor) if novo_valor else trans.amount
+                    novo_valor = convert_comma_to_decimal(novo_valor) if novo_valor else trans.amount
                     if novo_valor <= 0:
                         print("Erro: O valor deve ser maior que zero.")
                         continue
@@ -359,7 +452,7 @@ class TemplateService:
             # Pegar descrição e valor
             descricao = input("Descrição da transação: ")
             try:
-                valor = float(input("Valor: R$ "))
+                valor = convert_comma_to_decimal(input("Valor: R$ "))
                 if valor <= 0:
                     print("Erro: O valor deve ser maior que zero.")
                     continue
@@ -381,9 +474,8 @@ class TemplateService:
         modelo_selecionado.transactions = novas_transacoes
         
         # Salvar no banco de dados
-        sql = "UPDATE transaction_templates SET name = ?, details = ? WHERE id = ?"
-        self.db.execute(sql, (novo_nome, modelo_selecionado.to_json(), modelo_selecionado.id))
-        create_backup()
+        self.templates.update_template(modelo_selecionado)
+        schedule_backup()
         print("\nModelo atualizado com sucesso!")
 
     def excluir_modelo(self):
@@ -404,9 +496,8 @@ class TemplateService:
         # Confirma a exclusão
         confirma = input("Tem certeza que deseja excluir o modelo '{}'? (s/n): ".format(modelo_selecionado.name)).lower()
         if confirma == 's':
-            sql = "DELETE FROM transaction_templates WHERE id = ?"
-            self.db.execute(sql, (modelo_selecionado.id,))
-            create_backup()
+            self.templates.delete_template(modelo_selecionado.id)
+            schedule_backup()
             print("\nModelo excluído com sucesso!")
         else:
             print("Operação cancelada.")
@@ -1,58 +1,41 @@
 from datetime import datetime
 from decimal import Decimal
-from src.database.connection import Database
+from src.database.connection import get_database
 from src.core.transactions import TransactionManager
+from src.core.account_directory import get_account_directory
 from src.database.models import Transaction
 from src.utils.validators import validate_date, validate_amount, validate_and_convert_date
-from src.utils.formatters import format_currency, format_date, convert_comma_to_float
+from src.utils.formatters import format_currency, format_date, convert_comma_to_decimal
 from typing import List, Optional
-from src.utils.backup import create_backup
+from src.utils.backup import schedule_backup
 from src.utils.search_utils import select_from_list
-from collections import namedtuple
+from config.settings import TRANSACTION_PAGE_SIZE
 
 class TransactionService:
-    def __init__(self):
-        self.db = Database()
-        self.db.connect()
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
         self.transaction_manager = TransactionManager(self.db)
+        self.accounts = get_account_directory(self.db)
 
     def get_transactions_by_id_or_description(self, search_term: str) -> List[Transaction]:
         """
         Retrieves transactions that match the search term (ID or description).
-        If search_term is empty, returns all transactions.
-        """
-        sql = """
-        SELECT t.id, t.date, t.description, 
-               d.name as debito, c.name as credito, 
-               t.amount
-        FROM transactions t
-        JOIN accounts d ON t.debit_account = d.id
-        JOIN accounts c ON t.credit_account = c.id
-        WHERE t.id = ? OR t.description LIKE ?
-        ORDER BY t.date DESC, t.id DESC
+        The description is searched in the full-text index (TransactionManager.search_transactions),
+        most relevant first; a numeric term also matches the transaction with that ID, listed first.
+        An empty search_term matches nothing: the full ledger is listed page by page
+        (visualizar_transacoes / TransactionManager.iter_transactions), never in one query.
         """
+        if not search_term.strip():
+            return []
+        encontradas = self.transaction_manager.search_transactions(search_term)
         try:
             # Try to convert the search term to an integer (for ID search)
-            transaction_id = int(search_term)
-            results = self.db.execute(sql, (transaction_id, f"%{search_term}%")).fetchall()
+            transacao = self.transaction_manager.get_transaction(int(search_term))
         except ValueError:
-            # If search term is not a number, search only by description
-            if search_term.strip():  # If search_term is not empty
-                results = self.db.execute(sql, (-1, f"%{search_term}%")).fetchall()
-            else:
-                # If search_term is empty, return all transactions
-                sql_all = """
-                SELECT t.id, t.date, t.description, 
-                       d.name as debito, c.name as credito, 
-                       t.amount
-                FROM transactions t
-                JOIN accounts d ON t.debit_account = d.id
-                JOIN accounts c ON t.credit_account = c.id
-                ORDER BY t.date DESC, t.id DESC
-                """
-                results = self.db.execute(sql_all).fetchall()
-
-        return [Transaction(*result) for result in results]
+            transacao = None
+        if transacao:
+            encontradas = [transacao] + [t for t in encontradas if t.id != transacao.id]
+        return encontradas
 
     def nova_transacao(self):
         print("\n--- Nova Transação ---")
@@ -86,7 +69,7 @@ class TransactionService:
         
         # Valor
         try:
-            valor = convert_comma_to_float((input("Valor: R$ ")))
+            valor = convert_comma_to_decimal(input("Valor: R$ "))
             if valor <= 0:
                 print("Erro: O valor deve ser maior que zero.")
                 return
@@ -107,7 +90,7 @@ class TransactionService:
             print("Transação cancelada.")
             return
 
-        # Inserir transação
+        # Inserir transação (os saldos das contas são atualizados pelos gatilhos do banco)
         sql = """
         INSERT INTO transactions 
         (date, description, debit_account, credit_account, amount) 
@@ -115,76 +98,100 @@ class TransactionService:
         """
         self.db.execute(sql, (data, descricao, conta_debito[0], conta_credito[0], valor))
 
-        # Atualizar saldos
-        self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                    (valor, conta_debito[0]))
-        self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                    (valor, conta_credito[0]))
-
         print("\nTransação registrada com sucesso!")
-        create_backup()
+        schedule_backup()
 
 
     def visualizar_transacoes(self):
-        print("\n--- Transações Registradas ---")
-        sql = """
-        SELECT t.id, t.date, t.description, 
-               d.name as debito, c.name as credito, 
-               t.amount
-        FROM transactions t
-        JOIN accounts d ON t.debit_account = d.id
-        JOIN accounts c ON t.credit_account = c.id
-        ORDER BY t.date ASC, t.id ASC
         """
-        transacoes = self.db.execute(sql).fetchall()
+        Lista as transações página por página (TRANSACTION_PAGE_SIZE por vez), em ordem
+        de data, com filtros opcionais de período, conta e valor.
+        Retorna o número de transações exibidas.
+        """
+        print("\n--- Transações Registradas ---")
+        filtros = self.ler_filtros_transacoes()
+        if filtros is None:
+            return 0
+
+        exibidas = 0
+        for pagina in self.transaction_manager.iter_transactions(**filtros):
+            if exibidas == 0:
+                print("\n{:<5} {:<12} {:<30} {:<20} {:<20} {:<15}".format(
+                    "ID", "Data", "Descrição", "Débito", "Crédito", "Valor"
+                ))
+                print("-" * 102)
+            for t in pagina:
+                print("{:<5} {:<12} {:<30} {:<20} {:<20} R$ {:<12.2f}".format(
+                    t.id, t.date, t.description[:30], t.debit_account[:20], t.credit_account[:20], t.amount
+                ))
+            exibidas += len(pagina)
+            if len(pagina) < TRANSACTION_PAGE_SIZE:
+                break
+            if input("\n[Enter] próxima página, 'q' para sair: ").strip().lower() == 'q':
+                break
 
-        if not transacoes:
+        if exibidas == 0:
             print("Nenhuma transação registrada.")
+        return exibidas
+
+    def ler_filtros_transacoes(self):
+        """
+        Pergunta os filtros da listagem (em branco = sem filtro).
+        Retorna os argumentos de TransactionManager.iter_transactions, ou None se cancelado.
+        """
+        filtros = {}
+        try:
+            for chave, rotulo in (("start_date", "Data inicial"), ("end_date", "Data final")):
+                texto = input(f"{rotulo} (em branco para todas): ").strip()
+                if texto:
+                    filtros[chave] = validate_and_convert_date(texto, "%Y-%m-%d")
+                    if filtros[chave] is None:
+                        raise ValueError(f"data inválida '{texto}'")
+            valor_minimo = input("Valor mínimo (em branco para qualquer): ").strip()
+            if valor_minimo:
+                filtros["min_amount"] = convert_comma_to_decimal(valor_minimo)
+            valor_maximo = input("Valor máximo (em branco para qualquer): ").strip()
+            if valor_maximo:
+                filtros["max_amount"] = convert_comma_to_decimal(valor_maximo)
+        except ValueError as e:
+            print(f"Filtro inválido: {e}")
             return None
 
-        print("\n{:<5} {:<12} {:<30} {:<20} {:<20} {:<15}".format(
-            "ID", "Data", "Descrição", "Débito", "Crédito", "Valor"
-        ))
-        print("-" * 102)
-        
-        for t in transacoes:
-            print("{:<5} {:<12} {:<30} {:<20} {:<20} R$ {:<12.2f}".format(
-                t[0], t[1], t[2][:30], t[3][:20], t[4][:20], t[5]
-            ))
-        
-        return transacoes
-    
-    def editar_transacao(self):
-        # Mostrar transações existentes
-        transacoes = self.visualizar_transacoes()
-        if not transacoes:
-            return
+        if input("Filtrar por conta? (s/n): ").strip().lower() == 's':
+            conta = self.selecionar_conta("do filtro")
+            if not conta:
+                return None
+            filtros["account_id"] = conta[0]
+        return filtros
+
+    def selecionar_transacao(self, acao):
+        """
+        Localiza a transação a `acao` (ex.: "editar") sem listar o razão: um ID é
+        buscado diretamente pela chave primária; qualquer outro termo (ou um ID
+        inexistente) é procurado na descrição.
+        Retorna a Transaction (com os nomes das contas) ou None se cancelado.
+        """
+        search_term = input(f"\nDigite o ID ou descrição da transação que deseja {acao} (ou 'c' para cancelar): ").strip()
+        if not search_term or search_term.lower() == 'c':
+            return None
+
+        if search_term.isdigit():
+            transacao = self.transaction_manager.get_transaction(int(search_term))
+            if transacao:
+                return transacao
 
-        # Selecionar transação
-        search_term = input("\nDigite o ID ou descrição da transação que deseja editar (ou 'c' para cancelar): ").lower()
-        if search_term == 'c':
-            return
-        
-        # Buscar transações que correspondem ao termo de pesquisa
         transacoes_encontradas = self.get_transactions_by_id_or_description(search_term)
         if not transacoes_encontradas:
             print("Nenhuma transação encontrada.")
-            return
-        
-        # Selecionar a transação usando a função select_from_list
-        transacao_selecionada = select_from_list(transacoes_encontradas, "Selecione a transação que deseja editar")
+            return None
+        return select_from_list(transacoes_encontradas, f"Selecione a transação que deseja {acao}")
+
+    def editar_transacao(self):
+        transacao_selecionada = self.selecionar_transacao("editar")
         if not transacao_selecionada:
             return
 
-        # Reverter saldos anteriores
         old_amount = transacao_selecionada.amount
-        old_debito = transacao_selecionada.debit_account
-        old_credito = transacao_selecionada.credit_account
-        
-        self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                       (old_amount, old_debito))
-        self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                       (old_amount, old_credito))
 
         print("\nPreencha os novos dados (deixe em branco para manter o valor atual):")
         
@@ -216,7 +223,7 @@ class TransactionService:
         # Valor
         try:
             novo_valor = input(f"Novo valor [R$ {old_amount:.2f}]: ").strip()
-            novo_valor = float(novo_valor) if novo_valor else old_amount
+            novo_valor = convert_comma_to_decimal(novo_valor) if novo_valor else old_amount
             if novo_valor <= 0:
                 print("Erro: O valor deve ser maior que zero.")
                 return
@@ -235,14 +242,9 @@ class TransactionService:
         confirma = input("\nConfirma as alterações? (s/n): ").lower()
         if confirma != 's':
             print("Edição cancelada.")
-            # Restaurar saldos originais
-            self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                          (old_amount, old_debito))
-            self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                          (old_amount, old_credito))
             return
 
-        # Atualizar transação
+        # Atualizar a transação; o gatilho do banco reverte os saldos antigos e aplica os novos
         sql = """
         UPDATE transactions 
         SET date = ?, description = ?, debit_account = ?, 
@@ -252,34 +254,11 @@ class TransactionService:
         self.db.execute(sql, (nova_data, nova_desc, novo_debito, 
                             novo_credito, novo_valor, transacao_selecionada.id))
 
-        # Atualizar novos saldos
-        self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                       (novo_valor, novo_debito))
-        self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                       (novo_valor, novo_credito))
-
         print("Transação atualizada com sucesso!")
-        create_backup()
+        schedule_backup()
 
     def excluir_transacao(self):
-        # Mostrar transações existentes
-        transacoes = self.visualizar_transacoes()
-        if not transacoes:
-            return
-
-        # Selecionar transação
-        search_term = input("\nDigite o ID ou descrição da transação que deseja excluir (ou 'c' para cancelar): ").lower()
-        if search_term == 'c':
-            return
-        
-        # Buscar transações que correspondem ao termo de pesquisa
-        transacoes_encontradas = self.get_transactions_by_id_or_description(search_term)
-        if not transacoes_encontradas:
-            print("Nenhuma transação encontrada.")
-            return
-        
-        # Selecionar a transação usando a função select_from_list
-        transacao_selecionada = select_from_list(transacoes_encontradas, "Selecione a transação que deseja excluir")
+        transacao_selecionada = self.selecionar_transacao("excluir")
         if not transacao_selecionada:
             return
 
@@ -296,22 +275,12 @@ class TransactionService:
             print("Exclusão cancelada.")
             return
 
-        # Reverter saldos
-        valor = transacao_selecionada.amount
-        conta_debito = transacao_selecionada.debit_account
-        conta_credito = transacao_selecionada.credit_account
-        
-        self.db.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", 
-                       (valor, conta_debito))
-        self.db.execute("UPDATE accounts SET balance = balance - ? WHERE id = ?", 
-                       (valor, conta_credito))
-
-        # Excluir transação
+        # Excluir a transação; o gatilho do banco reverte os saldos das contas
         sql = "DELETE FROM transactions WHERE id = ?"
         self.db.execute(sql, (transacao_selecionada.id,))
         
         print("Transação excluída com sucesso!")
-        create_backup()
+        schedule_backup()
     
     from src.utils.search_utils import select_from_list
 
@@ -325,20 +294,12 @@ class TransactionService:
         Returns:
             tuple: (id, nome) da conta selecionada ou None se cancelado
         """
-        # Definir a estrutura de dados Account
-        Account = namedtuple('Account', ['id', 'name', 'balance'])
-
-        # Buscar todas as contas
-        sql = "SELECT id, name, balance FROM accounts ORDER BY name"
-        contas = self.db.execute(sql).fetchall()
-        
-        if not contas:
+        # Contas do cadastro em memória (AccountDirectory), em ordem de nome
+        contas_list = self.accounts.all()
+        if not contas_list:
             print("Nenhuma conta cadastrada.")
             return None
 
-        # Criar lista de objetos Account
-        contas_list = [Account(id=conta[0], name=conta[1], balance=conta[2]) for conta in contas]
-
         # Usar a função select_from_list para selecionar a conta
         conta_selecionada = select_from_list(contas_list, f"Selecione a conta de {tipo}", key='name')
         if conta_selecionada:
@@ -355,6 +316,5 @@ class TransactionService:
         Returns:
             tuple: (id, nome) da conta ou None se não encontrada
         """
-        sql = "SELECT id, name FROM accounts WHERE id = ?"
-        result = self.db.execute(sql, (conta_id,)).fetchone()
-        return result if result else None
\ No newline at end of file
+        conta = self.accounts.get(conta_id)
+        return (conta.id, conta.name) if conta else None
\ No newline at end of file
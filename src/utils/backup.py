@@ -1,61 +1,107 @@
+import atexit
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from config.settings import DATABASE_PATH
 
 # Configurações
 BACKUP_DIR = "data/backups"  # Pasta onde os backups serão armazenados
 MAX_BACKUPS = 20  # Número máximo de backups a serem mantidos
+BACKUP_WINDOW = 30  # Segundos: todas as escritas dentro desta janela geram um único backup
+BACKUP_PAGES_PER_STEP = 1024  # Páginas copiadas por passo; o banco só fica bloqueado durante um passo
+BACKUP_STEP_PAUSE = 0.005  # Pausa entre passos (segundos), para não disputar o disco com a aplicação
+BACKUP_MAX_RESTARTS = 3  # Reinícios da cópia em passos (por escritas concorrentes) antes de copiar em um passo só
 
-def ensure_backup_dir():
+
+class _BackupRestarted(Exception):
+    """A cópia em passos recomeçou vezes demais por causa de escritas concorrentes."""
+
+
+def ensure_backup_dir(backup_dir=BACKUP_DIR):
     """Garante que a pasta de backups existe."""
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
+    if not os.path.exists(backup_dir):
+        os.makedirs(backup_dir)
 
-def get_backup_files():
+def get_backup_files(backup_dir=BACKUP_DIR):
     """Retorna a lista de arquivos de backup na pasta, ordenados por data de criação."""
-    if not os.path.exists(BACKUP_DIR):
+    if not os.path.exists(backup_dir):
         return []
-    files = [os.path.join(BACKUP_DIR, f) for f in os.listdir(BACKUP_DIR) if f.endswith(".db")]
+    files = [os.path.join(backup_dir, f) for f in os.listdir(backup_dir) if f.endswith(".db")]
     files.sort(key=os.path.getmtime)  # Ordena por data de modificação
     return files
 
-def create_backup():
-    """Cria um backup da database em formato SQLite .db."""
-    ensure_backup_dir()
-    
+def create_backup(db_file=DATABASE_PATH, backup_dir=BACKUP_DIR, verbose=True):
+    """
+    Cria um backup da database em formato SQLite .db e retorna o caminho do arquivo.
+    A cópia é feita em passos de BACKUP_PAGES_PER_STEP páginas, então as escritas
+    da aplicação só esperam o passo em andamento, e não a cópia inteira.
+    Cada escrita de outra conexão durante a cópia a faz recomeçar; depois de
+    BACKUP_MAX_RESTARTS recomeços, a cópia é refeita em um único passo.
+    O arquivo é gravado com outro nome e renomeado no fim: um backup interrompido
+    nunca aparece na lista de backups.
+    """
+    ensure_backup_dir(backup_dir)
+
     # Nome do arquivo de backup com timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = os.path.join(BACKUP_DIR, f"backup_{timestamp}.db")
-    
-    # Conecta ao banco de dados
-    source_conn = sqlite3.connect(DATABASE_PATH)
-    
+    backup_file = os.path.join(backup_dir, f"backup_{timestamp}.db")
+    sequence = 1
+    while os.path.exists(backup_file):
+        sequence += 1
+        backup_file = os.path.join(backup_dir, f"backup_{timestamp}_{sequence}.db")
+    partial_file = backup_file + ".partial"
+
+    progress = {"remaining": None, "restarts": 0}
+
+    def pause(status, remaining, total):
+        if progress["remaining"] is not None and remaining > progress["remaining"]:
+            progress["restarts"] += 1
+            if progress["restarts"] > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        progress["remaining"] = remaining
+        if remaining:
+            time.sleep(BACKUP_STEP_PAUSE)
+
+    # Conecta ao banco de dados somente leitura
+    source_conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
     try:
-        # Cria o arquivo de backup
-        with sqlite3.connect(backup_file) as backup_conn:
-            source_conn.backup(backup_conn)
-        print(f"Backup criado com sucesso: {backup_file}")
+        backup_conn = sqlite3.connect(partial_file)
+        try:
+            try:
+                source_conn.backup(backup_conn, pages=BACKUP_PAGES_PER_STEP, progress=pause)
+            except _BackupRestarted:
+                source_conn.backup(backup_conn)
+        finally:
+            backup_conn.close()
+        os.replace(partial_file, backup_file)
+        if verbose:
+            print(f"Backup criado com sucesso: {backup_file}")
     finally:
         source_conn.close()
-    
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+
     # Remove backups antigos se necessário
-    manage_backups()
+    manage_backups(backup_dir, verbose)
+    return backup_file
 
-def manage_backups():
+def manage_backups(backup_dir=BACKUP_DIR, verbose=True):
     """Remove backups antigos se o número de backups exceder MAX_BACKUPS."""
-    backup_files = get_backup_files()
+    backup_files = get_backup_files(backup_dir)
     while len(backup_files) > MAX_BACKUPS:
         oldest_file = backup_files.pop(0)  # Remove o arquivo mais antigo
         os.remove(oldest_file)
-        print(f"Backup removido: {oldest_file}")
+        if verbose:
+            print(f"Backup removido: {oldest_file}")
 
 def import_from_backup(backup_file):
     """Substitui toda a database pelo backup contido no arquivo."""
     if not os.path.exists(backup_file):
         print(f"Arquivo de backup não encontrado: {backup_file}")
         return
-    
+
     # Conecta ao banco de dados
     conn = sqlite3.connect(DATABASE_PATH)
     try:
@@ -65,3 +111,116 @@ def import_from_backup(backup_file):
         print(f"Database restaurada com sucesso a partir de {backup_file}!")
     finally:
         conn.close()
+
+
+class BackupScheduler:
+    """
+    Faz os backups em uma thread de fundo, agrupando as escritas.
+
+    schedule() apenas marca que o banco mudou e retorna imediatamente. A primeira
+    marcação depois de um backup abre uma janela de `window` segundos; ao fim
+    dela é feito um único backup, qualquer que seja o número de escritas na
+    janela. Escritas feitas durante um backup abrem a próxima janela.
+    close() (chamado também no encerramento do processo) faz o backup pendente
+    antes de sair.
+    """
+
+    def __init__(self, db_file=DATABASE_PATH, backup_dir=BACKUP_DIR, window=BACKUP_WINDOW):
+        self.db_file = db_file
+        self.backup_dir = backup_dir
+        self.window = window
+        self.last_backup = None
+        self.last_error = None
+        self._condition = threading.Condition()
+        self._due = None  # Momento (time.monotonic) do backup pendente; None se não há escrita pendente
+        self._running = False
+        self._closed = False
+        self._thread = None
+
+    def schedule(self):
+        """Registra que o banco foi alterado; o backup é feito ao fim da janela atual."""
+        with self._condition:
+            if self._closed:
+                return
+            if self._due is None:
+                self._due = time.monotonic() + self.window
+                self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="backup-scheduler", daemon=True)
+                self._thread.start()
+
+    @property
+    def pending(self):
+        with self._condition:
+            return self._due is not None or self._running
+
+    def flush(self, timeout=None):
+        """Antecipa o backup pendente e espera que ele termine. Retorna False se o tempo acabar."""
+        with self._condition:
+            if self._due is not None:
+                self._due = time.monotonic()
+                self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._due is None and not self._running, timeout)
+
+    def close(self, timeout=None):
+        """Faz o backup pendente e encerra a thread."""
+        with self._condition:
+            self._closed = True
+            if self._due is not None:
+                self._due = time.monotonic()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._due is not None and (self._closed or time.monotonic() >= self._due):
+                        break
+                    if self._closed:
+                        return
+                    timeout = None if self._due is None else self._due - time.monotonic()
+                    self._condition.wait(timeout)
+                self._due = None
+                self._running = True
+            try:
+                self.last_backup = create_backup(self.db_file, self.backup_dir, verbose=False)
+                self.last_error = None
+            except (sqlite3.Error, OSError) as e:
+                self.last_error = e
+                print(f"Falha no backup automático: {e}")
+            finally:
+                with self._condition:
+                    self._running = False
+                    self._condition.notify_all()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_backup_scheduler():
+    """Retorna o agendador de backups do processo, criando-o na primeira chamada."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BackupScheduler()
+            atexit.register(_scheduler.close)
+        return _scheduler
+
+
+def schedule_backup():
+    """Agenda um backup do banco principal (ver BackupScheduler); não bloqueia."""
+    get_backup_scheduler().schedule()
+
+
+def shutdown_backup_scheduler():
+    """Faz o backup pendente e encerra o agendador (usado no encerramento da aplicação)."""
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.close()
+        atexit.unregister(scheduler.close)
@@ -1,7 +1,7 @@
 from decimal import Decimal
 from datetime import datetime
-from dateutil import parser
 import unicodedata
+from src.utils.money import to_decimal
 
 def format_currency(amount: Decimal) -> str:
     return f"R$ {amount:,.2f}"
@@ -23,6 +23,22 @@ def convert_comma_to_float(number_str):
         # Handle invalid input (e.g., non-numeric strings or None)
         return None
 
+def convert_comma_to_decimal(number_str) -> Decimal:
+    """
+    Converts a string number with a comma (or dot) as a decimal separator to a
+    Decimal rounded to cents.
+
+    Args:
+        number_str (str): The input number as a string (e.g., "5,6").
+
+    Returns:
+        Decimal: The converted amount (e.g., Decimal("5.60")).
+
+    Raises:
+        ValueError: If the input is not a valid number.
+    """
+    return to_decimal(number_str)
+
 def format_date(date_obj: datetime) -> str:
     return date_obj.strftime('%Y-%m-%d')
 
@@ -0,0 +1,71 @@
+"""
+Valores monetários.
+
+No banco, todo valor monetário é guardado como INTEGER em centavos, em
+colunas declaradas com o tipo MONEY. No Python, todo valor monetário é um
+Decimal com duas casas. O adaptador e o conversor registrados aqui fazem a
+ponte entre os dois:
+
+- um Decimal passado como parâmetro de SQL é gravado como centavos;
+- uma coluna MONEY (ou uma expressão com o nome "total [MONEY]") é lida
+  como Decimal.
+
+Por isso nunca passe float para uma coluna MONEY: converta antes com
+to_decimal().
+"""
+import sqlite3
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+# Faixa de uma coluna MONEY: centavos em um INTEGER do SQLite (64 bits com sinal)
+MIN_CENTS = -2 ** 63
+MAX_CENTS = 2 ** 63 - 1
+
+
+def to_decimal(value) -> Decimal:
+    """
+    Converte um valor (Decimal, int, float ou texto com vírgula ou ponto decimal)
+    em Decimal arredondado para centavos.
+    Lança ValueError se o valor não for numérico ou se, em centavos, não couber
+    em uma coluna MONEY (MIN_CENTS a MAX_CENTS).
+    """
+    if isinstance(value, Decimal):
+        number = value
+    elif isinstance(value, int):
+        number = Decimal(value)
+    elif isinstance(value, float):
+        # repr do float ("0.1"), e não sua expansão binária (0.1000000000000000055...)
+        number = Decimal(repr(value))
+    else:
+        try:
+            number = Decimal(str(value).strip().replace(",", "."))
+        except InvalidOperation:
+            raise ValueError(f"Valor monetário inválido: {value!r}")
+    if not number.is_finite():
+        raise ValueError(f"Valor monetário inválido: {value!r}")
+    # Conferido antes do quantize, que falha com InvalidOperation em números muito grandes;
+    # adjusted() (o expoente do primeiro dígito) descarta esses sem fazer contas
+    if number.adjusted() > 17 or not MIN_CENTS <= number.scaleb(2).to_integral_value(ROUND_HALF_UP) <= MAX_CENTS:
+        raise ValueError(f"Valor monetário fora da faixa suportada: {value!r}")
+    return number.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_cents(value) -> int:
+    """Converte um valor monetário em centavos inteiros."""
+    return int(to_decimal(value) * 100)
+
+
+def from_cents(cents) -> Decimal:
+    """Converte centavos inteiros em Decimal com duas casas."""
+    return (Decimal(cents) / 100).quantize(CENT)
+
+
+def _convert_money(raw: bytes) -> Decimal:
+    return from_cents(Decimal(raw.decode()))
+
+
+def register_money_types():
+    """Registra o adaptador Decimal -> centavos e o conversor MONEY -> Decimal no módulo sqlite3."""
+    sqlite3.register_adapter(Decimal, to_cents)
+    sqlite3.register_converter("MONEY", _convert_money)
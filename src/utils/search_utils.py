@@ -1,63 +1,261 @@
-import unicodedata
+import heapq
+import threading
+from difflib import SequenceMatcher
+from src.utils.validators import normalizar_nome
+
+# Número máximo de palavras (por trigramas em comum) avaliadas por termo na busca aproximada
+FUZZY_CANDIDATES = 200
+
+# Quantidade de índices mantidos em cache por get_search_index
+INDEX_CACHE_SIZE = 4
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class SearchIndex:
+    """
+    Índice de busca sobre uma lista de itens, pelo atributo `key`.
+
+    Cada item é normalizado uma única vez (sem acentos, minúsculas). O índice é
+    feito sobre as palavras distintas dos nomes, que são muito menos numerosas
+    que as ocorrências:
+    - palavra -> posições dos itens que a contêm;
+    - trigrama -> palavras que o contêm, para achar as palavras que contêm um
+      termo sem percorrer o vocabulário inteiro.
+    Um termo sem espaços está sempre dentro de uma palavra, então os itens que o
+    contêm são os das palavras encontradas; termos com espaços intersectam os
+    itens de cada parte e conferem o termo inteiro só nesses candidatos.
+    As estruturas são montadas na primeira busca que precisa delas.
+
+    Os resultados são posições na lista `items`, em ordem: primeiro os nomes que
+    começam com o termo, depois os que o contêm, na ordem original da lista.
+    """
+
+    def __init__(self, items, key='name'):
+        self.items = list(items)
+        self.key = key
+        self.names = [normalizar_nome(str(getattr(item, key, '') or '')) for item in self.items]
+        self._words = None
+        self._word_trigrams = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def _build(self):
+        words = {}
+        for i, name in enumerate(self.names):
+            for word in set(name.split()):
+                words.setdefault(word, []).append(i)
+        word_trigrams = {}
+        for word in words:
+            for trigram in _trigramas(word):
+                word_trigrams.setdefault(trigram, []).append(word)
+        self._words = words
+        self._word_trigrams = word_trigrams
+
+    def _words_containing(self, part):
+        """Palavras do vocabulário que contêm `part` (sem espaços)."""
+        if self._words is None:
+            self._build()
+        if len(part) < 3:
+            return [word for word in self._words if part in word]
+        postings = []
+        for trigram in _trigramas(part):
+            posting = self._word_trigrams.get(trigram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return [word for word in candidates if part in word]
+
+    def _positions_with(self, part):
+        positions = set()
+        for word in self._words_containing(part):
+            positions.update(self._words[word])
+        return positions
+
+    def substring(self, term):
+        """Posições dos itens cujo nome normalizado contém `term` (prefixos primeiro)."""
+        term = normalizar_nome(term).strip()
+        parts = term.split()
+        if not parts:
+            return list(range(len(self.items)))
+        candidates = None
+        for part in sorted(parts, key=len, reverse=True):
+            positions = self._positions_with(part)
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+        if len(parts) > 1:
+            candidates = [i for i in candidates if term in self.names[i]]
+        candidates = sorted(candidates)
+        prefixed = [i for i in candidates if self.names[i].startswith(term)]
+        prefixed_set = set(prefixed)
+        return prefixed + [i for i in candidates if i not in prefixed_set]
+
+    def _similar_words(self, part, min_confidence):
+        """Palavras parecidas com `part` e sua similaridade (difflib), acima de min_confidence."""
+        if self._words is None:
+            self._build()
+        counts = {}
+        for trigram in _trigramas(part):
+            for word in self._word_trigrams.get(trigram, ()):
+                counts[word] = counts.get(word, 0) + 1
+        if counts:
+            candidates = heapq.nlargest(FUZZY_CANDIDATES, counts, key=counts.get)
+        else:
+            # Partes curtas (ou sem trigramas em comum): palavras com a mesma inicial
+            candidates = [word for word in self._words if word[:1] == part[:1]][:FUZZY_CANDIDATES]
+        matcher = SequenceMatcher(b=part, autojunk=False)
+        similar = {}
+        for word in candidates:
+            matcher.set_seq1(word)
+            if matcher.real_quick_ratio() < min_confidence or matcher.quick_ratio() < min_confidence:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= min_confidence:
+                similar[word] = ratio
+        return similar
+
+    def fuzzy(self, term, min_confidence=0.6, limit=10):
+        """
+        Posições dos itens mais parecidos com `term`, do mais ao menos parecido.
+        Cada parte do termo é comparada (difflib) com as palavras do vocabulário
+        que têm mais trigramas em comum com ela; a nota do item é a média, entre
+        as partes, da melhor similaridade de uma palavra do item, e precisa ser
+        pelo menos min_confidence.
+        """
+        parts = normalizar_nome(term).split()
+        if not parts:
+            return []
+        scores = None
+        for part in parts:
+            best = {}
+            for word, ratio in self._similar_words(part, min_confidence).items():
+                for i in self._words[word]:
+                    if ratio > best.get(i, 0):
+                        best[i] = ratio
+            if scores is None:
+                scores = best
+            else:
+                scores = {i: scores[i] + ratio for i, ratio in best.items() if i in scores}
+            if not scores:
+                return []
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))
+        return ranked[:limit]
+
+    def search(self, term, min_confidence=0.6, within=None):
+        """
+        Busca por substring; se nada for encontrado, busca aproximada.
+        `within` restringe o resultado a um conjunto de posições.
+        Retorna (posições, aproximado).
+        """
+        matches = self.substring(term)
+        if within is not None:
+            matches = [i for i in matches if i in within]
+        if matches or not min_confidence:
+            return matches, False
+        matches = self.fuzzy(term, min_confidence)
+        if within is not None:
+            matches = [i for i in matches if i in within]
+        return matches, True
+
+
+_index_cache = []
+_index_cache_lock = threading.Lock()
+
+
+def get_search_index(items, key='name'):
+    """
+    Retorna um SearchIndex para os itens, reaproveitando o índice de uma chamada
+    anterior com os mesmos itens (mesmos IDs e nomes, na mesma ordem), como na
+    seleção da conta de débito e em seguida da de crédito.
+    """
+    fingerprint = (key, tuple((getattr(item, 'id', None), getattr(item, key, None)) for item in items))
+    with _index_cache_lock:
+        for cached_fingerprint, index in _index_cache:
+            if cached_fingerprint == fingerprint:
+                # Mantém os itens recebidos (podem ter outros atributos atualizados)
+                index.items = list(items)
+                return index
+    index = SearchIndex(items, key)
+    with _index_cache_lock:
+        _index_cache.insert(0, (fingerprint, index))
+        del _index_cache[INDEX_CACHE_SIZE:]
+    return index
+
 
 def select_from_list(items, prompt, key='name', min_confidence=0.6):
     """
     Interativamente pesquisa e seleciona um item de uma lista.
     Permite busca por nome ou ID, com suporte a caracteres especiais.
-    
+    Os nomes são indexados uma vez (SearchIndex); se nenhum item contiver o
+    termo, são mostrados os itens mais parecidos (similaridade >= min_confidence).
+
     Args:
         items (list): A list of objects to select from.
         prompt (str): The prompt message to display.
         key (str): The attribute name to use for searching and displaying.
-    
+        min_confidence (float): Minimum similarity (0 to 1) for fuzzy matches; 0 disables them.
+
     Returns:
         The selected item from the list or None if canceled.
     """
-    current_matches = items.copy()
-    
+    index = get_search_index(items, key)
+    all_positions = list(range(len(index)))
+    current_matches = all_positions
+
     while True:
         # Mostra os itens encontrados
         if current_matches:
             print("\nItens encontrados:")
-            for i, item in enumerate(current_matches, 1):
+            for i, position in enumerate(current_matches, 1):
+                item = index.items[position]
                 attribute = getattr(item, key, '')
                 print(f"{i}. {attribute} (ID: {item.id})")
-            
+
             # Seleção automática se houver apenas um item
             if len(current_matches) == 1:
-                attribute = getattr(current_matches[0], key, '')
+                item = index.items[current_matches[0]]
+                attribute = getattr(item, key, '')
                 print(f"\nItem único encontrado: {attribute}")
-                return current_matches[0]
+                return item
         else:
             print("\nNenhum item encontrado. Tente novamente.")
-            current_matches = items.copy()
-        
+            current_matches = all_positions
+
         # Obtém a entrada do usuário
         user_input = input(f"\n{prompt} (digite o número, novo termo, ou 'sair'): ").strip().lower()
-        
+
         # Verifica se o usuário digitou um número
         if user_input.isdigit():
-            index = int(user_input) - 1
-            if 0 <= index < len(current_matches):
-                return current_matches[index]
+            position = int(user_input) - 1
+            if 0 <= position < len(current_matches):
+                return index.items[current_matches[position]]
             print("Número inválido. Tente novamente.")
             continue
-        
+
         # Verifica se o usuário digitou 'sair'
         if user_input == 'sair':
             return None
-        
-        # Filtra os itens com base no termo de busca
+
+        # Filtra os itens atuais com base no termo de busca
         if user_input:
-            # Normaliza a entrada e os nomes dos itens para lidar com caracteres especiais
-            normalized_input = unicodedata.normalize('NFD', user_input)\
-                .encode('ascii', 'ignore').decode('ascii').lower()
-            
-            current_matches = [
-                item for item in current_matches
-                if (normalized_input in unicodedata.normalize('NFD', getattr(item, key, ''))
-                    .encode('ascii', 'ignore').decode('ascii').lower()) or
-                (user_input.isdigit() and item.id == int(user_input))
-            ]
+            within = None if current_matches is all_positions else set(current_matches)
+            current_matches, approximate = index.search(user_input, min_confidence, within)
+            if approximate and current_matches:
+                print("\nNenhum item contém o termo; itens mais parecidos:")
+                if len(current_matches) == 1:
+                    # Um resultado aproximado não é selecionado automaticamente
+                    item = index.items[current_matches[0]]
+                    print(f"1. {getattr(item, key, '')} (ID: {item.id})")
+                    if input("Selecionar este item? (s/n): ").strip().lower() == 's':
+                        return item
+                    current_matches = all_positions
         else:
             print("Entrada inválida. Tente novamente.")
@@ -1,7 +1,6 @@
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 import unicodedata
-from dateutil import parser
 from datetime import datetime
 
 def validate_date(date_str, format="%d-%m-%Y"):
@@ -33,6 +32,9 @@ def validate_and_convert_date(date_str, output_format="%d-%m-%Y"):
     Returns:
         str: The date in the specified output format, or None if the input is invalid.
     """
+    # dateutil is only needed here; importing it lazily keeps it off the startup path
+    from dateutil import parser
+
     try:
         # Parse the input date string into a datetime object
         date_obj = parser.parse(date_str, dayfirst=True)
@@ -56,6 +58,9 @@ def normalizar_nome(texto):
     Normaliza o nome: remove acentos e converte para minúsculas.
     Exemplo: "Coração" -> "coracao"
     """
+    if texto.isascii():
+        # Texto ASCII não tem acentos nem caracteres de compatibilidade
+        return texto.lower()
     texto_normalizado = unicodedata.normalize('NFKD', texto)
     texto_sem_acentos = ''.join(c for c in texto_normalizado if not unicodedata.combining(c))
     return texto_sem_acentos.lower()
\ No newline at end of file